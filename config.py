@@ -10,6 +10,18 @@ SCREEN_WIDTH: int = 800
 SCREEN_HEIGHT: int = 600
 FPS: int = 60
 CAPTION: str = "飞机大战"
+RENDER_SCALE: float = 1.0  # 后台缓冲区相对逻辑分辨率的比例，小于 1 可降低填充率
+FULLSCREEN: bool = False  # 全屏时按逻辑分辨率绘制后拉伸到整个屏幕
+
+# 世界与镜头设置（世界大于屏幕时镜头跟随玩家滚动）
+WORLD_WIDTH: int = SCREEN_WIDTH
+WORLD_HEIGHT: int = SCREEN_HEIGHT
+CAMERA_MARGIN: int = 160  # 镜头外这个距离内的实体每帧完整更新，更远的子弹直接销毁
+FAR_MAX_SLEEP: int = 120  # 更远的敌人最多隔多少帧更新一次（唤醒时一次补齐这些帧的移动）
+SPATIAL_CELL_SIZE: int = 128  # 空间索引网格单元边长（需大于最大的实体）
+PIPELINED: bool = False  # 模拟线程计算下一帧的同时主线程绘制上一帧（多一帧输入延迟）
+IDLE_THROTTLE: bool = True  # 菜单、暂停等静止画面不重绘，阻塞等待输入
+IDLE_WAIT_MS: int = 250  # 静止画面等待输入的最长时间（毫秒）
 
 # 颜色定义 (RGB)
 BLACK: Tuple[int, int, int] = (0, 0, 0)
@@ -25,6 +37,7 @@ STATE_MENU: str = "menu"
 STATE_RUNNING: str = "running"
 STATE_PAUSED: str = "paused"
 STATE_GAME_OVER: str = "game_over"
+STATE_NETPLAY: str = "netplay"
 
 # 玩家设置
 PLAYER_START_X: int = SCREEN_WIDTH // 2
@@ -36,6 +49,7 @@ PLAYER_MAX_HEALTH: int = 100
 ENEMY_SPEED_MIN: int = 2
 ENEMY_SPEED_MAX: int = 5
 ENEMY_SPAWN_RATE: int = 60  # 帧数间隔
+ENEMY_MAX_ALIVE: int = 0  # 同时存活的敌人上限，0 为不限（画质调节器会修改）
 
 # 子弹设置
 BULLET_SPEED: int = 10
@@ -48,11 +62,88 @@ MIXER_SIZE: int = -16
 MIXER_CHANNELS: int = 2
 MIXER_BUFFER: int = 512
 
+# 音效设置
+AUDIO_SFX_CHANNELS: int = 16  # 为音效保留的声道数量
+AUDIO_MAX_SAME_PER_FRAME: int = 1  # 同一音效每帧最多播放次数
+# 音效定义: 名称 -> (文件名, 优先级, 音量)，优先级越高越不容易被抢占
+SFX_DEFINITIONS: Dict[str, Tuple[str, int, float]] = {
+    "shoot": ("shoot.wav", 1, 0.4),
+    "explosion": ("explosion.wav", 2, 0.8),
+    "player_hit": ("player_hit.wav", 3, 1.0),
+}
+
 # 资源路径
 ASSETS_DIR: str = "assets"
 IMAGES_DIR: str = f"{ASSETS_DIR}/images"
 AUDIO_DIR: str = f"{ASSETS_DIR}/audio"
 FONTS_DIR: str = f"{ASSETS_DIR}/fonts"
+SAVE_DIR: str = "saves"
+QUICKSAVE_PATH: str = f"{SAVE_DIR}/quicksave.bin"
+LOG_DIR: str = "logs"
+
+# 回放设置
+REWIND_SECONDS: int = 10  # 保留最近多少秒的历史
+REWIND_KEYFRAME_INTERVAL: int = 30  # 每隔多少帧保存一个完整关键帧
+REWIND_MEMORY_BUDGET: int = 16 * 1024 * 1024  # 回放缓冲区内存上限（字节）
+
+# 离线导出设置（按输入脚本回放并导出视频或 PNG 序列）
+EXPORT_SEED: int = 20240101  # 随机种子（决定敌人的生成位置和速度）
+EXPORT_FPS: int = FPS  # 导出视频的帧率
+EXPORT_WORKERS: int = 0  # PNG 编码进程数，0 为 CPU 核心数
+EXPORT_MAX_PENDING: int = 16  # 最多排队等待编码的帧数（限制内存占用）
+EXPORT_PNG_LEVEL: int = 1  # PNG 压缩级别 (1-9)，越低编码越快、文件越大
+EXPORT_ENCODER: str = "ffmpeg"  # 视频编码程序（找不到时改为导出 PNG 序列）
+
+# 联机设置
+NET_INPUT_DELAY: int = 2  # 本地输入延迟帧数
+NET_MAX_ROLLBACK: int = 8  # 最多领先已确认帧多少帧，超出则等待
+NET_PACKET_WINDOW: int = 8  # 每个数据包携带的最大输入帧数
+NET_DEFAULT_SEED: int = 20240101  # 联机随机种子（所有玩家必须一致）
+
+# 自动驾驶设置（压力测试用机器人玩家）
+AUTOPILOT: bool = False
+AUTOPILOT_CELL_SIZE: int = 20  # 威胁网格单元边长（像素）
+AUTOPILOT_LOOKAHEAD: int = 30  # 预测敌人轨迹的帧数
+AUTOPILOT_MAX_ENTITIES: int = 64  # 每帧最多光栅化的实体数量
+AUTOPILOT_MOVE_HORIZON: int = 4  # 评估候选方向时向前看的帧数
+AUTOPILOT_ENEMY_WEIGHT: float = 1.0
+AUTOPILOT_PROJECTILE_WEIGHT: float = 2.0
+AUTOPILOT_VALUE_WEIGHT: float = 2.0  # 正上方有敌人的收益
+AUTOPILOT_HOME_WEIGHT: float = 0.05  # 偏离初始高度的惩罚
+
+# 画质调节设置
+QUALITY_ADAPTIVE: bool = True  # 帧时间超出预算时自动降低画质
+QUALITY_WINDOW: int = 60  # 统计帧耗时的滑动窗口（帧）
+QUALITY_DEGRADE_RATIO: float = 0.9  # 平均耗时超过预算的该比例时降档
+QUALITY_RECOVER_RATIO: float = 0.5  # 平均耗时低于预算的该比例时才考虑升档
+QUALITY_RECOVER_WINDOWS: int = 3  # 升档前需要持续良好的窗口数
+QUALITY_LEVEL: int = 0  # 当前画质档位（运行时由画质调节器修改）
+HUD_REFRESH_INTERVAL: int = 1  # HUD 文字每隔多少帧重新渲染
+HUD_ANTIALIAS: bool = True  # HUD 文字是否抗锯齿
+
+# 精灵旋转缓存设置
+SPRITE_ROTATION_STEPS: int = 32  # 一整圈量化成的方向数（每档 11.25 度）
+SPRITE_CACHE_MAX_BYTES: int = 4 * 1024 * 1024  # 旋转图像的内存上限
+
+# 内存跟踪设置（仅调试模式）
+MEMORY_TRACKING: bool = True  # 调试模式下是否启用 tracemalloc 内存跟踪
+MEMORY_SAMPLE_INTERVAL: int = 300  # 采样间隔（帧）
+MEMORY_TOP_N: int = 5  # 每次记录增长最多的代码位置数量
+MEMORY_LOG_PATH: str = f"{LOG_DIR}/memory.ndjson"
+
+# 遥测设置
+TELEMETRY_SINK: str = ""  # 输出端: ""（关闭）、"file"（滚动 NDJSON 文件）或 "udp"（statsd）
+TELEMETRY_SOURCE: str = ""  # 机台标识，为空时使用主机名
+TELEMETRY_PATH: str = f"{LOG_DIR}/telemetry.ndjson"
+TELEMETRY_MAX_BYTES: int = 5 * 1024 * 1024  # 单个日志文件大小上限
+TELEMETRY_BACKUP_COUNT: int = 3  # 保留的旧日志文件数量
+TELEMETRY_STATSD_HOST: str = "127.0.0.1"
+TELEMETRY_STATSD_PORT: int = 8125
+TELEMETRY_PREFIX: str = "planewar"  # statsd 指标名前缀
+TELEMETRY_QUEUE_SIZE: int = 4096  # 缓冲队列容量，满了直接丢弃
+TELEMETRY_BATCH_SIZE: int = 256  # 每批最多写出的样本数
+TELEMETRY_FLUSH_INTERVAL: float = 1.0  # 最长刷新间隔（秒）
+TELEMETRY_SAMPLE_INTERVAL: int = 60  # 游戏中每隔多少帧上报一次实体数量和分数
 
 # 游戏设置
 DEBUG_MODE: bool = False
@@ -68,3 +159,8 @@ FONT_SIZE_LARGE: int = 48
 SCORE_ENEMY_KILL: int = 100
 SCORE_BOSS_KILL: int = 1000
 SCORE_PER_SECOND: int = 10
+
+# 高分榜设置
+DEFAULT_PROFILE: str = "player"
+HIGHSCORE_TOP_N: int = 10  # 每个档案保留的名次数量
+HIGHSCORE_COMPACT_EVERY: int = 20  # 日志新增多少条记录后重建索引
@@ -8,11 +8,16 @@ import os
 import shutil
 import pygame
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 import config
+from src.systems.pipeline import SimulationPipeline
 from src.systems.state_machine import GameStateMachine
+from src.systems.quality import QualityGovernor
+from src.systems.telemetry import Telemetry, create_telemetry
+from src.ui.render_scale import RenderScaler
 
 
 def cleanup_temp_files() -> None:
@@ -57,8 +62,11 @@ def init_pygame() -> pygame.Surface:
     pygame.init()
     pygame.mixer.init()
 
-    # 创建主屏幕
-    screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    # 创建主屏幕（全屏时使用桌面分辨率，由 RenderScaler 负责拉伸）
+    if config.FULLSCREEN:
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
     pygame.display.set_caption(config.CAPTION)
 
     # 创建时钟对象
@@ -81,6 +89,135 @@ def parse_arguments() -> bool:
     return debug_mode
 
 
+def _option_value(name: str) -> Optional[str]:
+    """
+    读取形如 "--name value" 的命令行参数
+
+    Args:
+        name: 参数名
+
+    Returns:
+        Optional[str]: 参数值，未提供时返回 None
+    """
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return None
+
+
+def parse_netplay_arguments() -> Optional[Tuple[int, List[Tuple[str, int]], int]]:
+    """
+    解析联机参数
+
+    用法: --net-id 0 --net-peers 127.0.0.1:9000,127.0.0.1:9001 [--net-seed 1234]
+    --net-peers 按玩家编号顺序列出所有玩家（包括自己）的地址。
+
+    Returns:
+        Optional[Tuple[int, List[Tuple[str, int]], int]]: (本机编号, 玩家地址列表, 随机种子)，
+        未启用联机时返回 None
+    """
+    local_id = _option_value("--net-id")
+    peers = _option_value("--net-peers")
+    if local_id is None or peers is None:
+        return None
+
+    addresses = []
+    for item in peers.split(","):
+        host, port = item.rsplit(":", 1)
+        addresses.append((host, int(port)))
+    seed = _option_value("--net-seed")
+    return int(local_id), addresses, int(seed) if seed is not None else config.NET_DEFAULT_SEED
+
+
+def parse_telemetry_arguments() -> None:
+    """
+    解析遥测参数并写入配置
+
+    用法: --telemetry file 或 --telemetry udp [--statsd 127.0.0.1:8125]
+    """
+    sink = _option_value("--telemetry")
+    if sink is not None:
+        config.TELEMETRY_SINK = sink
+    address = _option_value("--statsd")
+    if address is not None:
+        host, port = address.rsplit(":", 1)
+        config.TELEMETRY_STATSD_HOST = host
+        config.TELEMETRY_STATSD_PORT = int(port)
+
+
+def parse_export_arguments() -> Optional[Tuple[str, Optional[str], Optional[int], int]]:
+    """
+    解析离线导出参数
+
+    用法: --export 输出路径 [--input-script 脚本文件] [--frames 帧数] [--seed 种子]
+    输出路径为 .mp4 等视频文件时通过 ffmpeg 编码，否则导出 PNG 序列到该目录。
+
+    Returns:
+        Optional[Tuple[str, Optional[str], Optional[int], int]]:
+        (输出路径, 脚本文件, 帧数, 随机种子)，未启用导出时返回 None
+    """
+    output = _option_value("--export")
+    if output is None:
+        return None
+    frames = _option_value("--frames")
+    seed = _option_value("--seed")
+    return (
+        output,
+        _option_value("--input-script"),
+        int(frames) if frames is not None else None,
+        int(seed) if seed is not None else config.EXPORT_SEED,
+    )
+
+
+def run_export(output: str, script_path: Optional[str], frames: Optional[int], seed: int) -> None:
+    """
+    无头回放输入脚本并导出视频或 PNG 序列
+
+    Args:
+        output: 输出路径
+        script_path: 输入脚本文件，为 None 时没有输入（可配合 --autopilot）
+        frames: 导出的帧数，为 None 时使用脚本长度
+        seed: 随机种子
+    """
+    from src.systems.replay_export import InputScript, create_encoder, export_replay
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+
+    script = InputScript.load(script_path) if script_path is not None else None
+    encoder = create_encoder(output, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    start = time.perf_counter()
+    count = export_replay(encoder, script, frames, seed)
+    elapsed = max(time.perf_counter() - start, 1e-6)
+    speed = count / config.EXPORT_FPS / elapsed
+    print(f"已导出 {count} 帧到 {encoder.target}，用时 {elapsed:.1f} 秒（{speed:.1f} 倍实时速度）")
+
+
+def start_netplay(
+    state_machine: GameStateMachine, local_id: int, addresses: List[Tuple[str, int]], seed: int
+) -> None:
+    """
+    建立 UDP 帧同步会话并进入联机模式
+
+    Args:
+        state_machine: 游戏状态机
+        local_id: 本机玩家编号
+        addresses: 所有玩家的地址（按编号排列）
+        seed: 随机种子
+    """
+    from src.systems.netplay import CoopSimulation, LockstepSession, UdpTransport
+
+    peers: Dict[int, Tuple[str, int]] = {
+        index: addr for index, addr in enumerate(addresses) if index != local_id
+    }
+    transport = UdpTransport(addresses[local_id], peers)
+    game = CoopSimulation(len(addresses), seed)
+    state_machine.start_netplay(LockstepSession(game, local_id, transport))
+    print(f"联机模式: 玩家 {local_id + 1}/{len(addresses)}")
+
+
 def main() -> None:
     """
     游戏主函数
@@ -91,36 +228,155 @@ def main() -> None:
     # 注册退出时清理临时文件（备用）
     atexit.register(cleanup_temp_files)
 
+    state_machine: Optional[GameStateMachine] = None
+    pipeline: Optional[SimulationPipeline] = None
+    telemetry: Optional[Telemetry] = None
+    frames = 0
     try:
         # 解析命令行参数
         debug_mode = parse_arguments()
         config.DEBUG_MODE = debug_mode
 
+        # 自动驾驶 / 无头模式（无人值守的长时间压力测试）
+        if "--autopilot" in sys.argv:
+            config.AUTOPILOT = True
+            print("自动驾驶已启用")
+        if "--headless" in sys.argv:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+        # 渲染缩放
+        render_scale = _option_value("--render-scale")
+        if render_scale is not None:
+            config.RENDER_SCALE = float(render_scale)
+        if "--fullscreen" in sys.argv:
+            config.FULLSCREEN = True
+        if "--pipelined" in sys.argv:
+            config.PIPELINED = True
+
+        # 大地图：世界大于屏幕时镜头跟随玩家滚动
+        world = _option_value("--world")
+        if world is not None:
+            width, height = world.lower().split("x")
+            config.WORLD_WIDTH = int(width)
+            config.WORLD_HEIGHT = int(height)
+
+        # 离线导出：按输入脚本无头回放，不打开窗口
+        export = parse_export_arguments()
+        if export is not None:
+            run_export(*export)
+            return
+
+        # 遥测（后台线程批量上报，不阻塞主循环）
+        parse_telemetry_arguments()
+        telemetry = create_telemetry()
+        if telemetry is not None:
+            telemetry.event(
+                "session_start",
+                debug=config.DEBUG_MODE,
+                autopilot=config.AUTOPILOT,
+                render_scale=config.RENDER_SCALE,
+            )
+
         # 初始化 Pygame
-        screen = init_pygame()
+        window = init_pygame()
         clock = pygame.time.Clock()
 
+        # 所有绘制写入渲染缩放器的后台缓冲区
+        renderer = RenderScaler(window, config.RENDER_SCALE)
+        screen = renderer.surface
+
         # 初始化状态机
-        state_machine = GameStateMachine(screen)
+        # 自动驾驶的机器人成绩不记入高分榜（长时间压力测试也不会每局同步写盘）
+        state_machine = GameStateMachine(screen, telemetry, record_scores=not config.AUTOPILOT)
+
+        # 联机模式
+        netplay = parse_netplay_arguments()
+        if netplay is not None:
+            start_netplay(state_machine, *netplay)
+
+        # 画质调节器
+        governor = QualityGovernor() if config.QUALITY_ADAPTIVE else None
+        if governor is not None:
+            governor.apply()
+
+        # 流水线模式：模拟线程先算出第一帧
+        if config.PIPELINED:
+            pipeline = SimulationPipeline(state_machine)
+            pipeline.start([])
 
         # 主游戏循环
         running = True
+        frame_ms: Optional[float] = None
         while running:
-            # 1. 事件处理
-            for event in pygame.event.get():
+            frame_start = time.perf_counter()
+            frame = pipeline.wait() if pipeline is not None else None
+
+            # 根据上一帧耗时调节画质，必要时重建后台缓冲区（此时模拟线程一定空闲）
+            if governor is not None and frame_ms is not None:
+                if governor.record(frame_ms):
+                    scale = config.RENDER_SCALE * governor.tier.render_scale
+                    if scale != renderer.scale:
+                        renderer = RenderScaler(window, scale)
+                        screen = renderer.surface
+                        state_machine.set_screen(screen)
+                    if telemetry is not None:
+                        telemetry.event("quality_change", level=governor.level)
+                    if config.DEBUG_MODE:
+                        print(f"画质调整为: {governor.tier.name} ({frame_ms:.1f} ms)")
+
+            # 1. 事件处理（始终在主线程读取）
+            pending = []
+            if state_machine.is_idle(screen):
+                # 静止画面已经绘制：阻塞等待输入，不再按帧率空转
+                event = pygame.event.wait(config.IDLE_WAIT_MS)
+                if event.type != pygame.NOEVENT:
+                    pending.append(event)
+                frame_start = time.perf_counter()  # 等待时间不计入帧耗时
+            pending.extend(pygame.event.get())
+
+            events = []
+            exposed = False
+            for event in pending:
                 if event.type == pygame.QUIT:
                     running = False
                 else:
-                    state_machine.handle_event(event)
+                    # 窗口被遮挡后重新露出时，静止画面也要重新刷新
+                    exposed = exposed or event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+                    events.append(event)
 
-            # 2. 逻辑更新
-            state_machine.update()
+            redraw = True
+            if pipeline is None:
+                # 2. 逻辑更新
+                for event in events:
+                    state_machine.handle_event(event)
+                state_machine.update()
 
-            # 3. 画面渲染
-            state_machine.draw(screen)
+                # 3. 画面渲染（静止画面没有变化时跳过）
+                redraw = exposed or state_machine.needs_redraw(screen)
+                if redraw:
+                    state_machine.draw(screen)
+            elif frame.data is not None:
+                # 模拟下一帧的同时绘制抓取的这一帧
+                pipeline.start(events)
+                state_machine.draw_frame(screen, frame)
+            else:
+                # 不支持抓取的状态只能先绘制再模拟
+                redraw = exposed or state_machine.needs_redraw(screen)
+                if redraw:
+                    state_machine.draw_frame(screen, frame)
+                pipeline.start(events)
 
             # 更新屏幕
-            pygame.display.flip()
+            if redraw:
+                renderer.present()
+                pygame.display.flip()
+
+            # 本帧工作耗时（不含等待）
+            frame_ms = (time.perf_counter() - frame_start) * 1000.0
+            frames += 1
+            if telemetry is not None:
+                telemetry.timing("frame_ms", frame_ms)
 
             # 控制帧率
             clock.tick(config.FPS)
@@ -131,6 +387,16 @@ def main() -> None:
                 pygame.display.set_caption(f"{config.CAPTION} - FPS: {fps:.2f}")
 
     finally:
+        # 等待模拟线程结束后再收尾
+        if pipeline is not None:
+            pipeline.close()
+        # 写完高分记录等收尾工作
+        if state_machine is not None:
+            state_machine.shutdown()
+        # 写完剩余的遥测数据
+        if telemetry is not None:
+            telemetry.event("session_end", frames=frames, dropped=telemetry.dropped)
+            telemetry.close()
         # 确保无论如何都清理临时文件
         pygame.quit()
         cleanup_temp_files()
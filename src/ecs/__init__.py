@@ -0,0 +1,3 @@
+"""
+ECS 模块初始化文件
+"""
@@ -0,0 +1,281 @@
+"""
+ECS 适配器 - 让基于精灵组的代码（RunningState、CollisionSystem、快照）在迁移期间继续工作
+"""
+
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+from src.ecs import systems
+from src.ecs.world import World
+
+
+class EntityView:
+    """
+    把一个实体包装成类似精灵的对象
+
+    提供 rect、image、speed、damage、health 等属性以及 kill()/alive()/take_damage()，
+    读写都直接落到世界的组件列上。只在需要逐个访问实体的旧代码中临时创建，
+    批量逻辑应直接使用系统。
+    """
+
+    __slots__ = ("world", "entity")
+
+    def __init__(self, world: World, entity: int) -> None:
+        """
+        初始化实体视图
+
+        Args:
+            world: ECS 世界
+            entity: 实体编号
+        """
+        self.world = world
+        self.entity = entity
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """包围矩形（副本，修改后需重新赋值）"""
+        position = self.world.get(self.entity, "position")
+        size = self.world.get(self.entity, "size")
+        return pygame.Rect(int(position["x"]), int(position["y"]), int(size["w"]), int(size["h"]))
+
+    @rect.setter
+    def rect(self, rect: pygame.Rect) -> None:
+        position = self.world.get(self.entity, "position")
+        position["x"] = rect.x
+        position["y"] = rect.y
+
+    @property
+    def image(self) -> pygame.Surface:
+        """图像"""
+        return self.world.images[int(self.world.get(self.entity, "sprite")["image"])]
+
+    @property
+    def speed(self) -> int:
+        """移动速度（速度分量的绝对值）"""
+        velocity = self.world.get(self.entity, "velocity")
+        return max(abs(int(velocity["vx"])), abs(int(velocity["vy"])))
+
+    @speed.setter
+    def speed(self, value: int) -> None:
+        velocity = self.world.get(self.entity, "velocity")
+        velocity["vy"] = -value if velocity["vy"] < 0 else value
+
+    @property
+    def damage(self) -> int:
+        """伤害值"""
+        return int(self.world.get(self.entity, "damage")["amount"])
+
+    @damage.setter
+    def damage(self, value: int) -> None:
+        self.world.get(self.entity, "damage")["amount"] = value
+
+    @property
+    def health(self) -> int:
+        """生命值"""
+        return int(self.world.get(self.entity, "health")["hp"])
+
+    @health.setter
+    def health(self, value: int) -> None:
+        self.world.get(self.entity, "health")["hp"] = value
+
+    def take_damage(self, amount: int) -> None:
+        """
+        受到伤害，生命值耗尽时销毁
+
+        Args:
+            amount: 伤害值
+        """
+        health = self.world.get(self.entity, "health")
+        health["hp"] -= amount
+        if health["hp"] <= 0:
+            self.kill()
+
+    def kill(self) -> None:
+        """销毁实体（与 Sprite.kill() 对应）"""
+        self.world.destroy(self.entity)
+
+    def alive(self) -> bool:
+        """实体是否存活（与 Sprite.alive() 对应）"""
+        return self.world.alive(self.entity)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, EntityView)
+            and other.world is self.world
+            and other.entity == self.entity
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.world), self.entity))
+
+    def __repr__(self) -> str:
+        return f"<EntityView({self.entity})>"
+
+
+class EntityGroup:
+    """
+    把世界中带有某个标签的实体包装成类似精灵组的容器
+
+    - add() 接收普通精灵（例如 BulletManager 创建的 Bullet），转换成实体后丢弃精灵对象，
+      共用同一张图像的精灵共用一个图像下标（旋转过的精灵按 image_key 登记，见旋转缓存）
+    - update()/draw()/flush() 分别调用移动与越界系统、绘制系统和世界的 flush()
+    - sprites()/迭代返回 EntityView，pygame.sprite.spritecollide/groupcollide 仍然可用
+
+    heading 是精灵 speed 属性对应的移动方向，例如子弹向上为 (0, -1)。
+    """
+
+    def __init__(self, world: World, tag: str, heading: Tuple[int, int] = (0, 1)) -> None:
+        """
+        初始化实体组
+
+        Args:
+            world: ECS 世界
+            tag: 本组实体的标签
+            heading: 精灵 speed 对应的移动方向
+        """
+        self.world = world
+        self.tag = tag
+        self.tags = (tag,)
+        self.heading = heading
+
+    def add(self, *sprites: pygame.sprite.Sprite) -> None:
+        """
+        把精灵转换为实体加入本组
+
+        Args:
+            sprites: 精灵（需有 rect 和 image，可选 speed、damage、health）
+        """
+        for sprite in sprites:
+            if isinstance(sprite, EntityView):
+                continue
+            rect = sprite.rect
+            image_key = getattr(sprite, "image_key", sprite.image)
+            components = {
+                "position": (rect.x, rect.y),
+                "size": (rect.width, rect.height),
+                "sprite": (self.world.image_id(image_key, sprite.image),),
+            }
+            speed = getattr(sprite, "speed", None)
+            if speed is not None:
+                components["velocity"] = (self.heading[0] * speed, self.heading[1] * speed)
+            damage = getattr(sprite, "damage", None)
+            if damage is not None:
+                components["damage"] = (damage,)
+            health = getattr(sprite, "health", None)
+            if health is not None:
+                components["health"] = (health,)
+            self.world.create(self.tag, **components)
+
+    def remove(self, *sprites: EntityView) -> None:
+        """
+        移除实体
+
+        Args:
+            sprites: 实体视图
+        """
+        for sprite in sprites:
+            sprite.kill()
+
+    def has(self, *sprites: EntityView) -> bool:
+        """
+        检查是否包含所有给定实体
+
+        Args:
+            sprites: 实体视图
+
+        Returns:
+            bool: 是否全部包含
+        """
+        return all(sprite in self for sprite in sprites)
+
+    def sprites(self) -> List[EntityView]:
+        """
+        获取所有存活实体的视图
+
+        Returns:
+            List[EntityView]: 实体视图列表
+        """
+        return [EntityView(self.world, entity) for entity in self.world.entities(self.tags)]
+
+    def update(self, bounds: Optional[Tuple[int, int, int, int]] = None) -> None:
+        """
+        移动本组实体并销毁离开边界的实体
+
+        Args:
+            bounds: 边界 (x, y, 宽, 高)，为 None 时使用屏幕范围
+        """
+        systems.movement_system(self.world, self.tags)
+        systems.lifetime_system(self.world, self.tags)
+        if bounds is None:
+            systems.cull_system(self.world, tags=self.tags)
+        else:
+            systems.cull_system(self.world, bounds, self.tags)
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """
+        批量绘制本组实体
+
+        Args:
+            surface: 目标表面
+        """
+        systems.render_system(self.world, surface, self.tags)
+
+    def blit_items(self, offset: Tuple[int, int] = (0, 0)) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """
+        抓取绘制所需的 (图像, 左上角坐标) 列表（流水线模式下交给主线程绘制）
+
+        Args:
+            offset: 加到坐标上的偏移（世界坐标转屏幕坐标）
+
+        Returns:
+            List[Tuple[pygame.Surface, Tuple[int, int]]]: 绘制列表
+        """
+        return systems.render_items(self.world, self.tags, offset)
+
+    def flush(self) -> None:
+        """真正移除已销毁的实体（每帧调用一次）"""
+        self.world.flush()
+
+    def empty(self) -> None:
+        """立即移除本组所有实体"""
+        self.world.clear(self.tags)
+
+    def collide_rects(self, rects: Sequence[pygame.Rect]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量求给定矩形与本组实体的相交组合
+
+        Args:
+            rects: 矩形列表
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (矩形下标, 实体编号)，按矩形下标排序
+        """
+        ids, boxes = systems.collect_boxes(self.world, self.tags)
+        others = np.array(
+            [(r.left, r.top, r.right, r.bottom) for r in rects], dtype=np.int64
+        ).reshape(-1, 4)
+        index, hit = systems.overlap_pairs(others, boxes)
+        return index, ids[hit]
+
+    def __len__(self) -> int:
+        return sum(
+            int(archetype.live_mask().sum()) for archetype in self.world.query(tags=self.tags)
+        )
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __contains__(self, sprite: object) -> bool:
+        return (
+            isinstance(sprite, EntityView)
+            and sprite.world is self.world
+            and sprite.alive()
+            and self.tag in self.world.tags_of(sprite.entity)
+        )
+
+    def __iter__(self) -> Iterator[EntityView]:
+        return iter(self.sprites())
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({self.tag}: {len(self)} entities)>"
@@ -0,0 +1,206 @@
+"""
+ECS 系统 - 在原型的组件列上批量运行的移动、寿命、越界、碰撞和绘制
+"""
+
+from typing import Iterable, List, Tuple
+
+import numpy as np
+import pygame
+import config
+from src.ecs.world import Archetype, World
+from src.ui.render_scale import blit_images
+
+
+def movement_system(world: World, tags: Iterable[str] = ()) -> None:
+    """
+    按速度移动所有拥有 position 和 velocity 的实体
+
+    Args:
+        world: ECS 世界
+        tags: 只处理带有这些标签的实体
+    """
+    for archetype in world.query("position", "velocity", tags=tags):
+        position = archetype.column("position")
+        velocity = archetype.column("velocity")
+        position["x"] += velocity["vx"]
+        position["y"] += velocity["vy"]
+
+
+def lifetime_system(world: World, tags: Iterable[str] = ()) -> None:
+    """
+    剩余寿命减一，减到 0 的实体销毁
+
+    Args:
+        world: ECS 世界
+        tags: 只处理带有这些标签的实体
+    """
+    for archetype in world.query("lifetime", tags=tags):
+        frames = archetype.column("lifetime")["frames"]
+        frames -= 1
+        expired = (frames <= 0) & archetype.live_mask()
+        for entity in archetype.entity_ids()[expired].tolist():
+            world.destroy(entity)
+
+
+def cull_system(
+    world: World,
+    bounds: Tuple[int, int, int, int] = (0, 0, config.SCREEN_WIDTH, config.SCREEN_HEIGHT),
+    tags: Iterable[str] = (),
+) -> None:
+    """
+    销毁完全离开边界的运动实体（拥有 position、size 和 velocity）
+
+    Args:
+        world: ECS 世界
+        bounds: 边界 (x, y, 宽, 高)
+        tags: 只处理带有这些标签的实体
+    """
+    x, y, width, height = bounds
+    for archetype in world.query("position", "size", "velocity", tags=tags):
+        left, top, right, bottom = archetype_boxes(archetype)
+        outside = (right < x) | (left > x + width) | (bottom < y) | (top > y + height)
+        outside &= archetype.live_mask()
+        for entity in archetype.entity_ids()[outside].tolist():
+            world.destroy(entity)
+
+
+def archetype_boxes(archetype: Archetype) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    计算原型中每个实体的包围盒
+
+    Args:
+        archetype: 拥有 position 和 size 的原型
+
+    Returns:
+        Tuple[np.ndarray, ...]: (left, top, right, bottom)
+    """
+    position = archetype.column("position")
+    size = archetype.column("size")
+    left = position["x"]
+    top = position["y"]
+    return left, top, left + size["w"], top + size["h"]
+
+
+def overlap_pairs(boxes_a: np.ndarray, boxes_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    求两组矩形之间所有相交的组合（与 pygame.Rect.colliderect 判定一致）
+
+    按 x 轴排序后用二分查找为 a 中每个矩形找出左边界落在可能相交范围内的 b，
+    再对这些候选做完整的相交判定，整个过程都是向量运算，
+    开销与 (N + M) log M 加候选数量成正比，而不是 N * M。
+
+    Args:
+        boxes_a: 形状为 (N, 4) 的数组，每行 (left, top, right, bottom)
+        boxes_b: 形状为 (M, 4) 的数组
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 相交组合在 a 和 b 中的下标（按 a 的下标排序）
+    """
+    empty = np.zeros(0, dtype=np.intp)
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return empty, empty
+
+    order = np.argsort(boxes_b[:, 0], kind="stable")
+    sorted_b = boxes_b[order]
+    max_width = int((sorted_b[:, 2] - sorted_b[:, 0]).max())
+
+    # b 的左边界必须在 (a.left - b 的最大宽度, a.right) 之间
+    lo = np.searchsorted(sorted_b[:, 0], boxes_a[:, 0] - max_width, side="right")
+    hi = np.searchsorted(sorted_b[:, 0], boxes_a[:, 2], side="left")
+    counts = np.maximum(hi - lo, 0)
+    total = int(counts.sum())
+    if total == 0:
+        return empty, empty
+
+    # 把每个 a 的候选区间 [lo, hi) 展开成扁平的下标数组
+    ia = np.repeat(np.arange(len(boxes_a)), counts)
+    starts = np.repeat(lo, counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    jb = starts + offsets
+
+    a = boxes_a[ia]
+    b = sorted_b[jb]
+    hit = (a[:, 0] < b[:, 2]) & (b[:, 0] < a[:, 2]) & (a[:, 1] < b[:, 3]) & (b[:, 1] < a[:, 3])
+    # 宽或高为 0 的矩形与任何矩形都不相交
+    hit &= (a[:, 2] > a[:, 0]) & (a[:, 3] > a[:, 1]) & (b[:, 2] > b[:, 0]) & (b[:, 3] > b[:, 1])
+    return ia[hit], order[jb[hit]]
+
+
+def collect_boxes(world: World, tags: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    收集带有指定标签的存活实体的包围盒
+
+    Args:
+        world: ECS 世界
+        tags: 标签
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (实体编号, 形状为 (N, 4) 的包围盒数组)
+    """
+    ids = []
+    boxes = []
+    for archetype in world.query("position", "size", tags=tags):
+        live = archetype.live_mask()
+        ids.append(archetype.entity_ids()[live])
+        boxes.append(np.stack(archetype_boxes(archetype), axis=1)[live])
+    if not ids:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 4), dtype=np.int64)
+    return np.concatenate(ids), np.concatenate(boxes)
+
+
+def collision_system(
+    world: World, tags_a: Iterable[str], tags_b: Iterable[str]
+) -> List[Tuple[int, int]]:
+    """
+    找出两类实体之间所有相交的组合
+
+    Args:
+        world: ECS 世界
+        tags_a: 第一类实体的标签
+        tags_b: 第二类实体的标签
+
+    Returns:
+        List[Tuple[int, int]]: (a 的实体编号, b 的实体编号)
+    """
+    ids_a, boxes_a = collect_boxes(world, tags_a)
+    ids_b, boxes_b = collect_boxes(world, tags_b)
+    ia, ib = overlap_pairs(boxes_a, boxes_b)
+    return list(zip(ids_a[ia].tolist(), ids_b[ib].tolist()))
+
+
+def render_items(
+    world: World, tags: Iterable[str] = (), offset: Tuple[int, int] = (0, 0)
+) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+    """
+    收集所有拥有 position 和 sprite 的实体的 (图像, 左上角坐标)
+
+    Args:
+        world: ECS 世界
+        tags: 只收集带有这些标签的实体
+        offset: 加到坐标上的偏移（世界坐标转屏幕坐标）
+
+    Returns:
+        List[Tuple[pygame.Surface, Tuple[int, int]]]: 绘制列表
+    """
+    images = world.images
+    dx, dy = offset
+    items: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+    for archetype in world.query("position", "sprite", tags=tags):
+        position = archetype.column("position")
+        image_ids = archetype.column("sprite")["image"].tolist()
+        xs = (position["x"] + dx).tolist()
+        ys = (position["y"] + dy).tolist()
+        items.extend((images[i], (x, y)) for i, x, y in zip(image_ids, xs, ys))
+    return items
+
+
+def render_system(world: World, surface: pygame.Surface, tags: Iterable[str] = ()) -> None:
+    """
+    批量绘制所有拥有 position 和 sprite 的实体
+
+    Args:
+        world: ECS 世界
+        surface: 绘制目标（可以是缩放后的后台缓冲区）
+        tags: 只绘制带有这些标签的实体
+    """
+    blit_images(surface, render_items(world, tags))
@@ -0,0 +1,364 @@
+"""
+ECS 世界 - 实体只是编号，组件按原型（组件组合）存放在类型化的 NumPy 列中
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+
+# 组件名 -> 每个实体一行的结构化 dtype（坐标沿用 rect 左上角的整数像素）
+COMPONENTS: Dict[str, np.dtype] = {
+    "position": np.dtype([("x", "<i4"), ("y", "<i4")]),
+    "velocity": np.dtype([("vx", "<i4"), ("vy", "<i4")]),
+    "size": np.dtype([("w", "<i4"), ("h", "<i4")]),
+    "sprite": np.dtype([("image", "<i4")]),  # World.images 中的下标
+    "health": np.dtype([("hp", "<i4")]),
+    "damage": np.dtype([("amount", "<i4")]),
+    "lifetime": np.dtype([("frames", "<i4")]),  # 剩余帧数，减到 0 时销毁
+}
+
+
+class Archetype:
+    """
+    原型：拥有完全相同组件和标签的一组实体
+
+    每个组件一列结构化数组，第 i 行属于 ids[i] 这个实体；容量不足时按倍数扩容。
+    删除时把末尾一行换到被删除的位置，各列始终保持紧密排列，系统可以直接对整列做向量运算。
+    """
+
+    def __init__(
+        self, components: Tuple[str, ...], tags: FrozenSet[str], capacity: int = 64
+    ) -> None:
+        """
+        初始化原型
+
+        Args:
+            components: 组件名（已排序）
+            tags: 标签（没有数据的组件，只用于区分实体种类）
+            capacity: 初始容量
+        """
+        self.components = components
+        self.tags = tags
+        self.count: int = 0
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        # 已调用 destroy() 但尚未 flush() 的行为 False
+        self.live = np.zeros(capacity, dtype=bool)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=COMPONENTS[name]) for name in components
+        }
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        获取组件列中已使用的部分（视图，修改会直接写回）
+
+        Args:
+            name: 组件名
+
+        Returns:
+            np.ndarray: 长度为 count 的结构化数组视图
+        """
+        return self.columns[name][: self.count]
+
+    def entity_ids(self) -> np.ndarray:
+        """
+        获取已使用行对应的实体编号
+
+        Returns:
+            np.ndarray: 长度为 count 的实体编号数组
+        """
+        return self.ids[: self.count]
+
+    def live_mask(self) -> np.ndarray:
+        """
+        获取尚未被销毁的行
+
+        Returns:
+            np.ndarray: 长度为 count 的布尔数组
+        """
+        return self.live[: self.count]
+
+    def _grow(self) -> None:
+        """容量翻倍"""
+        capacity = max(1, len(self.ids)) * 2
+        self.ids = np.resize(self.ids, capacity)
+        self.live = np.resize(self.live, capacity)
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self.count] = column[: self.count]
+            self.columns[name] = grown
+
+    def append(self, entity: int, values: Dict[str, Any]) -> int:
+        """
+        追加一行
+
+        Args:
+            entity: 实体编号
+            values: 组件名 -> 组件值（元组）
+
+        Returns:
+            int: 新行的下标
+        """
+        if self.count == len(self.ids):
+            self._grow()
+        row = self.count
+        self.ids[row] = entity
+        self.live[row] = True
+        for name in self.components:
+            self.columns[name][row] = values[name]
+        self.count += 1
+        return row
+
+    def swap_remove(self, row: int) -> Optional[int]:
+        """
+        删除一行，把末尾一行移到这里
+
+        Args:
+            row: 要删除的行
+
+        Returns:
+            Optional[int]: 被移动的实体编号，删除的正好是末尾一行时为 None
+        """
+        last = self.count - 1
+        self.count = last
+        if row == last:
+            return None
+        self.ids[row] = self.ids[last]
+        self.live[row] = self.live[last]
+        for column in self.columns.values():
+            column[row] = column[last]
+        return int(self.ids[row])
+
+
+class World:
+    """
+    ECS 世界
+
+    - create() 返回一个整数实体编号，按组件和标签的组合放进对应原型
+    - destroy() 只把实体标记为死亡，flush() 时才真正移除（与 SpriteArray 相同，
+      不会打断正在进行的整列运算）
+    - query() 返回包含指定组件和标签的原型，系统在原型的组件列上批量运算
+    - 图像统一登记在 images 列表中，sprite 组件只保存下标，相同外观的实体共用一张图像
+    """
+
+    def __init__(self) -> None:
+        """初始化空世界"""
+        self._archetypes: Dict[Tuple[Tuple[str, ...], FrozenSet[str]], Archetype] = {}
+        self._locations: Dict[int, Tuple[Archetype, int]] = {}
+        self._pending: List[int] = []
+        self._next_id: int = 1
+
+        self.images: List[pygame.Surface] = []
+        self._image_keys: Dict[Any, int] = {}
+
+    # ------------------------------------------------------------------
+    # 图像
+    # ------------------------------------------------------------------
+
+    def image_id(self, key: Any, image: pygame.Surface) -> int:
+        """
+        登记图像（同一个 key 只占一个下标）
+
+        同一个 key 换了新的 Surface（例如旋转缓存淘汰后重新生成）时替换旧图像，
+        世界中每个 key 只引用一张图像，不会留住已被淘汰的图像。
+
+        Args:
+            key: 图像的标识，例如旋转缓存的 (来源, 方向, 比例) 或共用的图像本身
+            image: 图像
+
+        Returns:
+            int: 图像下标
+        """
+        index = self._image_keys.get(key)
+        if index is None:
+            index = len(self.images)
+            self.images.append(image)
+            self._image_keys[key] = index
+        elif self.images[index] is not image:
+            self.images[index] = image
+        return index
+
+    # ------------------------------------------------------------------
+    # 实体
+    # ------------------------------------------------------------------
+
+    def archetype(self, components: Iterable[str], tags: Iterable[str] = ()) -> Archetype:
+        """
+        获取（必要时创建）组件和标签组合对应的原型
+
+        Args:
+            components: 组件名
+            tags: 标签
+
+        Returns:
+            Archetype: 原型
+
+        Raises:
+            KeyError: 未知的组件名
+        """
+        key = (tuple(sorted(components)), frozenset(tags))
+        archetype = self._archetypes.get(key)
+        if archetype is None:
+            for name in key[0]:
+                if name not in COMPONENTS:
+                    raise KeyError(f"未知的组件: {name}")
+            archetype = Archetype(key[0], key[1])
+            self._archetypes[key] = archetype
+        return archetype
+
+    def create(self, *tags: str, **components: Any) -> int:
+        """
+        创建实体
+
+        Args:
+            tags: 标签，例如 "bullet"
+            components: 组件名 -> 组件值（与 COMPONENTS 中的字段顺序一致的元组）
+
+        Returns:
+            int: 实体编号
+        """
+        archetype = self.archetype(components, tags)
+        entity = self._next_id
+        self._next_id += 1
+        row = archetype.append(entity, components)
+        self._locations[entity] = (archetype, row)
+        return entity
+
+    def destroy(self, entity: int) -> None:
+        """
+        标记实体死亡（flush() 时移除）
+
+        Args:
+            entity: 实体编号
+        """
+        location = self._locations.get(entity)
+        if location is None:
+            return
+        archetype, row = location
+        if archetype.live[row]:
+            archetype.live[row] = False
+            self._pending.append(entity)
+
+    def alive(self, entity: int) -> bool:
+        """
+        检查实体是否存活
+
+        Args:
+            entity: 实体编号
+
+        Returns:
+            bool: 是否存活
+        """
+        location = self._locations.get(entity)
+        return location is not None and bool(location[0].live[location[1]])
+
+    def has(self, entity: int, component: str) -> bool:
+        """
+        检查实体是否拥有某个组件
+
+        Args:
+            entity: 实体编号
+            component: 组件名
+
+        Returns:
+            bool: 是否拥有
+        """
+        location = self._locations.get(entity)
+        return location is not None and component in location[0].columns
+
+    def tags_of(self, entity: int) -> FrozenSet[str]:
+        """
+        获取实体的标签
+
+        Args:
+            entity: 实体编号
+
+        Returns:
+            FrozenSet[str]: 标签，实体不存在时为空
+        """
+        location = self._locations.get(entity)
+        return location[0].tags if location is not None else frozenset()
+
+    def get(self, entity: int, component: str) -> np.void:
+        """
+        获取实体的一个组件（结构化标量，修改会直接写回）
+
+        Args:
+            entity: 实体编号
+            component: 组件名
+
+        Returns:
+            np.void: 组件值
+
+        Raises:
+            KeyError: 实体不存在或没有该组件
+        """
+        archetype, row = self._locations[entity]
+        return archetype.columns[component][row]
+
+    def query(self, *components: str, tags: Iterable[str] = ()) -> Iterator[Archetype]:
+        """
+        遍历包含指定组件和标签的非空原型
+
+        Args:
+            components: 必须拥有的组件
+            tags: 必须拥有的标签
+
+        Returns:
+            Iterator[Archetype]: 原型
+        """
+        required = frozenset(tags)
+        for archetype in list(self._archetypes.values()):
+            if archetype.count and required <= archetype.tags and all(
+                name in archetype.columns for name in components
+            ):
+                yield archetype
+
+    def entities(self, tags: Iterable[str] = ()) -> List[int]:
+        """
+        获取带有指定标签的存活实体
+
+        Args:
+            tags: 标签
+
+        Returns:
+            List[int]: 实体编号
+        """
+        result: List[int] = []
+        for archetype in self.query(tags=tags):
+            result.extend(archetype.entity_ids()[archetype.live_mask()].tolist())
+        return result
+
+    def flush(self) -> None:
+        """真正移除所有已标记死亡的实体（每帧调用一次）"""
+        if not self._pending:
+            return
+        locations = self._locations
+        # 同一原型内从后往前删除，保证换到前面的末尾一行一定是存活的
+        rows = sorted(
+            (locations.pop(entity) for entity in self._pending),
+            key=lambda location: location[1],
+            reverse=True,
+        )
+        for archetype, row in rows:
+            moved = archetype.swap_remove(row)
+            if moved is not None:
+                locations[moved] = (archetype, row)
+        self._pending.clear()
+
+    def clear(self, tags: Iterable[str] = ()) -> None:
+        """
+        立即移除带有指定标签的所有实体
+
+        Args:
+            tags: 标签，为空时移除全部实体
+        """
+        self.flush()
+        for archetype in self.query(tags=tags):
+            for entity in archetype.entity_ids().tolist():
+                del self._locations[entity]
+            archetype.count = 0
+
+    def __len__(self) -> int:
+        return len(self._locations) - len(self._pending)
@@ -4,11 +4,14 @@
 
 import pygame
 import config
+from src.entities.sprite_cache import heading_angle, sprite_cache
 
 
 class Bullet(pygame.sprite.Sprite):
     """子弹类"""
 
+    FACING = (0, -1)  # 原始图像竖直向上
+
     def __init__(self, x: int, y: int) -> None:
         """
         初始化子弹
@@ -19,11 +22,8 @@ class Bullet(pygame.sprite.Sprite):
         """
         super().__init__()
 
-        # 创建子弹图像
-        self.image = pygame.Surface((6, 16), pygame.SRCALPHA)
-        # 绘制子弹形状
-        pygame.draw.ellipse(self.image, config.YELLOW, (0, 0, 6, 16))
-        pygame.draw.ellipse(self.image, (255, 255, 200), (1, 2, 4, 8))  # 高光
+        # 所有子弹共用同一张图像
+        self.image = sprite_cache.base(type(self))
 
         self.rect = self.image.get_rect()
         self.rect.centerx = x
@@ -32,6 +32,29 @@ class Bullet(pygame.sprite.Sprite):
         self.speed: int = config.BULLET_SPEED
         self.damage: int = config.BULLET_DAMAGE
 
+    @classmethod
+    def base_image(cls) -> pygame.Surface:
+        """
+        绘制子弹的原始图像（由旋转缓存调用一次）
+
+        Returns:
+            pygame.Surface: 原始图像
+        """
+        image = pygame.Surface((6, 16), pygame.SRCALPHA)
+        pygame.draw.ellipse(image, config.YELLOW, (0, 0, 6, 16))
+        pygame.draw.ellipse(image, (255, 255, 200), (1, 2, 4, 8))  # 高光
+        return image
+
+    def face(self, dx: float, dy: float) -> None:
+        """
+        让子弹朝向飞行方向（使用旋转缓存中的共用图像）
+
+        Args:
+            dx: 飞行方向 X 分量
+            dy: 飞行方向 Y 分量
+        """
+        sprite_cache.orient(self, type(self), heading_angle(dx, dy, self.FACING))
+
     def update(self) -> None:
         """更新子弹状态"""
         self.rect.y -= self.speed
@@ -63,7 +86,7 @@ class BulletManager:
         if self.cooldown_timer > 0:
             self.cooldown_timer -= 1
 
-    def shoot(self, x: int, y: int, bullet_group: pygame.sprite.Group) -> None:
+    def shoot(self, x: int, y: int, bullet_group: pygame.sprite.Group) -> bool:
         """
         发射子弹
 
@@ -71,8 +94,13 @@ class BulletManager:
             x: 子弹 X 坐标
             y: 子弹 Y 坐标
             bullet_group: 子弹精灵组
+
+        Returns:
+            bool: 是否成功发射
         """
         if self.can_shoot():
             bullet = Bullet(x, y)
             bullet_group.add(bullet)
             self.cooldown_timer = self.cooldown
+            return True
+        return False
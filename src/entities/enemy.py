@@ -6,58 +6,96 @@ import pygame
 import random
 from typing import Optional
 import config
+from src.entities.sprite_cache import heading_angle, sprite_cache
 
 
 class Enemy(pygame.sprite.Sprite):
     """敌机类"""
 
-    def __init__(self, x: int, y: int) -> None:
+    FACING = (0, 1)  # 原始图像机头朝下
+
+    def __init__(self, x: int, y: int, speed: Optional[int] = None) -> None:
         """
         初始化敌人
 
         Args:
             x: 初始 X 坐标
             y: 初始 Y 坐标
+            speed: 下落速度，为 None 时随机生成
         """
         super().__init__()
 
-        # 创建敌机图像
-        self.image = pygame.Surface((40, 40), pygame.SRCALPHA)
-        self._draw_plane()
+        # 所有敌机共用同一张图像
+        self.image = sprite_cache.base(type(self))
 
         self.rect = self.image.get_rect()
         self.rect.centerx = x
         self.rect.centery = y
 
-        self.speed: int = random.randint(config.ENEMY_SPEED_MIN, config.ENEMY_SPEED_MAX)
+        if speed is None:
+            speed = random.randint(config.ENEMY_SPEED_MIN, config.ENEMY_SPEED_MAX)
+        self.speed: int = speed
         self.health: int = 20
         self.damage: int = 10
 
-    def _draw_plane(self) -> None:
-        """绘制敌机形状（倒置的飞机）"""
+    @classmethod
+    def base_image(cls) -> pygame.Surface:
+        """
+        绘制敌机的原始图像（由旋转缓存调用一次）
+
+        Returns:
+            pygame.Surface: 原始图像
+        """
+        image = pygame.Surface((40, 40), pygame.SRCALPHA)
+        cls._draw_plane(image)
+        return image
+
+    @staticmethod
+    def _draw_plane(image: pygame.Surface) -> None:
+        """
+        绘制敌机形状（倒置的飞机）
+
+        Args:
+            image: 绘制目标
+        """
         # 机身（倒置）
-        pygame.draw.polygon(self.image, config.RED, [
+        pygame.draw.polygon(image, config.RED, [
             (20, 5),   # 机尾
             (15, 30),  # 机身右侧
             (20, 35),  # 机头
             (25, 30),  # 机身左侧
         ])
         # 主翼
-        pygame.draw.polygon(self.image, config.RED, [
+        pygame.draw.polygon(image, config.RED, [
             (5, 15),   # 左翼尖
             (20, 10),  # 中心前
             (20, 25),  # 中心后
             (35, 15),  # 右翼尖
         ])
 
-    def update(self) -> None:
-        """更新敌人状态"""
-        self.rect.y += self.speed
+    def update(self, steps: int = 1) -> None:
+        """
+        更新敌人状态
+
+        Args:
+            steps: 推进的帧数（远离镜头的敌人降低频率更新时一次补齐）
+        """
+        self.rect.y += self.speed * steps
 
-        # 如果敌人飞出屏幕，标记为删除
-        if self.rect.top > config.SCREEN_HEIGHT:
+        # 如果敌人飞出世界，标记为删除
+        if self.rect.top > config.WORLD_HEIGHT:
             self.kill()
 
+    def face(self, dx: float, dy: float) -> None:
+        """
+        让机头朝向移动方向（使用旋转缓存中的共用图像）
+
+        Args:
+            dx: 移动方向 X 分量
+            dy: 移动方向 Y 分量
+        """
+        sprite_cache.orient(self, type(self), heading_angle(dx, dy, self.FACING))
+
     def take_damage(self, amount: int) -> None:
         """
         受到伤害
@@ -73,10 +111,20 @@ class Enemy(pygame.sprite.Sprite):
 class EnemySpawner:
     """敌人生成器"""
 
-    def __init__(self) -> None:
-        """初始化敌人生成器"""
+    def __init__(
+        self, rng: Optional[random.Random] = None, max_alive: Optional[int] = None
+    ) -> None:
+        """
+        初始化敌人生成器
+
+        Args:
+            rng: 随机数生成器，为 None 时使用全局 random（联机等需要确定性时传入独立实例）
+            max_alive: 同时存活的敌人上限，0 为不限；为 None 时每帧读取 config.ENEMY_MAX_ALIVE
+        """
         self.spawn_timer: int = 0
         self.spawn_rate: int = config.ENEMY_SPAWN_RATE
+        self.rng = rng if rng is not None else random
+        self.max_alive = max_alive
 
     def update(self, enemy_group: pygame.sprite.Group) -> None:
         """
@@ -89,6 +137,9 @@ class EnemySpawner:
 
         if self.spawn_timer >= self.spawn_rate:
             self.spawn_timer = 0
+            cap = config.ENEMY_MAX_ALIVE if self.max_alive is None else self.max_alive
+            if cap and len(enemy_group) >= cap:
+                return
             self._spawn_enemy(enemy_group)
 
     def _spawn_enemy(self, enemy_group: pygame.sprite.Group) -> None:
@@ -98,7 +149,8 @@ class EnemySpawner:
         Args:
             enemy_group: 敌人精灵组
         """
-        x = random.randint(20, config.SCREEN_WIDTH - 20)
-        y = -50  # 从屏幕上方生成
-        enemy = Enemy(x, y)
+        x = self.rng.randint(20, config.WORLD_WIDTH - 20)
+        y = -50  # 从世界上方生成
+        speed = self.rng.randint(config.ENEMY_SPEED_MIN, config.ENEMY_SPEED_MAX)
+        enemy = Enemy(x, y, speed)
         enemy_group.add(enemy)
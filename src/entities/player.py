@@ -3,8 +3,9 @@
 """
 
 import pygame
-from typing import Tuple
+from typing import Any, Optional, Tuple
 import config
+from src.entities.sprite_cache import sprite_cache
 
 
 class Player(pygame.sprite.Sprite):
@@ -20,9 +21,8 @@ class Player(pygame.sprite.Sprite):
         """
         super().__init__()
 
-        # 创建玩家飞机图像
-        self.image = pygame.Surface((50, 50), pygame.SRCALPHA)
-        self._draw_plane()
+        # 玩家飞机图像（联机时多名玩家共用）
+        self.image = sprite_cache.base(type(self))
 
         self.rect = self.image.get_rect()
         self.rect.centerx = x
@@ -31,25 +31,45 @@ class Player(pygame.sprite.Sprite):
         self.speed: int = config.PLAYER_SPEED
         self.health: int = config.PLAYER_MAX_HEALTH
         self.score: int = 0
+        # 替代键盘的输入源（需提供 get_move() -> (dx, dy)），例如自动驾驶
+        self.controller: Optional[Any] = None
 
-    def _draw_plane(self) -> None:
-        """绘制玩家飞机形状"""
+    @classmethod
+    def base_image(cls) -> pygame.Surface:
+        """
+        绘制玩家飞机的原始图像（由旋转缓存调用一次）
+
+        Returns:
+            pygame.Surface: 原始图像
+        """
+        image = pygame.Surface((50, 50), pygame.SRCALPHA)
+        cls._draw_plane(image)
+        return image
+
+    @staticmethod
+    def _draw_plane(image: pygame.Surface) -> None:
+        """
+        绘制玩家飞机形状
+
+        Args:
+            image: 绘制目标
+        """
         # 机身
-        pygame.draw.polygon(self.image, config.GREEN, [
+        pygame.draw.polygon(image, config.GREEN, [
             (25, 5),   # 机头
             (20, 30),  # 机身左侧
             (25, 45),  # 机尾
             (30, 30),  # 机身右侧
         ])
         # 主翼
-        pygame.draw.polygon(self.image, config.GREEN, [
+        pygame.draw.polygon(image, config.GREEN, [
             (10, 25),  # 左翼尖
             (25, 20),  # 中心前
             (25, 35),  # 中心后
             (40, 25),  # 右翼尖
         ])
         # 尾翼
-        pygame.draw.polygon(self.image, config.GREEN, [
+        pygame.draw.polygon(image, config.GREEN, [
             (15, 40),  # 左尾尖
             (25, 40),  # 中心
             (25, 48),  # 尾后
@@ -58,32 +78,60 @@ class Player(pygame.sprite.Sprite):
 
     def update(self) -> None:
         """更新玩家状态"""
+        if self.controller is not None:
+            self.move(*self.controller.get_move())
+            return
+
         # 获取按键状态
-        keys = pygame.key.get_pressed()
+        self.move(*self.direction(pygame.key.get_pressed()))
 
-        # 移动玩家
+    @staticmethod
+    def direction(keys: Any) -> Tuple[int, int]:
+        """
+        根据按键状态求移动方向
+
+        Args:
+            keys: 按键状态，keys[键码] 为真表示按下（例如 pygame.key.get_pressed() 的结果）
+
+        Returns:
+            Tuple[int, int]: (dx, dy)
+        """
+        dx = 0
+        dy = 0
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.rect.x -= self.speed
+            dx -= 1
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.rect.x += self.speed
+            dx += 1
         if keys[pygame.K_UP] or keys[pygame.K_w]:
-            self.rect.y -= self.speed
+            dy -= 1
         if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            self.rect.y += self.speed
+            dy += 1
+        return dx, dy
+
+    def move(self, dx: int, dy: int) -> None:
+        """
+        按方向移动玩家
+
+        Args:
+            dx: 水平方向 (-1, 0, 1)
+            dy: 垂直方向 (-1, 0, 1)
+        """
+        self.rect.x += dx * self.speed
+        self.rect.y += dy * self.speed
 
         # 边界检测
         self._keep_within_bounds()
 
     def _keep_within_bounds(self) -> None:
-        """确保玩家不会飞出屏幕"""
+        """确保玩家不会飞出世界"""
         if self.rect.left < 0:
             self.rect.left = 0
-        if self.rect.right > config.SCREEN_WIDTH:
-            self.rect.right = config.SCREEN_WIDTH
+        if self.rect.right > config.WORLD_WIDTH:
+            self.rect.right = config.WORLD_WIDTH
         if self.rect.top < 0:
             self.rect.top = 0
-        if self.rect.bottom > config.SCREEN_HEIGHT:
-            self.rect.bottom = config.SCREEN_HEIGHT
+        if self.rect.bottom > config.WORLD_HEIGHT:
+            self.rect.bottom = config.WORLD_HEIGHT
 
     def take_damage(self, amount: int) -> None:
         """
@@ -0,0 +1,257 @@
+"""
+空间索引精灵数组 - 按均匀网格登记精灵位置，只取镜头附近的精灵绘制和完整更新
+"""
+
+import heapq
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+import config
+from src.entities.sprite_array import SpriteArray
+
+
+class SpatialSpriteArray(SpriteArray):
+    """
+    带空间索引的精灵数组
+
+    精灵按 rect 中心所在的网格单元登记（单元边长应大于最大的精灵），
+    query() 只检查与查询区域相交的单元及外面一圈，开销与区域内的精灵数成正比。
+    精灵加入、kill() 和 empty() 时网格随之更新；移动后需调用 relocate()。
+
+    update_around() 只完整更新镜头附近的精灵，其余精灵“休眠”：
+    根据它与镜头附近区域的距离和双方的最大接近速度，算出它最早可能进入该区域的帧，
+    到时才唤醒并一次补齐期间的帧数（最多休眠 max_sleep 帧）。离得越远休眠越久，
+    世界再大，每帧处理的也只有附近的精灵加上少量到期唤醒的精灵。
+    精灵的 update() 需接受 steps 参数（一次推进的帧数）。
+    """
+
+    def __init__(
+        self, *sprites: pygame.sprite.Sprite, cell_size: int = config.SPATIAL_CELL_SIZE
+    ) -> None:
+        """
+        初始化空间索引精灵数组
+
+        Args:
+            sprites: 初始精灵
+            cell_size: 网格单元边长（像素）
+        """
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Dict[pygame.sprite.Sprite, None]] = {}
+        self._cell_of: Dict[pygame.sprite.Sprite, Tuple[int, int]] = {}
+        # 精灵上次更新时的帧号；新精灵视为在当前帧已更新
+        self._updated: Dict[pygame.sprite.Sprite, int] = {}
+        # 休眠精灵的唤醒帧号，以及 (唤醒帧号, 序号, 精灵) 小顶堆（过期条目在弹出时跳过）
+        self._wake_at: Dict[pygame.sprite.Sprite, int] = {}
+        self._wake_heap: List[Tuple[int, int, pygame.sprite.Sprite]] = []
+        self._sequence = count()
+        self.frame: int = 0
+        super().__init__(*sprites)
+
+    # ------------------------------------------------------------------
+    # 网格
+    # ------------------------------------------------------------------
+
+    def _cell(self, rect: pygame.Rect) -> Tuple[int, int]:
+        """
+        求矩形中心所在的网格单元
+
+        Args:
+            rect: 矩形
+
+        Returns:
+            Tuple[int, int]: (列, 行)
+        """
+        return rect.centerx // self.cell_size, rect.centery // self.cell_size
+
+    def add_internal(self, sprite: pygame.sprite.Sprite) -> None:
+        super().add_internal(sprite)
+        cell = self._cell(sprite.rect)
+        self._cells.setdefault(cell, {})[sprite] = None
+        self._cell_of[sprite] = cell
+        self._updated[sprite] = self.frame
+        self._schedule(sprite, self.frame + 1)
+
+    def remove_internal(self, sprite: pygame.sprite.Sprite) -> None:
+        super().remove_internal(sprite)
+        cell = self._cell_of.pop(sprite)
+        members = self._cells[cell]
+        del members[sprite]
+        if not members:
+            del self._cells[cell]
+        del self._updated[sprite]
+        del self._wake_at[sprite]
+
+    def empty(self) -> None:
+        super().empty()
+        self._cells.clear()
+        self._cell_of.clear()
+        self._updated.clear()
+        self._wake_at.clear()
+        self._wake_heap.clear()
+
+    def reset(self, frame: int) -> None:
+        """
+        把当前帧号改为 frame，所有精灵视为已更新到这一帧，并从下一帧起重新安排唤醒
+
+        读档、回退等让帧号倒退时必须调用（最好在重新加入精灵之前），
+        否则精灵记录的更新帧号比当前帧还晚，会一直停在原地。
+
+        Args:
+            frame: 新的当前帧号
+        """
+        self.frame = frame
+        self._wake_at.clear()
+        self._wake_heap.clear()
+        for sprite in self._updated:
+            self._updated[sprite] = frame
+            self._schedule(sprite, frame + 1)
+
+    def relocate(self, sprite: pygame.sprite.Sprite) -> None:
+        """
+        精灵移动后更新它所在的网格单元
+
+        Args:
+            sprite: 本容器中的精灵
+        """
+        old = self._cell_of.get(sprite)
+        if old is None:
+            return
+        cell = self._cell(sprite.rect)
+        if cell == old:
+            return
+        members = self._cells[old]
+        del members[sprite]
+        if not members:
+            del self._cells[old]
+        self._cells.setdefault(cell, {})[sprite] = None
+        self._cell_of[sprite] = cell
+
+    def query(self, rect: pygame.Rect) -> List[pygame.sprite.Sprite]:
+        """
+        获取与区域相交的精灵
+
+        Args:
+            rect: 世界坐标区域
+
+        Returns:
+            List[pygame.sprite.Sprite]: 精灵列表，按存放顺序排列（与 sprites() 中的相对顺序一致）
+        """
+        size = self.cell_size
+        # 精灵按中心登记，多查外面一圈单元才不会漏掉跨单元的精灵
+        x0 = rect.left // size - 1
+        y0 = rect.top // size - 1
+        x1 = (rect.right - 1) // size + 1
+        y1 = (rect.bottom - 1) // size + 1
+        found: List[pygame.sprite.Sprite] = []
+        cells = self._cells
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(cells):
+            # 区域覆盖的单元比已占用的单元还多时，直接遍历已占用的单元
+            for (cx, cy), members in cells.items():
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    found.extend(s for s in members if rect.colliderect(s.rect))
+        else:
+            for cy in range(y0, y1 + 1):
+                for cx in range(x0, x1 + 1):
+                    members = cells.get((cx, cy))
+                    if members:
+                        found.extend(s for s in members if rect.colliderect(s.rect))
+        found.sort(key=self._index.__getitem__)
+        return found
+
+    # ------------------------------------------------------------------
+    # 更新
+    # ------------------------------------------------------------------
+
+    def _step(self, sprite: pygame.sprite.Sprite, frame: int) -> None:
+        """
+        把精灵推进到指定帧
+
+        Args:
+            sprite: 精灵
+            frame: 目标帧号
+        """
+        last = self._updated.get(sprite)
+        if last is None or frame <= last:
+            return
+        steps = frame - last
+        self._updated[sprite] = frame
+        sprite.update(steps)
+        if sprite in self._index:
+            self.relocate(sprite)
+
+    def _schedule(self, sprite: pygame.sprite.Sprite, frame: int) -> None:
+        """
+        安排精灵在指定帧唤醒
+
+        Args:
+            sprite: 精灵
+            frame: 唤醒帧号
+        """
+        self._wake_at[sprite] = frame
+        heapq.heappush(self._wake_heap, (frame, next(self._sequence), sprite))
+
+    def update_around(
+        self,
+        view: pygame.Rect,
+        frame: int,
+        closing_speed: int,
+        max_sleep: int = config.FAR_MAX_SLEEP,
+    ) -> List[pygame.sprite.Sprite]:
+        """
+        完整更新区域内的精灵，唤醒到期的休眠精灵
+
+        Args:
+            view: 每帧更新的世界坐标区域（通常是镜头范围加上边距）
+            frame: 当前帧号（每帧加一）
+            closing_speed: 精灵与区域每帧最多接近的像素数（精灵最大速度加镜头最大速度）
+            max_sleep: 最长休眠帧数
+
+        Returns:
+            List[pygame.sprite.Sprite]: 更新前位于区域内的精灵
+        """
+        if frame <= self.frame:
+            # 帧号倒退（没有经过 reset() 的读档或回退），从上一帧重新开始计时
+            self.reset(frame - 1)
+        self.frame = frame
+        near = self.query(view)
+        for sprite in near:
+            self._step(sprite, frame)
+
+        heap = self._wake_heap
+        wake_at = self._wake_at
+        closing_speed = max(1, closing_speed)
+        while heap and heap[0][0] <= frame:
+            due, _, sprite = heapq.heappop(heap)
+            if wake_at.get(sprite) != due:
+                continue  # 已移除或已重新安排
+            self._step(sprite, frame)
+            if sprite not in self._index:
+                continue
+            # 到区域的距离（在区域内为 0），决定下次唤醒的时间
+            rect = sprite.rect
+            dx = max(view.left - rect.right, rect.left - view.right, 0)
+            dy = max(view.top - rect.bottom, rect.top - view.bottom, 0)
+            sleep = min(max_sleep, max(dx, dy) // closing_speed)
+            self._schedule(sprite, frame + max(1, sleep))
+        return near
+
+    def blit_items(
+        self, view: Optional[pygame.Rect] = None, offset: Tuple[int, int] = (0, 0)
+    ) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """
+        抓取区域内精灵的 (图像, 左上角坐标) 列表（区域内的精灵由空间索引查出）
+
+        Args:
+            view: 世界坐标区域，为 None 时返回全部精灵
+            offset: 加到坐标上的偏移（世界坐标转屏幕坐标）
+
+        Returns:
+            List[Tuple[pygame.Surface, Tuple[int, int]]]: 绘制列表
+        """
+        if view is None:
+            sprites = [sprite for sprite in self._sprites if sprite is not None]
+        else:
+            sprites = self.query(view)
+        dx, dy = offset
+        return [(sprite.image, (sprite.rect.x + dx, sprite.rect.y + dy)) for sprite in sprites]
@@ -0,0 +1,185 @@
+"""
+精灵数组 - 用连续列表存储精灵的轻量容器，替代 pygame.sprite.Group
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pygame
+from src.ui.render_scale import blit_sprites
+
+
+class SpriteArray:
+    """
+    精灵数组
+
+    精灵按顺序存放在一个列表里，另用字典记录每个精灵的下标：
+    - 添加是一次 append
+    - kill()/remove() 只把对应槽位置为 None，真正的移除推迟到 flush() 统一处理，
+      用“与末尾交换后弹出”的方式每个 O(1)，不会打断正在进行的遍历
+    - draw() 把所有图像一次性交给 Surface.blits() 批量绘制（支持缩放后的后台缓冲区）
+
+    实现了 pygame 精灵组的内部协议（add_internal/remove_internal/has_internal），
+    因此 Sprite.kill()、Sprite.alive() 以及 pygame.sprite.spritecollide/groupcollide 均可直接使用。
+    注意：flush() 会交换元素位置，精灵顺序不保证与添加顺序一致。
+    """
+
+    # 让 Sprite.add()/Sprite.remove() 把本容器识别为精灵组
+    _spritegroup = True
+
+    def __init__(self, *sprites: pygame.sprite.Sprite) -> None:
+        """
+        初始化精灵数组
+
+        Args:
+            sprites: 初始精灵
+        """
+        self._sprites: List[Optional[pygame.sprite.Sprite]] = []
+        self._index: Dict[pygame.sprite.Sprite, int] = {}
+        self._pending: List[int] = []
+        self.add(*sprites)
+
+    # ------------------------------------------------------------------
+    # 精灵组内部协议
+    # ------------------------------------------------------------------
+
+    def add_internal(self, sprite: pygame.sprite.Sprite) -> None:
+        """登记精灵（由 Sprite.add() 调用）"""
+        self._index[sprite] = len(self._sprites)
+        self._sprites.append(sprite)
+
+    def remove_internal(self, sprite: pygame.sprite.Sprite) -> None:
+        """标记精灵待移除（由 Sprite.kill()/Sprite.remove() 调用）"""
+        index = self._index.pop(sprite)
+        self._sprites[index] = None
+        self._pending.append(index)
+
+    def has_internal(self, sprite: pygame.sprite.Sprite) -> bool:
+        """检查是否包含精灵"""
+        return sprite in self._index
+
+    # ------------------------------------------------------------------
+    # 与 pygame.sprite.Group 兼容的接口
+    # ------------------------------------------------------------------
+
+    def add(self, *sprites: pygame.sprite.Sprite) -> None:
+        """
+        添加精灵
+
+        Args:
+            sprites: 要添加的精灵
+        """
+        for sprite in sprites:
+            if sprite not in self._index:
+                self.add_internal(sprite)
+                sprite.add_internal(self)
+
+    def remove(self, *sprites: pygame.sprite.Sprite) -> None:
+        """
+        移除精灵
+
+        Args:
+            sprites: 要移除的精灵
+        """
+        for sprite in sprites:
+            if sprite in self._index:
+                self.remove_internal(sprite)
+                sprite.remove_internal(self)
+
+    def has(self, *sprites: pygame.sprite.Sprite) -> bool:
+        """
+        检查是否包含所有给定精灵
+
+        Args:
+            sprites: 要检查的精灵
+
+        Returns:
+            bool: 是否全部包含
+        """
+        return all(sprite in self._index for sprite in sprites)
+
+    def sprites(self) -> List[pygame.sprite.Sprite]:
+        """
+        获取所有存活精灵的列表（副本）
+
+        Returns:
+            List[pygame.sprite.Sprite]: 精灵列表
+        """
+        if self._pending:
+            return [sprite for sprite in self._sprites if sprite is not None]
+        return list(self._sprites)
+
+    def update(self, *args, **kwargs) -> None:
+        """对所有精灵调用 update()，本次更新中新加入的精灵不会被更新"""
+        sprites = self._sprites
+        for index in range(len(sprites)):
+            sprite = sprites[index]
+            if sprite is not None:
+                sprite.update(*args, **kwargs)
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """
+        批量绘制所有精灵
+
+        Args:
+            surface: 目标表面
+        """
+        blit_sprites(surface, [sprite for sprite in self._sprites if sprite is not None])
+
+    def blit_items(
+        self, view: Optional[pygame.Rect] = None, offset: Tuple[int, int] = (0, 0)
+    ) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """
+        抓取绘制所需的 (图像, 左上角坐标) 列表（流水线模式下交给主线程绘制）
+
+        Args:
+            view: 只抓取与该区域相交的精灵，为 None 时抓取全部
+            offset: 加到坐标上的偏移（世界坐标转屏幕坐标）
+
+        Returns:
+            List[Tuple[pygame.Surface, Tuple[int, int]]]: 绘制列表
+        """
+        dx, dy = offset
+        return [
+            (sprite.image, (sprite.rect.x + dx, sprite.rect.y + dy))
+            for sprite in self._sprites
+            if sprite is not None and (view is None or view.colliderect(sprite.rect))
+        ]
+
+    def empty(self) -> None:
+        """移除所有精灵"""
+        for sprite in self._sprites:
+            if sprite is not None:
+                sprite.remove_internal(self)
+        self._sprites.clear()
+        self._index.clear()
+        self._pending.clear()
+
+    def flush(self) -> None:
+        """真正移除所有待移除的精灵（每帧调用一次）"""
+        if not self._pending:
+            return
+
+        sprites = self._sprites
+        index_of = self._index
+        # 从后往前处理，保证换到前面的末尾元素一定是存活的
+        for index in sorted(self._pending, reverse=True):
+            last = sprites.pop()
+            if index < len(sprites):
+                sprites[index] = last
+                index_of[last] = index
+        self._pending.clear()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __bool__(self) -> bool:
+        return bool(self._index)
+
+    def __contains__(self, sprite: object) -> bool:
+        return sprite in self._index
+
+    def __iter__(self) -> Iterator[pygame.sprite.Sprite]:
+        return iter(self.sprites())
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}({len(self)} sprites)>"
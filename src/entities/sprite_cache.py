@@ -0,0 +1,165 @@
+"""
+精灵旋转缓存 - 按量化角度和缩放比例缓存旋转后的图像，所有同类精灵共用
+"""
+
+import math
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Tuple
+
+import pygame
+import config
+
+
+class OrientedImage(NamedTuple):
+    """旋转/缩放后的图像"""
+
+    image: pygame.Surface
+    offset: Tuple[int, int]  # 相对未旋转图像左上角的偏移（保持中心不变）
+    key: Tuple[Any, int, float]  # (图像来源, 方向编号, 缩放比例)，淘汰后重新生成的图像 key 不变
+
+
+def heading_angle(dx: float, dy: float, facing: Tuple[float, float] = (0, -1)) -> float:
+    """
+    求让图像从原始朝向转到移动方向所需的旋转角度
+
+    Args:
+        dx: 移动方向 X 分量（屏幕坐标，向右为正）
+        dy: 移动方向 Y 分量（屏幕坐标，向下为正）
+        facing: 原始图像的朝向，例如机头向上为 (0, -1)
+
+    Returns:
+        float: 逆时针旋转的角度（度），与 pygame.transform.rotate 一致
+    """
+    # 屏幕 Y 轴向下，取反后才是数学上的逆时针角度
+    target = math.degrees(math.atan2(-dy, dx))
+    origin = math.degrees(math.atan2(-facing[1], facing[0]))
+    return (target - origin) % 360.0
+
+
+class RotationCache:
+    """
+    旋转缓存
+
+    每种图像来源（提供 base_image() 类方法的实体类）只绘制一次原始图像；
+    旋转角度量化为 steps 个方向，第一次用到某个 (方向, 比例) 时才生成并缓存，
+    之后所有精灵共用同一张 Surface，不再每帧调用 pygame.transform.rotate。
+    缓存按最近使用顺序淘汰，旋转图像的总字节数不超过 max_bytes；原始图像始终保留。
+    """
+
+    def __init__(
+        self,
+        steps: int = config.SPRITE_ROTATION_STEPS,
+        max_bytes: int = config.SPRITE_CACHE_MAX_BYTES,
+    ) -> None:
+        """
+        初始化旋转缓存
+
+        Args:
+            steps: 一整圈量化成的方向数
+            max_bytes: 旋转图像的内存上限（字节）
+        """
+        self.steps = steps
+        self.max_bytes = max_bytes
+        self.bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._bases: Dict[Any, pygame.Surface] = {}
+        self._entries: "OrderedDict[Tuple[Any, int, float], Tuple[OrientedImage, int]]" = (
+            OrderedDict()
+        )
+
+    def base(self, source: Any) -> pygame.Surface:
+        """
+        获取原始图像（第一次调用时绘制）
+
+        Args:
+            source: 图像来源，需提供 base_image() -> pygame.Surface
+
+        Returns:
+            pygame.Surface: 原始图像（共用，不要修改）
+        """
+        image = self._bases.get(source)
+        if image is None:
+            image = source.base_image()
+            self._bases[source] = image
+        return image
+
+    def quantize(self, angle: float) -> int:
+        """
+        把角度量化为方向编号
+
+        Args:
+            angle: 逆时针角度（度）
+
+        Returns:
+            int: 0 到 steps - 1 的方向编号
+        """
+        return round(angle * self.steps / 360.0) % self.steps
+
+    def get(self, source: Any, angle: float, scale: float = 1.0) -> OrientedImage:
+        """
+        获取旋转/缩放后的图像
+
+        Args:
+            source: 图像来源，需提供 base_image() -> pygame.Surface
+            angle: 逆时针角度（度），按 steps 量化
+            scale: 缩放比例
+
+        Returns:
+            OrientedImage: 共用的图像及其相对原始图像左上角的偏移
+        """
+        step = self.quantize(angle)
+        base = self.base(source)
+        key = (source, step, scale)
+        if step == 0 and scale == 1.0:
+            return OrientedImage(base, (0, 0), key)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        image = pygame.transform.rotozoom(base, step * 360.0 / self.steps, scale)
+        width, height = image.get_size()
+        offset = ((base.get_width() - width) // 2, (base.get_height() - height) // 2)
+        oriented = OrientedImage(image, offset, key)
+        size = width * height * image.get_bytesize()
+        self._entries[key] = (oriented, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+        return oriented
+
+    def orient(self, sprite: pygame.sprite.Sprite, source: Any, angle: float, scale: float = 1.0) -> None:
+        """
+        让精灵换成旋转后的图像，保持中心位置不变
+
+        同时把图像的 key 记在 sprite.image_key 上，按图像登记的容器（例如 ECS 的 World）
+        应以它为键，而不是以 Surface 本身为键，否则会一直引用已被淘汰的图像。
+
+        Args:
+            sprite: 精灵（需有 image 和 rect）
+            source: 图像来源
+            angle: 逆时针角度（度）
+            scale: 缩放比例
+        """
+        image, _, key = self.get(source, angle, scale)
+        sprite.image_key = key
+        if image is not sprite.image:
+            sprite.image = image
+            sprite.rect = image.get_rect(center=sprite.rect.center)
+
+    def clear(self) -> None:
+        """清空旋转图像（原始图像保留）"""
+        self._entries.clear()
+        self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 所有实体共用的旋转缓存
+sprite_cache = RotationCache()
@@ -0,0 +1,156 @@
+"""
+音频系统 - 预加载音效库并管理声道池
+"""
+
+import math
+import os
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+import config
+
+
+class AudioManager:
+    """
+    音效管理器
+
+    启动时一次性把所有音效解码为 pygame.mixer.Sound，之后播放只做声道调度：
+    - 预留固定数量的声道，自己负责分配和回收
+    - 声道耗尽时按优先级抢占（优先级低、播放最早的先被抢占）
+    - 同一音效每帧最多播放 AUDIO_MAX_SAME_PER_FRAME 次，避免连发时堆叠
+    """
+
+    def __init__(self, audio_dir: str = config.AUDIO_DIR) -> None:
+        """
+        初始化音效管理器
+
+        Args:
+            audio_dir: 音效文件目录
+        """
+        self.audio_dir = audio_dir
+        self.enabled: bool = pygame.mixer.get_init() is not None
+        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.priorities: Dict[str, int] = {}
+        self.channels: List[pygame.mixer.Channel] = []
+        # 每个声道当前播放的 (优先级, 开始帧)
+        self._voices: List[Tuple[int, int]] = []
+        self._frame: int = 0
+        self._played_this_frame: Dict[str, int] = {}
+
+        if self.enabled:
+            self._reserve_channels()
+            self._load_sounds()
+
+    def _reserve_channels(self) -> None:
+        """预留音效声道，使其不会被 Sound.play() 自动占用"""
+        count = config.AUDIO_SFX_CHANNELS
+        if pygame.mixer.get_num_channels() < count:
+            pygame.mixer.set_num_channels(count)
+        pygame.mixer.set_reserved(count)
+        self.channels = [pygame.mixer.Channel(i) for i in range(count)]
+        self._voices = [(0, -1)] * count
+
+    def _load_sounds(self) -> None:
+        """一次性解码所有音效，缺失的文件用合成的占位音替代"""
+        for name, (filename, priority, volume) in config.SFX_DEFINITIONS.items():
+            path = os.path.join(self.audio_dir, filename)
+            sound: Optional[pygame.mixer.Sound] = None
+            if os.path.isfile(path):
+                try:
+                    sound = pygame.mixer.Sound(path)
+                except pygame.error:
+                    sound = None
+            if sound is None:
+                sound = self._synthesize(name)
+            if sound is None:
+                continue
+
+            sound.set_volume(volume * config.VOLUME)
+            self.sounds[name] = sound
+            self.priorities[name] = priority
+
+    def _synthesize(self, name: str) -> Optional[pygame.mixer.Sound]:
+        """
+        生成占位音效（短促的衰减正弦波）
+
+        Args:
+            name: 音效名称
+
+        Returns:
+            Optional[pygame.mixer.Sound]: 合成的音效，格式不支持时返回 None
+        """
+        frequency, size, channels = pygame.mixer.get_init()
+        if size != -16:
+            return None
+
+        # 不同音效用不同的音高和长度区分
+        pitch = 880 + (sum(map(ord, name)) % 8) * 110
+        duration = 0.08 if name == "shoot" else 0.25
+        count = int(frequency * duration)
+
+        samples = array("h")
+        for i in range(count):
+            envelope = 1.0 - i / count
+            value = int(12000 * envelope * math.sin(2 * math.pi * pitch * i / frequency))
+            samples.extend([value] * channels)
+        return pygame.mixer.Sound(buffer=samples.tobytes())
+
+    def begin_frame(self) -> None:
+        """开始新的一帧，重置每帧的播放计数"""
+        self._frame += 1
+        self._played_this_frame.clear()
+
+    def play(self, name: str) -> Optional[pygame.mixer.Channel]:
+        """
+        播放音效
+
+        Args:
+            name: 音效名称
+
+        Returns:
+            Optional[pygame.mixer.Channel]: 播放所用的声道，被限流或没有可用声道时返回 None
+        """
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+
+        played = self._played_this_frame.get(name, 0)
+        if played >= config.AUDIO_MAX_SAME_PER_FRAME:
+            return None
+
+        priority = self.priorities[name]
+        index = self._find_channel(priority)
+        if index is None:
+            return None
+
+        channel = self.channels[index]
+        channel.play(sound)
+        self._voices[index] = (priority, self._frame)
+        self._played_this_frame[name] = played + 1
+        return channel
+
+    def _find_channel(self, priority: int) -> Optional[int]:
+        """
+        查找可用声道：优先空闲声道，否则抢占优先级不高于当前音效的最老声道
+
+        Args:
+            priority: 待播放音效的优先级
+
+        Returns:
+            Optional[int]: 声道索引，没有可用声道时返回 None
+        """
+        victim: Optional[int] = None
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+            if self._voices[index][0] > priority:
+                continue
+            if victim is None or self._voices[index] < self._voices[victim]:
+                victim = index
+        return victim
+
+    def stop_all(self) -> None:
+        """停止所有音效"""
+        for channel in self.channels:
+            channel.stop()
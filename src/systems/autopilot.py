@@ -0,0 +1,205 @@
+"""
+自动驾驶系统 - 基于威胁网格的机器人玩家，用于无人值守的长时间压力测试
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+import config
+
+
+# 候选移动方向（含原地不动）
+MOVES: List[Tuple[int, int]] = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+
+class Autopilot:
+    """
+    自动驾驶控制器
+
+    每帧把敌人（以及将来的敌方子弹）按其未来几帧的轨迹光栅化到一张粗粒度的
+    NumPy 威胁网格上，再用积分图求出玩家机身覆盖范围内的威胁总和，
+    在 9 个候选移动方向中选择威胁最低、收益（正上方有敌人可打）最高的一个。
+    参与光栅化的实体数量有上限，网格尺寸固定，因此每帧开销有界。
+
+    作为 Player 的输入源使用：Player.controller = Autopilot()
+    """
+
+    def __init__(
+        self,
+        cell_size: int = config.AUTOPILOT_CELL_SIZE,
+        lookahead: int = config.AUTOPILOT_LOOKAHEAD,
+        max_entities: int = config.AUTOPILOT_MAX_ENTITIES,
+    ) -> None:
+        """
+        初始化自动驾驶
+
+        Args:
+            cell_size: 网格单元边长（像素）
+            lookahead: 预测敌人轨迹的帧数
+            max_entities: 每帧最多光栅化的实体数量
+        """
+        self.cell_size = cell_size
+        self.lookahead = lookahead
+        self.max_entities = max_entities
+        self.cols = -(-config.SCREEN_WIDTH // cell_size)
+        self.rows = -(-config.SCREEN_HEIGHT // cell_size)
+
+        self.threat = np.zeros((self.rows, self.cols), dtype=np.float32)
+        self.value = np.zeros(self.cols, dtype=np.float32)
+        # 积分图多一行一列，便于做区域求和
+        self._integral = np.zeros((self.rows + 1, self.cols + 1), dtype=np.float32)
+
+        self.move: Tuple[int, int] = (0, 0)
+        self.fire: bool = False
+
+    def get_move(self) -> Tuple[int, int]:
+        """
+        获取本帧的移动方向（Player 输入源接口）
+
+        Returns:
+            Tuple[int, int]: (dx, dy)
+        """
+        return self.move
+
+    def _nearest(
+        self, player_rect: pygame.Rect, sprites: Iterable[pygame.sprite.Sprite]
+    ) -> List[pygame.sprite.Sprite]:
+        """
+        选出距离玩家最近的若干实体
+
+        Args:
+            player_rect: 玩家矩形
+            sprites: 候选实体
+
+        Returns:
+            List[pygame.sprite.Sprite]: 最多 max_entities 个实体
+        """
+        sprites = list(sprites)
+        if len(sprites) <= self.max_entities:
+            return sprites
+        cy = player_rect.centery
+        cx = player_rect.centerx
+        sprites.sort(key=lambda s: abs(s.rect.centery - cy) + abs(s.rect.centerx - cx))
+        return sprites[: self.max_entities]
+
+    def rasterize(
+        self,
+        sprites: Sequence[pygame.sprite.Sprite],
+        weight: float,
+        origin: Tuple[int, int] = (0, 0),
+    ) -> None:
+        """
+        把实体当前位置到 lookahead 帧后位置扫过的区域累加到威胁网格
+
+        实体需有 rect，可选 speed（向下为正）和 velocity（(vx, vy)，优先使用）。
+
+        Args:
+            sprites: 实体列表
+            weight: 威胁权重
+            origin: 网格左上角的世界坐标
+        """
+        if not sprites:
+            return
+        size = self.cell_size
+        ox, oy = origin
+        boxes = np.empty((len(sprites), 4), dtype=np.int32)
+        for i, sprite in enumerate(sprites):
+            rect = sprite.rect
+            vx, vy = getattr(sprite, "velocity", (0, getattr(sprite, "speed", 0)))
+            ex = vx * self.lookahead
+            ey = vy * self.lookahead
+            boxes[i] = (
+                rect.left - ox + min(0, ex),
+                rect.top - oy + min(0, ey),
+                rect.right - ox + max(0, ex),
+                rect.bottom - oy + max(0, ey),
+            )
+
+        boxes //= size
+        np.clip(boxes[:, 0::2], 0, self.cols - 1, out=boxes[:, 0::2])
+        np.clip(boxes[:, 1::2], 0, self.rows - 1, out=boxes[:, 1::2])
+        threat = self.threat
+        for x0, y0, x1, y1 in boxes.tolist():
+            threat[y0 : y1 + 1, x0 : x1 + 1] += weight
+
+    def _area_cost(self, rect: pygame.Rect) -> float:
+        """
+        求矩形覆盖的网格区域内的威胁总和（积分图 O(1)）
+
+        Args:
+            rect: 屏幕坐标矩形
+
+        Returns:
+            float: 威胁总和
+        """
+        size = self.cell_size
+        x0 = max(0, rect.left // size)
+        y0 = max(0, rect.top // size)
+        x1 = min(self.cols, (rect.right - 1) // size + 1)
+        y1 = min(self.rows, (rect.bottom - 1) // size + 1)
+        if x0 >= x1 or y0 >= y1:
+            return 0.0
+        s = self._integral
+        return float(s[y1, x1] - s[y0, x1] - s[y1, x0] + s[y0, x0])
+
+    def plan(
+        self,
+        player: pygame.sprite.Sprite,
+        enemies: Iterable[pygame.sprite.Sprite],
+        hostile_projectiles: Iterable[pygame.sprite.Sprite] = (),
+        view: Optional[pygame.Rect] = None,
+    ) -> None:
+        """
+        计算本帧的移动和射击决策
+
+        Args:
+            player: 玩家精灵（需有 rect 和 speed）
+            enemies: 敌人
+            hostile_projectiles: 敌方子弹（目前游戏中没有，预留接口）
+            view: 镜头看到的世界区域（威胁网格覆盖的范围），为 None 时为屏幕
+        """
+        rect = player.rect
+        size = self.cell_size
+        origin = view.topleft if view is not None else (0, 0)
+        ox, oy = origin
+        self.threat.fill(0.0)
+        self.value.fill(0.0)
+
+        targets = self._nearest(rect, enemies)
+        self.rasterize(targets, config.AUTOPILOT_ENEMY_WEIGHT, origin)
+        self.rasterize(
+            self._nearest(rect, hostile_projectiles), config.AUTOPILOT_PROJECTILE_WEIGHT, origin
+        )
+        np.cumsum(np.cumsum(self.threat, axis=0), axis=1, out=self._integral[1:, 1:])
+
+        # 收益：玩家上方的敌人所在的列
+        for sprite in targets:
+            if sprite.rect.bottom < rect.top:
+                col = min(self.cols - 1, max(0, (sprite.rect.centerx - ox) // size))
+                self.value[col] += 1.0
+
+        # 在若干帧后的位置评估每个候选方向（网格内的坐标）
+        step = player.speed * config.AUTOPILOT_MOVE_HORIZON
+        home_y = config.PLAYER_START_Y
+        local = rect.move(-ox, -oy)
+        best: Optional[Tuple[float, Tuple[int, int]]] = None
+        for dx, dy in MOVES:
+            candidate = local.move(dx * step, dy * step)
+            candidate.clamp_ip(pygame.Rect(0, 0, config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+            col = min(self.cols - 1, max(0, candidate.centerx // size))
+            score = (
+                -self._area_cost(candidate)
+                + config.AUTOPILOT_VALUE_WEIGHT * float(self.value[col])
+                - config.AUTOPILOT_HOME_WEIGHT * abs(candidate.centery - home_y) / size
+                - (0.01 if (dx, dy) != (0, 0) else 0.0)  # 同分时倾向不动，避免抖动
+            )
+            if best is None or score > best[0]:
+                best = (score, (dx, dy))
+
+        self.move = best[1]
+        self.fire = any(
+            sprite.rect.bottom < rect.top
+            and sprite.rect.left - size <= rect.centerx <= sprite.rect.right + size
+            for sprite in targets
+        )
@@ -0,0 +1,105 @@
+"""
+镜头系统 - 世界坐标与屏幕坐标的换算，镜头跟随玩家并限制在世界范围内
+"""
+
+from typing import Optional, Tuple
+
+import pygame
+import config
+
+
+class Camera:
+    """
+    镜头
+
+    所有实体的 rect 都是世界坐标（0 到 config.WORLD_WIDTH/WORLD_HEIGHT）。
+    rect 是镜头在世界中看到的区域，绘制时把世界坐标减去 rect 左上角得到屏幕坐标。
+    世界与屏幕一样大时镜头固定在原点，世界坐标就是屏幕坐标。
+    """
+
+    def __init__(
+        self,
+        width: int = config.SCREEN_WIDTH,
+        height: int = config.SCREEN_HEIGHT,
+        world_size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        """
+        初始化镜头
+
+        Args:
+            width: 可见区域宽度（逻辑像素）
+            height: 可见区域高度（逻辑像素）
+            world_size: 世界大小 (宽, 高)，为 None 时读取 config.WORLD_WIDTH/WORLD_HEIGHT
+        """
+        if world_size is None:
+            world_size = (config.WORLD_WIDTH, config.WORLD_HEIGHT)
+        self.world = pygame.Rect(0, 0, max(width, world_size[0]), max(height, world_size[1]))
+        self.rect = pygame.Rect(0, 0, width, height)
+
+    @property
+    def scrolling(self) -> bool:
+        """世界是否大于可见区域"""
+        return self.world.size != self.rect.size
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """世界坐标加上这个偏移得到屏幕坐标"""
+        return -self.rect.x, -self.rect.y
+
+    def follow(self, target: pygame.Rect) -> None:
+        """
+        让目标位于画面中央（靠近世界边缘时停在边缘）
+
+        Args:
+            target: 目标的世界坐标矩形
+        """
+        self.rect.center = target.center
+        self.rect.clamp_ip(self.world)
+
+    def view(self, margin: int = 0) -> pygame.Rect:
+        """
+        获取可见区域向外扩展 margin 后的世界坐标矩形
+
+        Args:
+            margin: 每边扩展的像素数
+
+        Returns:
+            pygame.Rect: 世界坐标矩形（新对象）
+        """
+        return self.rect.inflate(margin * 2, margin * 2)
+
+    def bounds(self, margin: int = 0) -> Tuple[int, int, int, int]:
+        """
+        获取扩展后的可见区域与世界的交集，超出它的实体可以直接销毁
+
+        Args:
+            margin: 每边扩展的像素数
+
+        Returns:
+            Tuple[int, int, int, int]: (x, y, 宽, 高)
+        """
+        return tuple(self.view(margin).clip(self.world))
+
+    def to_screen(self, rect: pygame.Rect) -> pygame.Rect:
+        """
+        世界坐标矩形转换为屏幕坐标
+
+        Args:
+            rect: 世界坐标矩形
+
+        Returns:
+            pygame.Rect: 屏幕坐标矩形（新对象）
+        """
+        return rect.move(-self.rect.x, -self.rect.y)
+
+    def to_world(self, point: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        屏幕坐标点转换为世界坐标
+
+        Args:
+            point: 屏幕坐标 (x, y)
+
+        Returns:
+            Tuple[int, int]: 世界坐标 (x, y)
+        """
+        return point[0] + self.rect.x, point[1] + self.rect.y
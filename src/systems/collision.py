@@ -5,6 +5,7 @@
 import pygame
 from typing import List, Tuple
 import config
+from src.ecs.adapters import EntityGroup
 
 
 class CollisionSystem:
@@ -27,6 +28,9 @@ class CollisionSystem:
         Returns:
             List[pygame.sprite.Sprite]: 被击中的敌人列表
         """
+        if isinstance(bullets, EntityGroup):
+            return self._check_bullet_entity_collision(bullets, enemies)
+
         hits = pygame.sprite.groupcollide(enemies, bullets, False, True)
         hit_enemies = []
 
@@ -37,6 +41,35 @@ class CollisionSystem:
 
         return hit_enemies
 
+    def _check_bullet_entity_collision(
+        self, bullets: EntityGroup, enemies: pygame.sprite.Group
+    ) -> List[pygame.sprite.Sprite]:
+        """
+        检测 ECS 子弹与敌人的碰撞（批量求交，结果与 groupcollide 一致）
+
+        Args:
+            bullets: ECS 子弹组
+            enemies: 敌人精灵组或精灵列表（例如空间索引查出的附近敌人）
+
+        Returns:
+            List[pygame.sprite.Sprite]: 被击中的敌人列表
+        """
+        enemy_list = list(enemies)
+        index, hit_ids = bullets.collide_rects([enemy.rect for enemy in enemy_list])
+        world = bullets.world
+        hit_enemies = []
+
+        for i, entity in zip(index.tolist(), hit_ids.tolist()):
+            # 一颗子弹只能击中一个敌人（与 groupcollide 相同，按敌人顺序先到先得）
+            if not world.alive(entity):
+                continue
+            enemy = enemy_list[i]
+            enemy.take_damage(int(world.get(entity, "damage")["amount"]))
+            world.destroy(entity)
+            hit_enemies.append(enemy)
+
+        return hit_enemies
+
     def check_player_enemy_collision(
         self, player: pygame.sprite.Sprite, enemies: pygame.sprite.Group
     ) -> bool:
@@ -45,12 +78,20 @@ class CollisionSystem:
 
         Args:
             player: 玩家精灵
-            enemies: 敌人精灵组
+            enemies: 敌人精灵组或精灵列表
 
         Returns:
             bool: 是否发生碰撞
         """
-        hits = pygame.sprite.spritecollide(player, enemies, True)
+        if not isinstance(enemies, list):
+            hits = pygame.sprite.spritecollide(player, enemies, True)
+            return len(hits) > 0
+
+        # 精灵列表可能包含本帧已被子弹击毁的敌人
+        rect = player.rect
+        hits = [enemy for enemy in enemies if enemy.alive() and rect.colliderect(enemy.rect)]
+        for enemy in hits:
+            enemy.kill()
         return len(hits) > 0
 
     def check_collisions(
@@ -0,0 +1,292 @@
+"""
+高分存储系统 - 追加日志 + 压缩索引的本地排行榜
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import config
+
+
+class ScoreRecord(NamedTuple):
+    """一条分数记录"""
+
+    profile: str
+    score: int
+    timestamp: float
+
+
+class HighScoreStore:
+    """
+    高分存储
+
+    磁盘上由两个文件组成：
+    - 追加日志（每行一条 JSON 记录），每次写入后 fsync，崩溃最多丢失最后一条不完整的行
+    - 压缩索引（每个档案的前 N 名 + 已合并的日志偏移），通过临时文件 + os.replace 原子替换
+
+    加载时读取索引，再回放索引之后新增的日志尾部，代价只与 N 和尾部长度有关。
+    所有磁盘写入都在后台线程完成，submit() 不会阻塞游戏循环。
+    """
+
+    LOG_NAME = "scores.log"
+    INDEX_NAME = "scores.idx"
+
+    def __init__(self, data_dir: str = config.SAVE_DIR, top_n: int = config.HIGHSCORE_TOP_N) -> None:
+        """
+        初始化高分存储并加载已有数据
+
+        Args:
+            data_dir: 数据目录
+            top_n: 每个档案保留的名次数量
+        """
+        self.data_dir = data_dir
+        self.top_n = top_n
+        self.log_path = os.path.join(data_dir, self.LOG_NAME)
+        self.index_path = os.path.join(data_dir, self.INDEX_NAME)
+
+        # 内存排行榜（包含尚未落盘的记录），供界面查询
+        self._tables: Dict[str, List[ScoreRecord]] = {}
+        # 已写入日志的排行榜，仅由写线程维护，压缩索引以它为准
+        self._durable: Dict[str, List[ScoreRecord]] = {}
+        self._lock = threading.Lock()
+        self._log_offset: int = 0
+        self._pending_since_compact: int = 0
+
+        self._queue: "queue.Queue[Optional[ScoreRecord]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        """读取压缩索引并回放其后的日志尾部"""
+        if os.path.isfile(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._log_offset = int(data.get("log_offset", 0))
+                for profile, entries in data.get("profiles", {}).items():
+                    self._durable[profile] = [
+                        ScoreRecord(profile, int(score), float(ts)) for score, ts in entries
+                    ]
+            except (OSError, ValueError, TypeError):
+                # 索引损坏时从头回放日志重建
+                self._durable.clear()
+                self._log_offset = 0
+
+        if os.path.isfile(self.log_path):
+            # 日志比索引记录的还短（例如被手动截断），同样从头回放
+            if os.path.getsize(self.log_path) < self._log_offset:
+                self._durable.clear()
+                self._log_offset = 0
+            self._replay_log()
+
+        self._tables = {profile: list(table) for profile, table in self._durable.items()}
+
+    def _replay_log(self) -> None:
+        """回放索引偏移之后的日志记录，并截掉崩溃时写了一半的最后一行"""
+        end = self._log_offset
+        torn = False
+        with open(self.log_path, "rb") as f:
+            f.seek(self._log_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    torn = True
+                    break
+                end += len(line)
+                record = self._parse_line(line)
+                if record is not None:
+                    self._insert(self._durable, record)
+                    self._pending_since_compact += 1
+
+        if torn:
+            # 否则下一条追加的记录会接在残行后面一起损坏
+            with open(self.log_path, "r+b") as f:
+                f.truncate(end)
+
+    @staticmethod
+    def _parse_line(line: bytes) -> Optional[ScoreRecord]:
+        """
+        解析一行日志
+
+        Args:
+            line: 原始行
+
+        Returns:
+            Optional[ScoreRecord]: 解析出的记录，格式错误时返回 None
+        """
+        try:
+            data = json.loads(line)
+            return ScoreRecord(str(data["profile"]), int(data["score"]), float(data["ts"]))
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _insert(self, tables: Dict[str, List[ScoreRecord]], record: ScoreRecord) -> int:
+        """
+        把记录插入排行榜
+
+        Args:
+            tables: 目标排行榜
+            record: 分数记录
+
+        Returns:
+            int: 名次（从 1 开始），未进入前 N 名时返回 0
+        """
+        table = tables.setdefault(record.profile, [])
+        rank = len(table)
+        # 分数相同时先达成的排在前面
+        while rank > 0 and table[rank - 1].score < record.score:
+            rank -= 1
+        if rank >= self.top_n:
+            return 0
+        table.insert(rank, record)
+        del table[self.top_n:]
+        return rank + 1
+
+    def top(self, profile: str = config.DEFAULT_PROFILE) -> List[ScoreRecord]:
+        """
+        获取档案的排行榜
+
+        Args:
+            profile: 档案名
+
+        Returns:
+            List[ScoreRecord]: 按分数从高到低排列的记录
+        """
+        with self._lock:
+            return list(self._tables.get(profile, []))
+
+    def best(self, profile: str = config.DEFAULT_PROFILE) -> int:
+        """
+        获取档案的最高分
+
+        Args:
+            profile: 档案名
+
+        Returns:
+            int: 最高分，没有记录时为 0
+        """
+        table = self.top(profile)
+        return table[0].score if table else 0
+
+    def profiles(self) -> List[str]:
+        """
+        获取所有档案名
+
+        Returns:
+            List[str]: 档案名列表
+        """
+        with self._lock:
+            return sorted(self._tables)
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def submit(self, score: int, profile: str = config.DEFAULT_PROFILE) -> int:
+        """
+        提交分数，立即更新内存排行榜，磁盘写入交给后台线程
+
+        Args:
+            score: 分数
+            profile: 档案名
+
+        Returns:
+            int: 名次（从 1 开始），未进入前 N 名时返回 0
+        """
+        record = ScoreRecord(profile, int(score), time.time())
+        with self._lock:
+            rank = self._insert(self._tables, record)
+        self._ensure_writer()
+        self._queue.put(record)
+        return rank
+
+    def _ensure_writer(self) -> None:
+        """首次写入时启动后台写线程"""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="highscore-writer", daemon=True
+            )
+            self._writer.start()
+
+    def _writer_loop(self) -> None:
+        """后台写线程：追加日志，必要时压缩索引"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        while True:
+            record = self._queue.get()
+            if record is None:
+                self._queue.task_done()
+                break
+            try:
+                self._append(record)
+                self._insert(self._durable, record)
+                self._pending_since_compact += 1
+                if self._pending_since_compact >= config.HIGHSCORE_COMPACT_EVERY:
+                    self.compact()
+            except OSError as e:
+                print(f"[HighScore] 写入失败: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _append(self, record: ScoreRecord) -> None:
+        """
+        追加一条记录到日志并落盘
+
+        Args:
+            record: 分数记录
+        """
+        line = json.dumps(
+            {"profile": record.profile, "score": record.score, "ts": record.timestamp},
+            ensure_ascii=False,
+        )
+        with open(self.log_path, "ab") as f:
+            f.write(line.encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def compact(self) -> None:
+        """
+        把已落盘的排行榜写成新的索引文件（原子替换）
+
+        只能在写线程内或写线程停止后调用，保证索引与日志偏移一致。
+        """
+        os.makedirs(self.data_dir, exist_ok=True)
+        offset = os.path.getsize(self.log_path) if os.path.isfile(self.log_path) else 0
+        profiles: Dict[str, List[Tuple[int, float]]] = {
+            profile: [(r.score, r.timestamp) for r in table]
+            for profile, table in self._durable.items()
+        }
+
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"log_offset": offset, "profiles": profiles}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+        self._log_offset = offset
+        self._pending_since_compact = 0
+
+    def flush(self) -> None:
+        """等待所有排队的写入完成"""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """写完剩余记录，压缩索引并停止后台线程"""
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        if self._pending_since_compact:
+            try:
+                self.compact()
+            except OSError as e:
+                print(f"[HighScore] 压缩索引失败: {e}")
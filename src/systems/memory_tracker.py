@@ -0,0 +1,278 @@
+"""
+内存跟踪系统 - 调试模式下统计内存增长、存活对象数量和 GC 停顿，显示在画面上并写入日志
+"""
+
+import gc
+import json
+import os
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence, Sized, Tuple
+
+import pygame
+import config
+
+
+# 增长排行中忽略的内部分配（不用 Snapshot.filter_traces，它逐条做通配符匹配，比拍快照本身慢得多）
+_IGNORED_FILES = frozenset(
+    {
+        tracemalloc.__file__,
+        "<frozen importlib._bootstrap>",
+        "<frozen importlib._bootstrap_external>",
+        "<unknown>",
+    }
+)
+
+
+def _short_path(filename: str) -> str:
+    """
+    只保留路径的最后两级，便于在画面上显示
+
+    Args:
+        filename: 完整文件路径
+
+    Returns:
+        str: 缩短后的路径
+    """
+    parts = filename.replace("\\", "/").split("/")
+    return "/".join(parts[-2:])
+
+
+def count_live_objects() -> Dict[str, int]:
+    """
+    统计存活的 Enemy、Bullet、ECS 实体和 Surface 数量
+
+    Surface 是 C 扩展类型，不受 GC 跟踪，无法直接从 gc.get_objects() 中找到，
+    因此改为统计被 GC 跟踪的对象（实例字典、列表、缓存等）引用到的 Surface。
+    需要遍历整个堆，开销较大，只应定期调用。
+
+    Returns:
+        Dict[str, int]: {"enemies": ..., "bullets": ..., "entities": ..., "surfaces": ...}
+    """
+    from src.entities.enemy import Enemy
+    from src.entities.bullet import Bullet
+    from src.ecs.world import World
+
+    # 堆可能有数万个对象，逐个判断太慢，全部交给 C 实现的 filter 批量处理
+    objects = gc.get_objects()
+    referents = gc.get_referents(*objects)
+    return {
+        "enemies": len(list(filter(Enemy.__instancecheck__, objects))),
+        "bullets": len(list(filter(Bullet.__instancecheck__, objects))),
+        # 已迁移到 ECS 的实体（例如 RunningState 的子弹）不再是精灵对象
+        "entities": sum(len(world) for world in filter(World.__instancecheck__, objects)),
+        "surfaces": len(set(filter(pygame.Surface.__instancecheck__, referents))),
+    }
+
+
+class MemoryTracker:
+    """
+    内存跟踪器
+
+    - 每隔 interval 帧拍一张 tracemalloc 快照，与上一张按文件和行号比较，记录增长最多的位置
+    - 同时统计存活的 Enemy/Bullet/Surface 数量和各精灵组大小
+    - 通过 gc.callbacks 记录每次垃圾回收的停顿时间
+    结果显示在调试叠加层上，并以 NDJSON 格式追加到日志文件。
+
+    tracemalloc 会明显拖慢游戏，只在调试模式下启用。
+    """
+
+    def __init__(
+        self,
+        log_path: Optional[str] = config.MEMORY_LOG_PATH,
+        interval: int = config.MEMORY_SAMPLE_INTERVAL,
+        top_n: int = config.MEMORY_TOP_N,
+    ) -> None:
+        """
+        初始化内存跟踪器（开始跟踪分配并注册 GC 回调）
+
+        Args:
+            log_path: 日志文件路径，为 None 时不写日志
+            interval: 采样间隔（帧）
+            top_n: 每次记录增长最多的位置数量
+        """
+        self.log_path = log_path
+        self.interval = interval
+        self.top_n = top_n
+        self.frame: int = 0
+
+        # 最近一次采样的结果
+        self.traced_bytes: int = 0
+        self.traced_delta: int = 0
+        self.top_growth: List[Tuple[str, int, int]] = []  # (文件:行, 增长字节, 增长块数)
+        self.objects: Dict[str, int] = {}
+        self.groups: Dict[str, int] = {}
+
+        # GC 停顿统计（全程）和本采样周期内的统计
+        self.gc_count: int = 0
+        self.gc_max_ms: float = 0.0
+        self.gc_period_count: int = 0
+        self.gc_period_total_ms: float = 0.0
+        self.gc_period_max_ms: float = 0.0
+        self._gc_start: Optional[float] = None
+
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+        self._snapshot = tracemalloc.take_snapshot()
+        gc.callbacks.append(self._on_gc)
+
+        self._hud = None
+        self._log_file = None
+        if log_path:
+            directory = os.path.dirname(log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._log_file = open(log_path, "a", encoding="utf-8")
+
+    def _on_gc(self, phase: str, info: Dict[str, Any]) -> None:
+        """
+        GC 回调：记录每次回收的耗时
+
+        Args:
+            phase: "start" 或 "stop"
+            info: 回收信息（代数等）
+        """
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            pause_ms = (time.perf_counter() - self._gc_start) * 1000.0
+            self._gc_start = None
+            self.gc_count += 1
+            self.gc_max_ms = max(self.gc_max_ms, pause_ms)
+            self.gc_period_count += 1
+            self.gc_period_total_ms += pause_ms
+            self.gc_period_max_ms = max(self.gc_period_max_ms, pause_ms)
+
+    def update(self, groups: Dict[str, Sized]) -> bool:
+        """
+        每帧调用一次，到达采样间隔时采样
+
+        Args:
+            groups: 需要统计大小的精灵组（名称 -> 容器）
+
+        Returns:
+            bool: 本帧是否进行了采样
+        """
+        self.frame += 1
+        if self.frame % self.interval:
+            return False
+        self.sample(groups)
+        return True
+
+    def sample(self, groups: Dict[str, Sized]) -> Dict[str, Any]:
+        """
+        立即采样一次并写入日志
+
+        Args:
+            groups: 需要统计大小的精灵组（名称 -> 容器）
+
+        Returns:
+            Dict[str, Any]: 本次采样的记录
+        """
+        # 先拍快照，避免统计对象时的临时分配混入
+        snapshot = tracemalloc.take_snapshot()
+        stats = snapshot.compare_to(self._snapshot, "lineno")
+        self._snapshot = snapshot
+
+        self.traced_bytes, _ = tracemalloc.get_traced_memory()
+        self.traced_delta = sum(stat.size_diff for stat in stats)
+        growth = sorted(
+            (
+                stat
+                for stat in stats
+                if stat.size_diff > 0 and stat.traceback[0].filename not in _IGNORED_FILES
+            ),
+            key=lambda stat: stat.size_diff,
+            reverse=True,
+        )[: self.top_n]
+        self.top_growth = [
+            (
+                f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                stat.size_diff,
+                stat.count_diff,
+            )
+            for stat in growth
+        ]
+
+        self.objects = count_live_objects()
+        self.groups = {name: len(group) for name, group in groups.items()}
+
+        record = {
+            "time": time.time(),
+            "frame": self.frame,
+            "traced_bytes": self.traced_bytes,
+            "traced_delta": self.traced_delta,
+            "top_growth": [list(item) for item in self.top_growth],
+            "objects": self.objects,
+            "groups": self.groups,
+            "gc_count": self.gc_period_count,
+            "gc_total_ms": round(self.gc_period_total_ms, 3),
+            "gc_max_ms": round(self.gc_period_max_ms, 3),
+        }
+        if self._log_file is not None:
+            self._log_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._log_file.flush()
+
+        self.gc_period_count = 0
+        self.gc_period_total_ms = 0.0
+        self.gc_period_max_ms = 0.0
+        return record
+
+    def overlay_lines(self) -> List[str]:
+        """
+        生成叠加层显示的文字
+
+        Returns:
+            List[str]: 每行文字
+        """
+        lines = [
+            f"内存: {self.traced_bytes / 1024 / 1024:.1f} MB ({self.traced_delta / 1024:+.1f} KB)",
+            "对象: 敌人 {enemies} 子弹 {bullets} 实体 {entities} Surface {surfaces}".format(
+                enemies=self.objects.get("enemies", 0),
+                bullets=self.objects.get("bullets", 0),
+                entities=self.objects.get("entities", 0),
+                surfaces=self.objects.get("surfaces", 0),
+            ),
+        ]
+        if self.groups:
+            lines.append(" ".join(f"{name} {size}" for name, size in self.groups.items()))
+        lines.append(f"GC: {self.gc_count} 次 最长 {self.gc_max_ms:.1f} ms")
+        for location, size, count in self.top_growth[:3]:
+            lines.append(f"{location} {size / 1024:+.1f} KB ({count:+d})")
+        return lines
+
+    def draw(
+        self,
+        screen: pygame.Surface,
+        first_line: int = 1,
+        lines: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        在右上角的调试信息区域绘制叠加层
+
+        Args:
+            screen: 游戏屏幕对象
+            first_line: 从第几行调试信息开始绘制
+            lines: 事先抓取的文字（流水线模式），为 None 时使用当前统计
+        """
+        if self._hud is None:
+            from src.ui.hud import HUD
+            self._hud = HUD(screen)
+        elif self._hud.screen is not screen:
+            self._hud.set_screen(screen)
+        if lines is None:
+            lines = self.overlay_lines()
+        for index, line in enumerate(lines):
+            self._hud.draw_debug_line(first_line + index, line)
+
+    def close(self) -> None:
+        """停止跟踪，注销 GC 回调并关闭日志"""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self._started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
@@ -0,0 +1,662 @@
+"""
+联机系统 - 基于确定性帧同步（lockstep）的 2-4 人合作模式
+
+网络上只传输玩家输入：每帧的输入压缩为 1 个字节，打包成固定长度的数据包。
+本地输入延迟若干帧后生效；远端输入未到达时先预测（沿用上一次的输入），
+到达后发现预测错误就回滚到出错的帧重新模拟。
+"""
+
+import asyncio
+import queue
+import random
+import struct
+import threading
+import zlib
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+import config
+from src.systems import snapshot
+
+
+# 输入位
+INPUT_LEFT = 1 << 0
+INPUT_RIGHT = 1 << 1
+INPUT_UP = 1 << 2
+INPUT_DOWN = 1 << 3
+INPUT_FIRE = 1 << 4
+
+# 数据包: 魔数, 玩家编号, 有效输入数, 起始帧, 确认帧, 输入窗口
+PACKET_WINDOW = config.NET_PACKET_WINDOW
+PACKET_FORMAT = f"<2sBBIi{PACKET_WINDOW}s"
+PACKET_SIZE = struct.calcsize(PACKET_FORMAT)
+PACKET_MAGIC = b"LS"
+
+
+def read_local_input() -> int:
+    """
+    读取本机键盘输入
+
+    Returns:
+        int: 输入位
+    """
+    keys = pygame.key.get_pressed()
+    bits = 0
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        bits |= INPUT_LEFT
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        bits |= INPUT_RIGHT
+    if keys[pygame.K_UP] or keys[pygame.K_w]:
+        bits |= INPUT_UP
+    if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        bits |= INPUT_DOWN
+    if keys[pygame.K_SPACE]:
+        bits |= INPUT_FIRE
+    return bits
+
+
+class InputPacket(NamedTuple):
+    """输入数据包"""
+
+    player_id: int
+    start_frame: int
+    ack: int  # 发送方已连续收到的、接收方输入的最新帧
+    inputs: bytes
+
+    def pack(self) -> bytes:
+        """
+        打包为固定长度字节串
+
+        Returns:
+            bytes: 数据包
+        """
+        return struct.pack(
+            PACKET_FORMAT,
+            PACKET_MAGIC,
+            self.player_id,
+            len(self.inputs),
+            self.start_frame,
+            self.ack,
+            self.inputs,
+        )
+
+    @classmethod
+    def unpack(cls, data: bytes) -> Optional["InputPacket"]:
+        """
+        解析数据包
+
+        Args:
+            data: 原始字节
+
+        Returns:
+            Optional[InputPacket]: 数据包，格式不正确时返回 None
+        """
+        if len(data) != PACKET_SIZE:
+            return None
+        magic, player_id, count, start_frame, ack, inputs = struct.unpack(PACKET_FORMAT, data)
+        if magic != PACKET_MAGIC or count > PACKET_WINDOW:
+            return None
+        return cls(player_id, start_frame, ack, inputs[:count])
+
+
+# ----------------------------------------------------------------------
+# 传输层
+# ----------------------------------------------------------------------
+
+
+class Transport:
+    """传输层基类：无阻塞地收发固定长度的数据包"""
+
+    def send(self, peer: int, data: bytes) -> None:
+        """
+        发送数据包
+
+        Args:
+            peer: 目标玩家编号
+            data: 数据
+        """
+        raise NotImplementedError
+
+    def receive(self) -> List[bytes]:
+        """
+        取出所有已到达的数据包（不阻塞）
+
+        Returns:
+            List[bytes]: 数据包列表
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """关闭传输层"""
+        pass
+
+
+class LoopbackHub:
+    """进程内的假网络，用于测试；可模拟固定延迟和随机丢包"""
+
+    def __init__(self, latency: int = 0, loss: float = 0.0, seed: int = 0) -> None:
+        """
+        初始化假网络
+
+        Args:
+            latency: 数据包延迟（以接收方的 receive() 调用次数计）
+            loss: 丢包率
+            seed: 丢包随机种子
+        """
+        self.latency = latency
+        self.loss = loss
+        self._rng = random.Random(seed)
+        self._endpoints: Dict[int, "LoopbackTransport"] = {}
+
+    def endpoint(self, player_id: int) -> "LoopbackTransport":
+        """
+        创建玩家的传输端点
+
+        Args:
+            player_id: 玩家编号
+
+        Returns:
+            LoopbackTransport: 传输端点
+        """
+        transport = LoopbackTransport(self, player_id)
+        self._endpoints[player_id] = transport
+        return transport
+
+    def deliver(self, peer: int, data: bytes) -> None:
+        """
+        把数据包投递给目标端点
+
+        Args:
+            peer: 目标玩家编号
+            data: 数据
+        """
+        target = self._endpoints.get(peer)
+        if target is None or self._rng.random() < self.loss:
+            return
+        target.inbox.append((target.ticks + self.latency, data))
+
+
+class LoopbackTransport(Transport):
+    """进程内传输端点"""
+
+    def __init__(self, hub: LoopbackHub, player_id: int) -> None:
+        self.hub = hub
+        self.player_id = player_id
+        self.inbox: Deque[Tuple[int, bytes]] = deque()
+        self.ticks: int = 0
+
+    def send(self, peer: int, data: bytes) -> None:
+        self.hub.deliver(peer, data)
+
+    def receive(self) -> List[bytes]:
+        self.ticks += 1
+        packets = []
+        while self.inbox and self.inbox[0][0] <= self.ticks:
+            packets.append(self.inbox.popleft()[1])
+        return packets
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    """把收到的 UDP 数据报放入线程安全队列"""
+
+    def __init__(self, incoming: "queue.SimpleQueue[bytes]") -> None:
+        self.incoming = incoming
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        if len(data) == PACKET_SIZE:
+            self.incoming.put(data)
+
+
+class UdpTransport(Transport):
+    """
+    UDP 传输层
+
+    asyncio 事件循环运行在独立的后台线程里，游戏循环只做入队/出队，不会被网络阻塞。
+    """
+
+    def __init__(
+        self,
+        local_addr: Tuple[str, int],
+        peers: Optional[Dict[int, Tuple[str, int]]] = None,
+    ) -> None:
+        """
+        初始化并绑定 UDP 端口
+
+        Args:
+            local_addr: 本机地址（端口为 0 时自动分配）
+            peers: 玩家编号 -> 地址
+
+        Raises:
+            OSError: 端口绑定失败
+        """
+        self.local_addr = local_addr
+        self.peers: Dict[int, Tuple[str, int]] = dict(peers or {})
+        self._incoming: "queue.SimpleQueue[bytes]" = queue.SimpleQueue()
+        self._loop = asyncio.new_event_loop()
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._error: Optional[OSError] = None
+        self._ready = threading.Event()
+
+        self._thread = threading.Thread(target=self._run, name="netplay-udp", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        """后台线程：运行 asyncio 事件循环"""
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._transport, _ = self._loop.run_until_complete(
+                self._loop.create_datagram_endpoint(
+                    lambda: _DatagramProtocol(self._incoming), local_addr=self.local_addr
+                )
+            )
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            self._loop.close()
+            return
+
+        self.local_addr = self._transport.get_extra_info("sockname")[:2]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._transport.close()
+            self._loop.run_until_complete(asyncio.sleep(0))
+            self._loop.close()
+
+    def set_peer(self, peer: int, addr: Tuple[str, int]) -> None:
+        """
+        设置玩家地址
+
+        Args:
+            peer: 玩家编号
+            addr: 地址
+        """
+        self.peers[peer] = addr
+
+    def send(self, peer: int, data: bytes) -> None:
+        addr = self.peers.get(peer)
+        if addr is None or self._transport is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._transport.sendto, data, addr)
+
+    def receive(self) -> List[bytes]:
+        packets = []
+        while True:
+            try:
+                packets.append(self._incoming.get_nowait())
+            except queue.Empty:
+                return packets
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+
+# ----------------------------------------------------------------------
+# 确定性模拟
+# ----------------------------------------------------------------------
+
+
+class CoopSimulation:
+    """
+    多人合作的确定性模拟
+
+    只依赖每帧的输入和自身的随机数生成器，相同种子和相同输入序列在任何机器上
+    得到相同结果。分数为全队共享。
+    """
+
+    def __init__(self, num_players: int, seed: int) -> None:
+        """
+        初始化模拟
+
+        Args:
+            num_players: 玩家数量 (1-4)
+            seed: 随机种子（所有玩家必须一致）
+        """
+        from src.entities.player import Player
+        from src.entities.enemy import EnemySpawner
+        from src.entities.bullet import BulletManager
+        from src.systems.collision import CollisionSystem
+        from src.entities.sprite_array import SpriteArray
+
+        self.num_players = num_players
+        self.rng = random.Random(seed)
+        self.frame: int = 0
+        self.score: int = 0
+
+        spacing = config.SCREEN_WIDTH // (num_players + 1)
+        self.players: List[Player] = [
+            Player(spacing * (i + 1), config.PLAYER_START_Y) for i in range(num_players)
+        ]
+        self.bullet_managers: List[BulletManager] = [BulletManager() for _ in range(num_players)]
+
+        self.enemies = SpriteArray()
+        self.bullets = SpriteArray()
+        # 敌人上限固定为不限，不能受本地画质调节影响，否则各端会不同步
+        self.enemy_spawner = EnemySpawner(self.rng, max_alive=0)
+        self.collision_system = CollisionSystem()
+
+    def all_dead(self) -> bool:
+        """
+        检查是否全员阵亡
+
+        Returns:
+            bool: 是否全员阵亡
+        """
+        return not any(player.is_alive() for player in self.players)
+
+    def step(self, inputs: Sequence[int]) -> None:
+        """
+        推进一帧
+
+        Args:
+            inputs: 每名玩家本帧的输入位
+        """
+        for player, manager, bits in zip(self.players, self.bullet_managers, inputs):
+            if not player.is_alive():
+                continue
+            dx = (1 if bits & INPUT_RIGHT else 0) - (1 if bits & INPUT_LEFT else 0)
+            dy = (1 if bits & INPUT_DOWN else 0) - (1 if bits & INPUT_UP else 0)
+            player.move(dx, dy)
+            if bits & INPUT_FIRE:
+                x, y = player.get_position()
+                manager.shoot(x, y, self.bullets)
+            manager.update()
+
+        self.enemies.update()
+        self.bullets.update()
+        self.enemy_spawner.update(self.enemies)
+
+        hit_enemies = self.collision_system.check_bullet_enemy_collision(self.bullets, self.enemies)
+        for enemy in hit_enemies:
+            if not enemy.alive():
+                self.score += config.SCORE_ENEMY_KILL
+
+        for player in self.players:
+            if player.is_alive() and self.collision_system.check_player_enemy_collision(
+                player, self.enemies
+            ):
+                player.take_damage(20)
+
+        for player in self.players:
+            player.score = self.score
+        self.enemies.flush()
+        self.bullets.flush()
+        self.frame += 1
+
+    def save_state(self) -> Tuple[Any, ...]:
+        """
+        保存完整状态（用于回滚）
+
+        Returns:
+            Tuple[Any, ...]: 状态
+        """
+        players = np.array(
+            [
+                (p.rect.x, p.rect.y, p.health, m.cooldown_timer)
+                for p, m in zip(self.players, self.bullet_managers)
+            ],
+            dtype=np.int32,
+        )
+        enemies, bullets = snapshot.pack_entities(self.enemies, self.bullets)
+        return (
+            self.frame,
+            self.score,
+            self.rng.getstate(),
+            self.enemy_spawner.spawn_timer,
+            players,
+            enemies,
+            bullets,
+        )
+
+    def load_state(self, state: Tuple[Any, ...]) -> None:
+        """
+        恢复状态
+
+        Args:
+            state: save_state() 返回的状态
+        """
+        frame, score, rng_state, spawn_timer, players, enemies, bullets = state
+        self.frame = frame
+        self.score = score
+        self.rng.setstate(rng_state)
+        self.enemy_spawner.spawn_timer = spawn_timer
+        for player, manager, row in zip(self.players, self.bullet_managers, players.tolist()):
+            x, y, health, cooldown = row
+            player.rect.topleft = (x, y)
+            player.health = health
+            player.score = score
+            manager.cooldown_timer = cooldown
+        snapshot.unpack_entities(self.enemies, self.bullets, enemies, bullets)
+
+    def checksum(self) -> int:
+        """
+        计算状态校验值，用于检测不同步
+
+        Returns:
+            int: 校验值
+        """
+        _, score, _, spawn_timer, players, enemies, bullets = self.save_state()
+        data = players.tobytes() + enemies.tobytes() + bullets.tobytes()
+        header = struct.pack("<Iii", self.frame, score, spawn_timer)
+        return zlib.crc32(header + data)
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """
+        绘制所有存活玩家、敌人和子弹
+
+        Args:
+            screen: 目标表面
+        """
+        from src.ui.render_scale import blit_sprites
+
+        blit_sprites(screen, [player for player in self.players if player.is_alive()])
+        self.enemies.draw(screen)
+        self.bullets.draw(screen)
+
+
+# ----------------------------------------------------------------------
+# 帧同步会话
+# ----------------------------------------------------------------------
+
+
+class LockstepSession:
+    """
+    帧同步会话
+
+    每次 advance() 推进最多一帧：收包、登记本地输入（延迟 input_delay 帧生效）、
+    发包、必要时回滚重算，然后用已确认或预测的输入模拟下一帧。
+    领先最早确认帧超过 max_rollback 帧时暂停推进，等待远端输入。
+    """
+
+    def __init__(
+        self,
+        game: CoopSimulation,
+        local_id: int,
+        transport: Transport,
+        input_delay: int = config.NET_INPUT_DELAY,
+        max_rollback: int = config.NET_MAX_ROLLBACK,
+    ) -> None:
+        """
+        初始化会话
+
+        Args:
+            game: 确定性模拟
+            local_id: 本机玩家编号
+            transport: 传输层
+            input_delay: 本地输入延迟帧数
+            max_rollback: 最多允许领先确认帧的帧数
+        """
+        self.game = game
+        self.local_id = local_id
+        self.transport = transport
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+
+        n = game.num_players
+        # 延迟期内的帧所有玩家输入都视为空
+        self._inputs: List[Dict[int, int]] = [
+            {frame: 0 for frame in range(input_delay)} for _ in range(n)
+        ]
+        self._confirmed: List[int] = [input_delay - 1] * n
+        self._peer_ack: List[int] = [input_delay - 1] * n
+        self._used: Dict[int, Tuple[int, ...]] = {}
+        self._states: Dict[int, Tuple[Any, ...]] = {}
+        self._rollback_from: Optional[int] = None
+
+        self.rollbacks: int = 0
+        self.stalls: int = 0
+
+    @property
+    def confirmed_frame(self) -> int:
+        """所有玩家输入都已确认的最新帧"""
+        return min(self._confirmed)
+
+    def is_confirmed(self) -> bool:
+        """
+        当前状态是否完全由已确认的输入算出
+
+        Returns:
+            bool: 是否已确认
+        """
+        return self.confirmed_frame >= self.game.frame - 1
+
+    def poll(self) -> None:
+        """只处理收发包和回滚，不推进模拟（例如停在某一帧等待所有输入确认时）"""
+        self._receive()
+        self._send()
+        self._rollback()
+
+    def advance(self, local_bits: int) -> bool:
+        """
+        推进一帧
+
+        Args:
+            local_bits: 本机玩家当前的输入位
+
+        Returns:
+            bool: 是否推进了模拟（等待远端输入时为 False）
+        """
+        self._receive()
+
+        target = self.game.frame + self.input_delay
+        local = self._inputs[self.local_id]
+        if target not in local:
+            local[target] = local_bits & 0xFF
+            self._confirmed[self.local_id] = target
+
+        self._send()
+        self._rollback()
+
+        if self.game.frame - self.confirmed_frame > self.max_rollback:
+            self.stalls += 1
+            return False
+
+        self._simulate(self.game.frame)
+        self._prune()
+        return True
+
+    def _input_for(self, player: int, frame: int) -> int:
+        """
+        获取玩家某帧的输入，未到达时用最近确认的输入预测
+
+        Args:
+            player: 玩家编号
+            frame: 帧号
+
+        Returns:
+            int: 输入位
+        """
+        inputs = self._inputs[player]
+        if frame in inputs:
+            return inputs[frame]
+        return inputs.get(self._confirmed[player], 0)
+
+    def _simulate(self, frame: int) -> None:
+        """
+        模拟一帧，含预测输入的帧会先保存状态以便回滚
+
+        Args:
+            frame: 帧号（必须等于当前模拟帧）
+        """
+        inputs = tuple(self._input_for(p, frame) for p in range(self.game.num_players))
+        if frame > self.confirmed_frame:
+            self._states[frame] = self.game.save_state()
+            self._used[frame] = inputs
+        self.game.step(inputs)
+
+    def _rollback(self) -> None:
+        """发现预测错误时回到出错的帧重新模拟"""
+        start = self._rollback_from
+        if start is None:
+            return
+        self._rollback_from = None
+
+        end = self.game.frame
+        self.game.load_state(self._states[start])
+        for frame in range(start, end):
+            self._simulate(frame)
+        self.rollbacks += 1
+
+    def _receive(self) -> None:
+        """处理所有到达的数据包"""
+        for data in self.transport.receive():
+            packet = InputPacket.unpack(data)
+            if packet is None or packet.player_id == self.local_id:
+                continue
+            if packet.player_id >= self.game.num_players:
+                continue
+
+            player = packet.player_id
+            self._peer_ack[player] = max(self._peer_ack[player], packet.ack)
+
+            inputs = self._inputs[player]
+            for offset, bits in enumerate(packet.inputs):
+                frame = packet.start_frame + offset
+                if frame in inputs or frame <= self._confirmed[player]:
+                    continue
+                inputs[frame] = bits
+                used = self._used.get(frame)
+                if used is not None and used[player] != bits:
+                    if self._rollback_from is None or frame < self._rollback_from:
+                        self._rollback_from = frame
+
+            while self._confirmed[player] + 1 in inputs:
+                self._confirmed[player] += 1
+
+    def _send(self) -> None:
+        """向每个远端玩家发送其尚未确认的本地输入"""
+        local = self._inputs[self.local_id]
+        newest = self._confirmed[self.local_id]
+        for peer in range(self.game.num_players):
+            if peer == self.local_id:
+                continue
+            start = self._peer_ack[peer] + 1
+            end = min(newest, start + PACKET_WINDOW - 1)
+            window = bytes(local[frame] for frame in range(start, end + 1))
+            packet = InputPacket(self.local_id, start, self._confirmed[peer], window)
+            self.transport.send(peer, packet.pack())
+
+    def _prune(self) -> None:
+        """丢弃不再可能回滚到的状态和已被所有人确认的输入"""
+        confirmed = self.confirmed_frame
+        for frame in [f for f in self._states if f <= confirmed]:
+            del self._states[frame]
+            self._used.pop(frame, None)
+
+        acks = [ack for peer, ack in enumerate(self._peer_ack) if peer != self.local_id]
+        oldest_needed = min([confirmed] + acks)
+        for inputs in self._inputs:
+            for frame in [f for f in inputs if f < oldest_needed]:
+                del inputs[frame]
+
+    def close(self) -> None:
+        """关闭会话"""
+        self.transport.close()
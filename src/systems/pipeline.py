@@ -0,0 +1,121 @@
+"""
+流水线系统 - 模拟线程计算下一帧的同时，主线程绘制上一帧抓取的只读绘制数据
+"""
+
+import threading
+from typing import TYPE_CHECKING, List, Optional
+
+import pygame
+
+if TYPE_CHECKING:
+    from src.systems.state_machine import GameStateMachine, RenderFrame
+
+
+class SimulationPipeline:
+    """
+    模拟/渲染流水线
+
+    模拟线程依次处理主线程转交的事件、调用 state_machine.update()，再用
+    capture_render() 把画面抓取到两个帧槽中的另一个；主线程同时绘制当前帧槽。
+    帧数据是只读元组，抓取之后不再引用模拟中的可变状态，两个线程不会争用同一份数据。
+
+    - 事件始终在主线程中读取（SDL 要求），通过 start() 转交给模拟线程
+    - 不支持抓取的状态（菜单、暂停等）帧数据为 None，调用方应在模拟线程空闲时直接绘制
+    - 相比串行循环，输入到画面多一帧延迟
+
+    用法：start([]) 预先模拟一帧，之后每帧 frame = wait()、start(events)、绘制 frame。
+    """
+
+    def __init__(self, state_machine: "GameStateMachine") -> None:
+        """
+        初始化流水线并启动模拟线程
+
+        Args:
+            state_machine: 游戏状态机（之后只能在 wait() 与 start() 之间从主线程访问）
+        """
+        self.state_machine = state_machine
+        self._slots: List[Optional["RenderFrame"]] = [None, None]
+        self._slot: int = 0  # 最近一次抓取写入的帧槽
+        self._events: List[pygame.event.Event] = []
+        self._error: Optional[BaseException] = None
+        self._busy = False
+        self._closed = False
+
+        self._go = threading.Event()
+        self._done = threading.Event()
+        self._worker: Optional[threading.Thread] = threading.Thread(
+            target=self._worker_loop, name="simulation", daemon=True
+        )
+        self._worker.start()
+
+    @property
+    def busy(self) -> bool:
+        """模拟线程是否正在计算（已 start() 尚未 wait()）"""
+        return self._busy
+
+    def _worker_loop(self) -> None:
+        """模拟线程：等待开始信号，模拟一帧并抓取画面"""
+        while True:
+            self._go.wait()
+            self._go.clear()
+            if self._closed:
+                return
+            try:
+                for event in self._events:
+                    self.state_machine.handle_event(event)
+                self.state_machine.update()
+                slot = self._slot ^ 1
+                self._slots[slot] = self.state_machine.capture_render()
+                self._slot = slot
+            except BaseException as e:  # 交给主线程在 wait() 中重新抛出
+                self._error = e
+            self._done.set()
+
+    def start(self, events: List[pygame.event.Event]) -> None:
+        """
+        开始模拟下一帧
+
+        Args:
+            events: 本帧读取到的事件，按顺序交给状态机处理
+
+        Raises:
+            RuntimeError: 上一帧尚未 wait() 或流水线已关闭
+        """
+        if self._busy or self._closed:
+            raise RuntimeError("模拟线程忙碌或已关闭")
+        self._events = list(events)
+        self._busy = True
+        self._done.clear()
+        self._go.set()
+
+    def wait(self) -> "RenderFrame":
+        """
+        等待本帧模拟完成
+
+        Returns:
+            RenderFrame: 本帧抓取的绘制数据
+
+        Raises:
+            RuntimeError: 尚未 start()
+            BaseException: 模拟线程中抛出的异常
+        """
+        if not self._busy:
+            raise RuntimeError("没有正在进行的模拟")
+        self._done.wait()
+        self._busy = False
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        return self._slots[self._slot]
+
+    def close(self) -> None:
+        """等待正在进行的模拟结束并停止模拟线程"""
+        if self._worker is None:
+            return
+        if self._busy:
+            self._done.wait()
+            self._busy = False
+        self._closed = True
+        self._go.set()
+        self._worker.join()
+        self._worker = None
@@ -0,0 +1,124 @@
+"""
+画质调节系统 - 帧时间超出预算时逐级降低画质，恢复后再逐级回升
+"""
+
+from collections import deque
+from typing import Deque, List, NamedTuple
+
+import config
+
+
+class QualityTier(NamedTuple):
+    """画质档位"""
+
+    name: str
+    hud_refresh_interval: int  # HUD 文字每隔多少帧重新渲染
+    antialias: bool  # HUD 文字是否抗锯齿
+    render_scale: float  # 后台缓冲区比例（乘在 config.RENDER_SCALE 上）
+    max_enemies: int  # 同时存活的敌人上限，0 为不限
+
+
+# 从高到低，每一档在上一档基础上再多降一项
+QUALITY_TIERS: List[QualityTier] = [
+    QualityTier("高", 1, True, 1.0, 0),
+    QualityTier("中", 6, True, 1.0, 0),
+    QualityTier("低", 6, False, 1.0, 0),
+    QualityTier("很低", 12, False, 0.75, 0),
+    QualityTier("最低", 12, False, 0.5, 30),
+]
+
+
+class QualityGovernor:
+    """
+    画质调节器
+
+    记录最近 QUALITY_WINDOW 帧的工作耗时（不含 clock.tick 的等待时间）：
+    - 平均耗时超过预算的 QUALITY_DEGRADE_RATIO 时降一档
+    - 平均耗时持续低于预算的 QUALITY_RECOVER_RATIO 达到 QUALITY_RECOVER_WINDOWS 个窗口才升一档
+    升降阈值分开、回升需要更长的观察期，并且每次切换后清空样本重新观察，避免来回振荡。
+    """
+
+    def __init__(
+        self,
+        budget_ms: float = 1000.0 / config.FPS,
+        window: int = config.QUALITY_WINDOW,
+    ) -> None:
+        """
+        初始化画质调节器
+
+        Args:
+            budget_ms: 每帧时间预算（毫秒）
+            window: 滑动窗口帧数
+        """
+        self.budget_ms = budget_ms
+        self.window = window
+        self.level: int = 0
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._good_frames: int = 0
+
+    @property
+    def tier(self) -> QualityTier:
+        """当前画质档位"""
+        return QUALITY_TIERS[self.level]
+
+    def average_ms(self) -> float:
+        """
+        最近窗口内的平均帧耗时
+
+        Returns:
+            float: 平均耗时（毫秒），没有样本时为 0
+        """
+        if not self._samples:
+            return 0.0
+        return sum(self._samples) / len(self._samples)
+
+    def record(self, frame_ms: float) -> bool:
+        """
+        记录一帧的耗时，必要时切换档位
+
+        Args:
+            frame_ms: 本帧工作耗时（毫秒）
+
+        Returns:
+            bool: 档位是否发生变化
+        """
+        self._samples.append(frame_ms)
+        if len(self._samples) < self.window:
+            return False
+
+        average = self.average_ms()
+        if average > self.budget_ms * config.QUALITY_DEGRADE_RATIO:
+            self._good_frames = 0
+            if self.level < len(QUALITY_TIERS) - 1:
+                self._set_level(self.level + 1)
+                return True
+            return False
+
+        if average < self.budget_ms * config.QUALITY_RECOVER_RATIO:
+            self._good_frames += 1
+            if self.level > 0 and self._good_frames >= self.window * config.QUALITY_RECOVER_WINDOWS:
+                self._set_level(self.level - 1)
+                return True
+        else:
+            self._good_frames = 0
+        return False
+
+    def _set_level(self, level: int) -> None:
+        """
+        切换档位并应用设置
+
+        Args:
+            level: 新档位
+        """
+        self.level = level
+        self._samples.clear()
+        self._good_frames = 0
+        self.apply()
+
+    def apply(self) -> None:
+        """把当前档位写入运行时配置（HUD 和敌人生成器每帧读取）"""
+        tier = self.tier
+        config.QUALITY_LEVEL = self.level
+        config.HUD_REFRESH_INTERVAL = tier.hud_refresh_interval
+        config.HUD_ANTIALIAS = tier.antialias
+        config.ENEMY_MAX_ALIVE = tier.max_enemies
@@ -0,0 +1,487 @@
+"""
+离线导出系统 - 按输入脚本无头回放游戏，把每一帧交给编码进程导出为视频或 PNG 序列
+
+输入脚本每行一段：帧数和这段时间内按住的按键，# 之后为注释，例如：
+
+    1   return        # 在菜单按回车开始游戏
+    60  right         # 向右飞 60 帧
+    1   up space      # 按下空格发射一次（按住不会连发，与实际游戏一致）
+    30  up
+
+主线程模拟并绘制，编码在其他进程中进行（PNG 用进程池，视频通过管道交给编码程序），
+两者同时进行，导出速度远快于实时。
+"""
+
+import os
+import queue
+import random
+import shutil
+import subprocess
+import struct
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, FrozenSet, List, Optional, Sequence, Tuple
+
+import pygame
+import config
+
+
+# 按键别名（其余按键使用 pygame 的键名，例如 left、space、return、a、F5）
+_KEY_ALIASES = {"fire": "space", "enter": "return", "esc": "escape"}
+
+# 通过编码程序导出的视频格式，其余输出路径视为 PNG 序列目录
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".webm", ".avi", ".gif")
+
+
+class ScriptError(Exception):
+    """输入脚本无效"""
+
+
+def key_code(name: str) -> int:
+    """
+    把键名转换为 pygame 键码
+
+    Args:
+        name: 键名（不区分大小写），例如 left、space、a、F5，或别名 fire、enter、esc
+
+    Returns:
+        int: 键码
+
+    Raises:
+        ScriptError: 未知的键名
+    """
+    name = _KEY_ALIASES.get(name.lower(), name)
+    for attr in (f"K_{name}", f"K_{name.lower()}", f"K_{name.upper()}"):
+        code = getattr(pygame, attr, None)
+        if isinstance(code, int):
+            return code
+    raise ScriptError(f"未知的按键: {name}")
+
+
+class InputScript:
+    """
+    逐帧输入脚本
+
+    每帧记录按住的按键集合；按键从松开变为按住的那一帧产生 KEYDOWN 事件，
+    反之产生 KEYUP 事件，移动方向按住多久就持续多久。
+    """
+
+    def __init__(self, segments: Sequence[Tuple[int, FrozenSet[int]]]) -> None:
+        """
+        初始化输入脚本
+
+        Args:
+            segments: (帧数, 按住的键码集合) 列表
+        """
+        self._held: List[FrozenSet[int]] = []
+        for frames, keys in segments:
+            self._held.extend([frozenset(keys)] * frames)
+
+    @classmethod
+    def parse(cls, text: str) -> "InputScript":
+        """
+        解析脚本文本
+
+        Args:
+            text: 脚本内容
+
+        Returns:
+            InputScript: 输入脚本
+
+        Raises:
+            ScriptError: 格式错误或未知的按键（信息中包含行号）
+        """
+        segments = []
+        for number, line in enumerate(text.splitlines(), 1):
+            tokens = line.split("#", 1)[0].split()
+            if not tokens:
+                continue
+            try:
+                frames = int(tokens[0])
+                if frames <= 0:
+                    raise ValueError(tokens[0])
+                keys = frozenset(key_code(name) for name in tokens[1:])
+            except (ValueError, ScriptError) as e:
+                raise ScriptError(f"第 {number} 行无效: {e}") from e
+            segments.append((frames, keys))
+        return cls(segments)
+
+    @classmethod
+    def load(cls, path: str) -> "InputScript":
+        """
+        读取脚本文件
+
+        Args:
+            path: 文件路径（UTF-8）
+
+        Returns:
+            InputScript: 输入脚本
+
+        Raises:
+            OSError: 读取失败
+            ScriptError: 脚本无效
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.parse(f.read())
+
+    def __len__(self) -> int:
+        return len(self._held)
+
+    def held(self, frame: int) -> FrozenSet[int]:
+        """
+        获取某一帧按住的按键
+
+        Args:
+            frame: 帧号（从 0 开始，超出脚本长度时视为全部松开）
+
+        Returns:
+            FrozenSet[int]: 键码集合
+        """
+        if 0 <= frame < len(self._held):
+            return self._held[frame]
+        return frozenset()
+
+    def events(self, frame: int) -> List[pygame.event.Event]:
+        """
+        获取某一帧产生的按键事件（先松开后按下，同类事件按键码排序）
+
+        Args:
+            frame: 帧号
+
+        Returns:
+            List[pygame.event.Event]: KEYUP/KEYDOWN 事件
+        """
+        before = self.held(frame - 1)
+        now = self.held(frame)
+        return [
+            pygame.event.Event(pygame.KEYUP, key=key, mod=0) for key in sorted(before - now)
+        ] + [pygame.event.Event(pygame.KEYDOWN, key=key, mod=0) for key in sorted(now - before)]
+
+
+class ScriptController:
+    """
+    脚本输入源：作为 Player.controller 使用，按脚本中按住的按键移动
+    """
+
+    def __init__(self) -> None:
+        """初始化脚本输入源"""
+        self.held: FrozenSet[int] = frozenset()
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.held
+
+    def get_move(self) -> Tuple[int, int]:
+        """
+        获取本帧的移动方向（Player 输入源接口）
+
+        Returns:
+            Tuple[int, int]: (dx, dy)
+        """
+        from src.entities.player import Player
+
+        return Player.direction(self)
+
+
+# ----------------------------------------------------------------------
+# 编码器
+# ----------------------------------------------------------------------
+
+
+class FrameEncoder:
+    """编码器基类：按顺序接收 RGB 原始帧数据"""
+
+    target: str = ""  # 输出路径
+
+    def submit(self, index: int, data: bytes) -> None:
+        """
+        提交一帧（编码队列已满时阻塞）
+
+        Args:
+            index: 帧号（从 0 开始）
+            data: pygame.image.tobytes(surface, "RGB") 的结果
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """等待所有帧编码完成"""
+        pass
+
+
+def _png_chunk(kind: bytes, payload: bytes) -> bytes:
+    """
+    打包一个 PNG 数据块
+
+    Args:
+        kind: 块类型，例如 b"IHDR"
+        payload: 块内容
+
+    Returns:
+        bytes: 长度 + 类型 + 内容 + CRC
+    """
+    return struct.pack(">I", len(payload)) + kind + payload + struct.pack(
+        ">I", zlib.crc32(kind + payload)
+    )
+
+
+def _encode_png(path: str, data: bytes, size: Tuple[int, int], level: int) -> str:
+    """
+    把一帧 RGB 原始数据写成 PNG（在编码进程中运行）
+
+    不经过 pygame.image.save：它固定使用较高的压缩级别，单帧耗时是低压缩级别的数倍，
+    导出时编码速度比文件大小重要。
+
+    Args:
+        path: 文件路径
+        data: RGB 原始数据（逐行排列，无填充）
+        size: (宽, 高)
+        level: zlib 压缩级别 (1-9)
+
+    Returns:
+        str: 文件路径
+    """
+    width, height = size
+    stride = width * 3
+    # 每行前加一个过滤类型字节（0 = 不过滤）
+    rows = b"".join(b"\x00" + data[y * stride:(y + 1) * stride] for y in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8 位 RGB
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", header))
+        f.write(_png_chunk(b"IDAT", zlib.compress(rows, level)))
+        f.write(_png_chunk(b"IEND", b""))
+    return path
+
+
+class PngEncoder(FrameEncoder):
+    """
+    PNG 序列编码器
+
+    每帧交给进程池压缩并写入 directory/frame_000000.png；排队的帧数超过 max_pending 时
+    等待最早的一帧完成，主线程因此最多领先编码进程 max_pending 帧。
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        size: Tuple[int, int],
+        workers: int = config.EXPORT_WORKERS,
+        max_pending: int = config.EXPORT_MAX_PENDING,
+        level: int = config.EXPORT_PNG_LEVEL,
+    ) -> None:
+        """
+        初始化 PNG 编码器并启动进程池
+
+        Args:
+            directory: 输出目录（不存在时创建）
+            size: 帧大小 (宽, 高)
+            workers: 编码进程数，0 为 CPU 核心数
+            max_pending: 最多排队的帧数
+            level: zlib 压缩级别 (1-9)
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.target = directory
+        self.size = size
+        self.max_pending = max(1, max_pending)
+        self.level = level
+        self._pool: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(max_workers=workers or None)
+        self._pending: Deque["Future[str]"] = deque()
+
+    def submit(self, index: int, data: bytes) -> None:
+        if self._pool is None:
+            raise RuntimeError("编码器已关闭")
+        while len(self._pending) >= self.max_pending:
+            self._pending.popleft().result()
+        path = os.path.join(self.target, f"frame_{index:06d}.png")
+        self._pending.append(self._pool.submit(_encode_png, path, data, self.size, self.level))
+
+    def close(self) -> None:
+        if self._pool is None:
+            return
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+def encoder_command(binary: str, output: str, size: Tuple[int, int], fps: int) -> List[str]:
+    """
+    生成 ffmpeg 命令行：从标准输入读取 RGB 原始帧并编码为视频文件
+
+    Args:
+        binary: ffmpeg 可执行文件路径
+        output: 输出文件
+        size: 帧大小 (宽, 高)
+        fps: 帧率
+
+    Returns:
+        List[str]: 命令行参数
+    """
+    command = [
+        binary, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{size[0]}x{size[1]}", "-r", str(fps),
+        "-i", "-",
+    ]
+    if os.path.splitext(output)[1].lower() in (".mp4", ".mkv", ".mov"):
+        command += ["-pix_fmt", "yuv420p"]  # 大多数播放器只支持 4:2:0
+    return command + [output]
+
+
+class PipeEncoder(FrameEncoder):
+    """
+    管道编码器
+
+    启动编码程序，由写入线程把帧数据写进它的标准输入；写管道时不占用 GIL，
+    主线程继续模拟和绘制后面的帧，编码程序在自己的进程中压缩。
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        target: str = "",
+        max_pending: int = config.EXPORT_MAX_PENDING,
+    ) -> None:
+        """
+        初始化管道编码器并启动编码程序
+
+        Args:
+            command: 编码程序命令行（从标准输入读取原始帧）
+            target: 输出路径（只用于显示）
+            max_pending: 最多排队的帧数
+
+        Raises:
+            OSError: 无法启动编码程序
+        """
+        self.target = target
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(max(1, max_pending))
+        self._error: Optional[OSError] = None
+        self._writer: Optional[threading.Thread] = threading.Thread(
+            target=self._write_loop, name="encoder-pipe", daemon=True
+        )
+        self._writer.start()
+
+    def _write_loop(self) -> None:
+        """写入线程：把排队的帧写进编码程序的标准输入"""
+        stdin = self.process.stdin
+        while True:
+            data = self._queue.get()
+            if data is None:
+                return
+            if self._error is not None:
+                continue  # 编码程序已退出，丢弃剩余的帧
+            try:
+                stdin.write(data)
+            except OSError as e:
+                self._error = e
+
+    def submit(self, index: int, data: bytes) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"编码程序已退出: {self._error}")
+        if self._writer is None:
+            raise RuntimeError("编码器已关闭")
+        self._queue.put(data)
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        code = self.process.wait()
+        if code != 0:
+            raise RuntimeError(f"编码程序退出码 {code}")
+        if self._error is not None:
+            raise RuntimeError(f"编码程序已退出: {self._error}")
+
+
+def create_encoder(
+    output: str, size: Tuple[int, int], fps: int = config.EXPORT_FPS
+) -> FrameEncoder:
+    """
+    根据输出路径选择编码器
+
+    视频扩展名（.mp4 等）且找到 config.EXPORT_ENCODER 时通过管道编码为视频，
+    找不到编码程序时改为导出 PNG 序列到同名目录；其他路径视为 PNG 序列目录。
+
+    Args:
+        output: 输出路径
+        size: 帧大小 (宽, 高)
+        fps: 视频帧率
+
+    Returns:
+        FrameEncoder: 编码器（由调用方关闭）
+    """
+    root, ext = os.path.splitext(output)
+    if ext.lower() in VIDEO_EXTENSIONS:
+        binary = shutil.which(config.EXPORT_ENCODER)
+        if binary is not None:
+            return PipeEncoder(encoder_command(binary, output, size, fps), output)
+        print(f"[Export] 未找到 {config.EXPORT_ENCODER}，改为导出 PNG 序列到 {root}")
+        output = root
+    return PngEncoder(output, size)
+
+
+def export_replay(
+    encoder: FrameEncoder,
+    script: Optional[InputScript] = None,
+    frames: Optional[int] = None,
+    seed: int = config.EXPORT_SEED,
+) -> int:
+    """
+    无头回放输入脚本，把每一帧绘制到离屏画布后交给编码器
+
+    模拟前用 seed 重置全局 random（敌人的生成位置和速度），同一脚本、同一种子
+    每次导出的画面完全相同。不记录高分榜。开启自动驾驶（config.AUTOPILOT）时由机器人操作，
+    脚本中的按键事件仍然生效。需要先调用 pygame.init()。
+
+    Args:
+        encoder: 帧编码器（导出结束后关闭）
+        script: 输入脚本，为 None 时没有输入
+        frames: 导出的帧数，为 None 时使用脚本长度
+        seed: 随机种子
+
+    Returns:
+        int: 导出的帧数
+
+    Raises:
+        ValueError: 既没有脚本也没有指定帧数
+    """
+    from src.systems.state_machine import GameStateMachine, RunningState
+
+    if frames is None:
+        if script is None:
+            encoder.close()
+            raise ValueError("需要输入脚本或帧数")
+        frames = len(script)
+
+    random.seed(seed)
+    screen = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    state_machine = GameStateMachine(screen, record_scores=False)
+    controller = ScriptController()
+    try:
+        for index in range(frames):
+            if script is not None:
+                controller.held = script.held(index)
+                for event in script.events(index):
+                    state_machine.handle_event(event)
+
+            # 开始游戏时会重新创建运行状态，每帧重新接上脚本输入源
+            state = state_machine.current_state
+            if isinstance(state, RunningState) and state.autopilot is None:
+                state.player.controller = controller
+
+            state_machine.update()
+            state_machine.draw(screen)
+            encoder.submit(index, pygame.image.tobytes(screen, "RGB"))
+    finally:
+        state_machine.shutdown()
+        encoder.close()
+    return frames
@@ -0,0 +1,220 @@
+"""
+回放系统 - 按帧记录快照的环形缓冲区，支持回退和前进
+"""
+
+import zlib
+from collections import deque
+from typing import TYPE_CHECKING, Deque, NamedTuple, Optional
+
+import numpy as np
+import config
+from src.systems import snapshot
+
+if TYPE_CHECKING:
+    from src.systems.state_machine import RunningState
+
+
+# 每条记录除负载外的估算开销（deque 节点、元组、bytes 头）
+ENTRY_OVERHEAD = 96
+
+
+class _Entry(NamedTuple):
+    """缓冲区中的一帧"""
+
+    frame: int
+    keyframe: bool
+    size: int  # 解码后的快照字节数
+    payload: bytes  # 关键帧为压缩后的完整快照，其余为与上一帧异或后再压缩的差量
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    """
+    按字节异或两段数据，较短的一段末尾补零
+
+    Args:
+        a: 数据 A
+        b: 数据 B
+
+    Returns:
+        bytes: 异或结果，长度为两者中较长者
+    """
+    length = max(len(a), len(b))
+    left = np.zeros(length, dtype=np.uint8)
+    right = np.zeros(length, dtype=np.uint8)
+    left[:len(a)] = np.frombuffer(a, dtype=np.uint8)
+    right[:len(b)] = np.frombuffer(b, dtype=np.uint8)
+    return np.bitwise_xor(left, right).tobytes()
+
+
+class RewindBuffer:
+    """
+    回放缓冲区
+
+    每 K 帧保存一个关键帧，其余帧只保存与上一帧的差量（异或后压缩，
+    位置变化只影响少数字节，压缩后很小）。缓冲区同时受帧数上限和内存预算约束，
+    超出时从最旧的关键帧组开始整组淘汰，保证剩下的每一帧都能还原。
+    """
+
+    def __init__(
+        self,
+        capacity: int = config.REWIND_SECONDS * config.FPS,
+        keyframe_interval: int = config.REWIND_KEYFRAME_INTERVAL,
+        memory_budget: int = config.REWIND_MEMORY_BUDGET,
+    ) -> None:
+        """
+        初始化回放缓冲区
+
+        Args:
+            capacity: 最多保存的帧数
+            keyframe_interval: 关键帧间隔
+            memory_budget: 内存预算（字节）
+        """
+        self.capacity = capacity
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.memory_budget = memory_budget
+
+        self._entries: Deque[_Entry] = deque()
+        self._memory: int = 0
+        self._last_raw: Optional[bytes] = None
+        self._since_keyframe: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def memory_usage(self) -> int:
+        """当前占用的估算内存（字节）"""
+        return self._memory
+
+    @property
+    def first_frame(self) -> Optional[int]:
+        """最早可回退到的帧号"""
+        return self._entries[0].frame if self._entries else None
+
+    @property
+    def last_frame(self) -> Optional[int]:
+        """最新记录的帧号"""
+        return self._entries[-1].frame if self._entries else None
+
+    def clear(self) -> None:
+        """清空缓冲区"""
+        self._entries.clear()
+        self._memory = 0
+        self._last_raw = None
+        self._since_keyframe = 0
+
+    def record(self, state: "RunningState") -> None:
+        """
+        记录当前帧
+
+        帧号不连续（例如读档后）时会清空历史重新开始；同一帧重复记录会被忽略。
+
+        Args:
+            state: 游戏运行状态
+        """
+        last = self.last_frame
+        if last is not None:
+            if state.frame == last:
+                return
+            if state.frame != last + 1:
+                self.clear()
+
+        raw = snapshot.capture(state).to_bytes()
+        keyframe = self._last_raw is None or self._since_keyframe >= self.keyframe_interval
+        if keyframe:
+            payload = zlib.compress(raw, 1)
+            self._since_keyframe = 1
+        else:
+            payload = zlib.compress(_xor(self._last_raw, raw), 1)
+            self._since_keyframe += 1
+
+        self._entries.append(_Entry(state.frame, keyframe, len(raw), payload))
+        self._memory += len(payload) + ENTRY_OVERHEAD
+        self._last_raw = raw
+        self._evict()
+
+    def _evict(self) -> None:
+        """超出帧数或内存限制时，淘汰最旧的整组关键帧"""
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.capacity or self._memory > self.memory_budget
+        ):
+            self._pop_left()
+            # 失去关键帧的差量帧无法还原，一并丢弃
+            while self._entries and not self._entries[0].keyframe:
+                self._pop_left()
+
+        if not self._entries:
+            self._last_raw = None
+            self._since_keyframe = 0
+
+    def _pop_left(self) -> None:
+        """移除最旧的一帧"""
+        entry = self._entries.popleft()
+        self._memory -= len(entry.payload) + ENTRY_OVERHEAD
+
+    def _decode(self, frame: int) -> bytes:
+        """
+        还原指定帧的原始快照字节
+
+        Args:
+            frame: 帧号
+
+        Returns:
+            bytes: 快照字节
+
+        Raises:
+            KeyError: 该帧不在缓冲区内
+        """
+        first = self.first_frame
+        if first is None or not first <= frame <= self.last_frame:
+            raise KeyError(frame)
+
+        index = frame - first
+        start = index
+        while not self._entries[start].keyframe:
+            start -= 1
+
+        raw = zlib.decompress(self._entries[start].payload)
+        for i in range(start + 1, index + 1):
+            entry = self._entries[i]
+            raw = _xor(raw, zlib.decompress(entry.payload))[:entry.size]
+        return raw
+
+    def get(self, frame: int) -> snapshot.GameSnapshot:
+        """
+        获取指定帧的快照
+
+        Args:
+            frame: 帧号
+
+        Returns:
+            snapshot.GameSnapshot: 快照
+
+        Raises:
+            KeyError: 该帧不在缓冲区内
+        """
+        return snapshot.GameSnapshot.from_bytes(self._decode(frame))
+
+    def truncate_after(self, frame: int) -> None:
+        """
+        丢弃指定帧之后的历史（从回退位置继续游戏时开启新的时间线）
+
+        Args:
+            frame: 保留的最后一帧
+        """
+        if self.last_frame is None or frame >= self.last_frame:
+            return
+        if frame < self.first_frame:
+            self.clear()
+            return
+
+        while self._entries[-1].frame > frame:
+            entry = self._entries.pop()
+            self._memory -= len(entry.payload) + ENTRY_OVERHEAD
+
+        self._last_raw = self._decode(frame)
+        self._since_keyframe = 0
+        for entry in reversed(self._entries):
+            self._since_keyframe += 1
+            if entry.keyframe:
+                break
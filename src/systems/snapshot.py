@@ -0,0 +1,281 @@
+"""
+快照系统 - 运行中游戏状态的紧凑二进制序列化
+"""
+
+import os
+import struct
+from typing import TYPE_CHECKING, Tuple
+
+import numpy as np
+import pygame
+import config
+
+if TYPE_CHECKING:
+    from src.systems.state_machine import RunningState
+
+
+# 头部: 魔数, 版本, 帧号, 玩家(x, y, 生命, 分数), 生成计时, 冷却计时, 敌人数, 子弹数
+HEADER_FORMAT = "<4sHIiiiiiiII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MAGIC = b"PSNP"
+VERSION = 1
+
+ENEMY_DTYPE = np.dtype([
+    ("x", "<i4"),
+    ("y", "<i4"),
+    ("speed", "<i2"),
+    ("health", "<i2"),
+    ("damage", "<i2"),
+])
+
+BULLET_DTYPE = np.dtype([
+    ("x", "<i4"),
+    ("y", "<i4"),
+    ("speed", "<i2"),
+    ("damage", "<i2"),
+])
+
+
+class SnapshotError(Exception):
+    """快照数据无效"""
+
+
+class GameSnapshot:
+    """
+    游戏状态快照
+
+    标量状态保存在字段里，敌人和子弹保存为 NumPy 结构化数组（坐标为 rect 左上角），
+    序列化时直接拼接数组的原始字节，不对精灵对象做 pickle。
+    """
+
+    def __init__(
+        self,
+        frame: int,
+        player: np.ndarray,
+        spawn_timer: int,
+        cooldown_timer: int,
+        enemies: np.ndarray,
+        bullets: np.ndarray,
+    ) -> None:
+        """
+        初始化快照
+
+        Args:
+            frame: 帧号
+            player: 玩家状态 [x, y, health, score]
+            spawn_timer: 敌人生成计时
+            cooldown_timer: 射击冷却计时
+            enemies: 敌人数组（ENEMY_DTYPE）
+            bullets: 子弹数组（BULLET_DTYPE）
+        """
+        self.frame = frame
+        self.player = player
+        self.spawn_timer = spawn_timer
+        self.cooldown_timer = cooldown_timer
+        self.enemies = enemies
+        self.bullets = bullets
+
+    def to_bytes(self) -> bytes:
+        """
+        序列化为字节串
+
+        Returns:
+            bytes: 二进制快照
+        """
+        header = struct.pack(
+            HEADER_FORMAT,
+            MAGIC,
+            VERSION,
+            self.frame,
+            *(int(v) for v in self.player),
+            self.spawn_timer,
+            self.cooldown_timer,
+            len(self.enemies),
+            len(self.bullets),
+        )
+        return header + self.enemies.tobytes() + self.bullets.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "GameSnapshot":
+        """
+        从字节串解析快照
+
+        Args:
+            data: 二进制快照
+
+        Returns:
+            GameSnapshot: 解析出的快照
+
+        Raises:
+            SnapshotError: 数据格式不正确
+        """
+        if len(data) < HEADER_SIZE:
+            raise SnapshotError("快照数据过短")
+
+        fields = struct.unpack_from(HEADER_FORMAT, data)
+        magic, version, frame = fields[0], fields[1], fields[2]
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError(f"不支持的快照格式: {magic!r} v{version}")
+
+        player = np.array(fields[3:7], dtype=np.int32)
+        spawn_timer, cooldown_timer, enemy_count, bullet_count = fields[7:11]
+
+        expected = (
+            HEADER_SIZE
+            + enemy_count * ENEMY_DTYPE.itemsize
+            + bullet_count * BULLET_DTYPE.itemsize
+        )
+        if len(data) != expected:
+            raise SnapshotError(f"快照长度不符: {len(data)} != {expected}")
+
+        enemies = np.frombuffer(data, dtype=ENEMY_DTYPE, count=enemy_count, offset=HEADER_SIZE)
+        bullets = np.frombuffer(
+            data,
+            dtype=BULLET_DTYPE,
+            count=bullet_count,
+            offset=HEADER_SIZE + enemies.nbytes,
+        )
+        return cls(frame, player, spawn_timer, cooldown_timer, enemies.copy(), bullets.copy())
+
+
+def pack_entities(
+    enemies: pygame.sprite.Group, bullets: pygame.sprite.Group
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    把敌人和子弹打包成结构化数组
+
+    Args:
+        enemies: 敌人精灵组
+        bullets: 子弹精灵组
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (敌人数组, 子弹数组)
+    """
+    enemy_data = np.array(
+        [(e.rect.x, e.rect.y, e.speed, e.health, e.damage) for e in enemies],
+        dtype=ENEMY_DTYPE,
+    )
+    bullet_data = np.array(
+        [(b.rect.x, b.rect.y, b.speed, b.damage) for b in bullets],
+        dtype=BULLET_DTYPE,
+    )
+    return enemy_data, bullet_data
+
+
+def unpack_entities(
+    enemies: pygame.sprite.Group,
+    bullets: pygame.sprite.Group,
+    enemy_data: np.ndarray,
+    bullet_data: np.ndarray,
+) -> None:
+    """
+    用结构化数组重建敌人和子弹（先清空精灵组）
+
+    Args:
+        enemies: 敌人精灵组
+        bullets: 子弹精灵组
+        enemy_data: 敌人数组
+        bullet_data: 子弹数组
+    """
+    from src.entities.enemy import Enemy
+    from src.entities.bullet import Bullet
+
+    enemies.empty()
+    for x, y, speed, health, damage in enemy_data.tolist():
+        enemy = Enemy(0, 0, speed)
+        enemy.rect.topleft = (x, y)
+        enemy.health = health
+        enemy.damage = damage
+        enemies.add(enemy)
+
+    bullets.empty()
+    for x, y, speed, damage in bullet_data.tolist():
+        bullet = Bullet(0, 0)
+        bullet.rect.topleft = (x, y)
+        bullet.speed = speed
+        bullet.damage = damage
+        bullets.add(bullet)
+
+
+def capture(state: "RunningState") -> GameSnapshot:
+    """
+    抓取运行状态的快照
+
+    Args:
+        state: 游戏运行状态
+
+    Returns:
+        GameSnapshot: 快照
+    """
+    player = state.player
+    player_data = np.array(
+        [player.rect.x, player.rect.y, player.health, player.score], dtype=np.int32
+    )
+
+    enemies, bullets = pack_entities(state.enemies, state.bullets)
+
+    return GameSnapshot(
+        state.frame,
+        player_data,
+        state.enemy_spawner.spawn_timer,
+        state.bullet_manager.cooldown_timer,
+        enemies,
+        bullets,
+    )
+
+
+def restore(state: "RunningState", snapshot: GameSnapshot) -> None:
+    """
+    把快照应用到运行状态，重建敌人和子弹
+
+    Args:
+        state: 游戏运行状态
+        snapshot: 快照
+    """
+    state.frame = snapshot.frame
+
+    x, y, health, score = (int(v) for v in snapshot.player)
+    state.player.rect.topleft = (x, y)
+    state.player.health = health
+    state.player.score = score
+
+    state.enemy_spawner.spawn_timer = snapshot.spawn_timer
+    state.bullet_manager.cooldown_timer = snapshot.cooldown_timer
+
+    # 帧号可能倒退：空间索引的更新/唤醒帧号要对齐快照的帧号，重新加入的敌人下一帧就会移动
+    state.enemies.reset(state.frame)
+    unpack_entities(state.enemies, state.bullets, snapshot.enemies, snapshot.bullets)
+
+
+def save_to_file(state: "RunningState", path: str = config.QUICKSAVE_PATH) -> None:
+    """
+    快速存档到文件（先写临时文件再替换，避免半个存档）
+
+    Args:
+        state: 游戏运行状态
+        path: 存档路径
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(capture(state).to_bytes())
+    os.replace(tmp_path, path)
+
+
+def load_from_file(state: "RunningState", path: str = config.QUICKSAVE_PATH) -> None:
+    """
+    从文件读档
+
+    Args:
+        state: 游戏运行状态
+        path: 存档路径
+
+    Raises:
+        OSError: 文件读取失败
+        SnapshotError: 存档格式不正确
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    restore(state, GameSnapshot.from_bytes(data))
@@ -3,13 +3,49 @@
 """
 
 import pygame
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any, NamedTuple, Sized, Tuple
 import config
+from src.systems.audio import AudioManager
+from src.systems.highscore import HighScoreStore
+from src.systems.rewind import RewindBuffer
+from src.systems.netplay import LockstepSession, read_local_input
+from src.systems.quality import QUALITY_TIERS
+from src.systems.memory_tracker import MemoryTracker
+from src.systems.telemetry import Telemetry
+
+if TYPE_CHECKING:
+    from src.entities.player import Player
+
+
+# (图像, 左上角逻辑坐标)
+BlitItem = Tuple[pygame.Surface, Tuple[int, int]]
+
+
+class RunningFrame(NamedTuple):
+    """游戏运行状态一帧的绘制数据（只读，抓取后与模拟状态无关）"""
+
+    blits: Tuple[BlitItem, ...]
+    health: int
+    score: int
+    fps: float
+    debug: bool
+    quality: str
+
+
+class RenderFrame(NamedTuple):
+    """状态机一帧的绘制数据"""
+
+    state: "GameState"
+    data: Any  # state.capture_render() 的结果，None 表示只能直接绘制
+    overlay: Optional[Tuple[str, ...]]  # 内存跟踪叠加层文字
 
 
 class GameState:
     """游戏状态基类"""
 
+    # 画面只随输入或 frame_key() 变化（菜单、暂停等），状态机会缓存画面并阻塞等待输入
+    static: bool = False
+
     def __init__(self, screen: pygame.Surface):
         """
         初始化游戏状态
@@ -42,10 +78,61 @@ class GameState:
         """
         pass
 
+    def frame_key(self) -> Any:
+        """
+        获取静止画面的内容标识，与上次绘制时不同才重新绘制
+
+        Returns:
+            Any: 可比较的内容标识
+        """
+        return None
+
+    def capture_render(self) -> Any:
+        """
+        抓取绘制当前画面所需的只读数据（流水线模式下与下一帧的模拟并行绘制）
+
+        Returns:
+            Any: 绘制数据，None 表示本状态不支持抓取，只能在模拟空闲时直接绘制
+        """
+        return None
+
+    def draw_captured(self, screen: pygame.Surface, data: Any) -> None:
+        """
+        按 capture_render() 抓取的数据绘制
+
+        Args:
+            screen: 游戏屏幕对象
+            data: 绘制数据
+        """
+        self.draw(screen)
+
+    def sprite_groups(self) -> Dict[str, Sized]:
+        """
+        获取本状态的精灵组（供内存跟踪统计大小）
+
+        Returns:
+            Dict[str, Sized]: 名称 -> 精灵组
+        """
+        return {}
+
+    def set_screen(self, screen: pygame.Surface) -> None:
+        """
+        更换绘制目标（例如画质调节改变了后台缓冲区尺寸）
+
+        Args:
+            screen: 新的绘制目标
+        """
+        self.screen = screen
+        hud = getattr(self, "hud", None)
+        if hud is not None:
+            hud.set_screen(screen)
+
 
 class MenuState(GameState):
     """菜单状态"""
 
+    static = True
+
     def __init__(self, screen: pygame.Surface):
         super().__init__(screen)
         from src.ui.hud import HUD
@@ -67,29 +154,66 @@ class MenuState(GameState):
 class RunningState(GameState):
     """游戏运行状态"""
 
-    def __init__(self, screen: pygame.Surface):
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        audio: Optional[AudioManager] = None,
+        telemetry: Optional[Telemetry] = None,
+    ):
         super().__init__(screen)
         # 初始化游戏实体
         from src.entities.player import Player
         from src.entities.enemy import EnemySpawner
         from src.entities.bullet import BulletManager
         from src.systems.collision import CollisionSystem
+        from src.entities.sprite_array import SpriteArray
+        from src.entities.spatial_array import SpatialSpriteArray
+        from src.ecs.adapters import EntityGroup
+        from src.ecs.world import World
+        from src.systems.camera import Camera
         from src.ui.hud import HUD
 
-        self.player = Player(config.PLAYER_START_X, config.PLAYER_START_Y)
-        self.all_sprites = pygame.sprite.Group()
+        # 坐标均为世界坐标，玩家从世界底部中央出发
+        self.player = Player(
+            config.PLAYER_START_X + (config.WORLD_WIDTH - config.SCREEN_WIDTH) // 2,
+            config.PLAYER_START_Y + config.WORLD_HEIGHT - config.SCREEN_HEIGHT,
+        )
+        self.all_sprites = SpriteArray()
         self.all_sprites.add(self.player)
+        self.camera = Camera()
+        self.camera.follow(self.player.rect)
 
-        self.enemies = pygame.sprite.Group()
-        self.bullets = pygame.sprite.Group()
+        # 敌人登记在空间索引中，只有镜头附近的敌人每帧完整更新、参与碰撞和绘制
+        self.enemies = SpatialSpriteArray()
+        # 子弹已迁移到 ECS：实体存放在 world 的组件列中，EntityGroup 保持精灵组接口
+        self.world = World()
+        self.bullets = EntityGroup(self.world, "bullet", heading=(0, -1))
 
         self.enemy_spawner = EnemySpawner()
         self.bullet_manager = BulletManager()
         self.collision_system = CollisionSystem()
         self.hud = HUD(screen)
+        self.audio = audio
+        self.telemetry = telemetry
+        self.frame: int = 0
+
+        # 自动驾驶模式下由机器人代替键盘操作
+        self.autopilot = None
+        if config.AUTOPILOT:
+            from src.systems.autopilot import Autopilot
+            self.autopilot = Autopilot()
+            self.player.controller = self.autopilot
 
         self.clock = pygame.time.Clock()
 
+    def sprite_groups(self) -> Dict[str, Sized]:
+        return {"all": self.all_sprites, "enemies": self.enemies, "bullets": self.bullets}
+
+    def _play_sound(self, name: str) -> None:
+        """播放音效（未配置音频时忽略）"""
+        if self.audio is not None:
+            self.audio.play(name)
+
     def handle_event(self, event: pygame.event.Event) -> None:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
@@ -97,132 +221,344 @@ class RunningState(GameState):
             elif event.key == pygame.K_SPACE:
                 # 发射子弹
                 pos = self.player.get_position()
-                self.bullet_manager.shoot(pos[0], pos[1], self.bullets)
+                if self.bullet_manager.shoot(pos[0], pos[1], self.bullets):
+                    self._play_sound("shoot")
+            elif event.key == pygame.K_F5:
+                self._quick_save()
+            elif event.key == pygame.K_F9:
+                self._quick_load()
+
+    def _quick_save(self) -> None:
+        """快速存档"""
+        from src.systems import snapshot
+
+        try:
+            snapshot.save_to_file(self)
+        except OSError as e:
+            print(f"[Snapshot] 存档失败: {e}")
+
+    def _quick_load(self) -> None:
+        """快速读档"""
+        from src.systems import snapshot
+
+        try:
+            snapshot.load_from_file(self)
+        except (OSError, snapshot.SnapshotError) as e:
+            print(f"[Snapshot] 读档失败: {e}")
 
     def update(self) -> None:
         # 检查玩家是否存活
         if not self.player.is_alive():
             self.next_state = config.STATE_GAME_OVER
+            if self.telemetry is not None:
+                self.telemetry.event("game_over", score=self.player.score, frames=self.frame)
             return
 
-        # 更新所有精灵
+        self.frame += 1
+        self.clock.tick()
+
+        if self.telemetry is not None:
+            if self.frame == 1:
+                self.telemetry.event("game_start", autopilot=self.autopilot is not None)
+            if self.frame % config.TELEMETRY_SAMPLE_INTERVAL == 0:
+                self.telemetry.gauge("enemies", len(self.enemies))
+                self.telemetry.gauge("bullets", len(self.bullets))
+                self.telemetry.gauge("score", self.player.score)
+
+        # 镜头附近的区域（世界与屏幕一样大时包含整个世界）
+        self.camera.follow(self.player.rect)
+        near_view = self.camera.view(config.CAMERA_MARGIN)
+
+        # 自动驾驶决策
+        if self.autopilot is not None:
+            self.autopilot.plan(self.player, self.enemies.query(near_view), view=self.camera.rect)
+            if self.autopilot.fire:
+                pos = self.player.get_position()
+                if self.bullet_manager.shoot(pos[0], pos[1], self.bullets):
+                    self._play_sound("shoot")
+
+        # 更新所有精灵（远离镜头的敌人降低频率更新，飞出附近区域的子弹直接销毁）
         self.all_sprites.update()
-        self.enemies.update()
-        self.bullets.update()
+        self.enemies.update_around(
+            near_view, self.frame, config.ENEMY_SPEED_MAX + self.player.speed
+        )
+        self.bullets.update(self.camera.bounds(config.CAMERA_MARGIN))
 
         # 更新生成器和管理器
         self.enemy_spawner.update(self.enemies)
         self.bullet_manager.update()
 
-        # 碰撞检测
+        # 碰撞检测（子弹只存在于镜头附近，只需检查附近的敌人）
         hit_enemies, player_hit = self.collision_system.check_collisions(
-            self.player, self.bullets, self.enemies
+            self.player, self.bullets, self.enemies.query(near_view)
         )
 
         # 处理被击中的敌人
         for enemy in hit_enemies:
             if not enemy.alive():
                 self.player.score += config.SCORE_ENEMY_KILL
+                self._play_sound("explosion")
+                if self.telemetry is not None:
+                    self.telemetry.increment("enemy_killed")
 
         # 处理玩家被撞击
         if player_hit:
             self.player.take_damage(20)
+            self._play_sound("player_hit")
+            if self.telemetry is not None:
+                self.telemetry.increment("player_hit")
+
+        # 统一移除本帧死亡的精灵
+        self.all_sprites.flush()
+        self.enemies.flush()
+        self.bullets.flush()
+
+    def capture_render(self) -> RunningFrame:
+        # 读档或回退后玩家位置可能变化，绘制前重新对准镜头
+        self.camera.follow(self.player.rect)
+        view = self.camera.rect
+        offset = self.camera.offset
+        return RunningFrame(
+            blits=tuple(
+                self.all_sprites.blit_items(view, offset)
+                + self.enemies.blit_items(view, offset)
+                + self.bullets.blit_items(offset)
+            ),
+            health=self.player.health,
+            score=self.player.score,
+            fps=self.clock.get_fps(),
+            debug=config.DEBUG_MODE,
+            quality=QUALITY_TIERS[config.QUALITY_LEVEL].name,
+        )
 
-        # 移除死亡敌人
-        for enemy in self.enemies:
-            if not enemy.alive():
-                enemy.kill()
+    def draw_captured(self, screen: pygame.Surface, data: RunningFrame) -> None:
+        from src.ui.render_scale import blit_images
 
-    def draw(self, screen: pygame.Surface) -> None:
         screen.fill(config.BLACK)
 
         # 绘制所有精灵
-        self.all_sprites.draw(screen)
-        self.enemies.draw(screen)
-        self.bullets.draw(screen)
+        blit_images(screen, data.blits)
 
         # 绘制 HUD
-        self.hud.draw_health(self.player.health, config.PLAYER_MAX_HEALTH)
-        self.hud.draw_score(self.player.score)
+        self.hud.draw_health(data.health, config.PLAYER_MAX_HEALTH)
+        self.hud.draw_score(data.score)
 
         # 显示 FPS（调试模式）
-        if config.DEBUG_MODE:
-            fps = self.clock.get_fps()
-            self.hud.draw_fps(fps)
+        if data.debug:
+            self.hud.draw_fps(data.fps)
+            self.hud.draw_debug_line(0, f"画质: {data.quality}")
+
+    def draw(self, screen: pygame.Surface) -> None:
+        self.draw_captured(screen, self.capture_render())
 
 
 class PausedState(GameState):
     """暂停状态"""
 
-    def __init__(self, screen: pygame.Surface):
+    static = True
+
+    def __init__(self, screen: pygame.Surface, rewind: Optional[RewindBuffer] = None):
         super().__init__(screen)
         from src.ui.hud import HUD
         self.hud = HUD(screen)
+        self.rewind = rewind
+        self.target: Optional[RunningState] = None
+        self.cursor: Optional[int] = None
+        self._overlay: Optional[pygame.Surface] = None  # 半透明遮罩，尺寸不变时复用
+
+    def enter(self, target: RunningState) -> None:
+        """
+        进入暂停，记录被暂停的游戏以便逐帧回退
+
+        Args:
+            target: 被暂停的游戏运行状态
+        """
+        self.target = target
+        self.cursor = self.rewind.last_frame if self.rewind is not None else None
 
     def handle_event(self, event: pygame.event.Event) -> None:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
+                # 从回退位置继续时，之后的历史作废
+                if self.rewind is not None and self.cursor is not None:
+                    self.rewind.truncate_after(self.cursor)
                 self.next_state = config.STATE_RUNNING
             elif event.key == pygame.K_q:
                 self.next_state = config.STATE_MENU
+            elif event.key == pygame.K_LEFT:
+                self.step(-1)
+            elif event.key == pygame.K_RIGHT:
+                self.step(1)
+
+    def step(self, delta: int) -> None:
+        """
+        在回放历史中前后移动
+
+        Args:
+            delta: 移动的帧数，负数为回退
+        """
+        if self.rewind is None or self.target is None or self.cursor is None:
+            return
+        from src.systems import snapshot
+
+        frame = self.cursor + delta
+        frame = max(self.rewind.first_frame, min(self.rewind.last_frame, frame))
+        if frame == self.cursor:
+            return
+        snapshot.restore(self.target, self.rewind.get(frame))
+        self.cursor = frame
+
+    def frame_key(self) -> Any:
+        return (self.target, self.cursor)
 
     def draw(self, screen: pygame.Surface) -> None:
+        # 回退时需要重绘被暂停的画面
+        if self.target is not None:
+            self.target.draw(screen)
+
         # 绘制半透明遮罩
-        overlay = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill(config.BLACK)
-        screen.blit(overlay, (0, 0))
+        if self._overlay is None or self._overlay.get_size() != screen.get_size():
+            self._overlay = pygame.Surface(screen.get_size())
+            self._overlay.set_alpha(128)
+            self._overlay.fill(config.BLACK)
+        screen.blit(self._overlay, (0, 0))
 
         # 绘制暂停菜单
         self.hud.draw_text_centered("暂停", -50, config.YELLOW, 48)
         self.hud.draw_text_centered("按 ESC 继续游戏", 30, config.WHITE, 24)
         self.hud.draw_text_centered("按 Q 返回菜单", 70, config.GRAY, 20)
 
+        if self.rewind is not None and self.cursor is not None:
+            offset = self.cursor - self.rewind.last_frame
+            self.hud.draw_text_centered(
+                f"←/→ 逐帧回退/前进  ({offset} 帧)", 110, config.GRAY, 18
+            )
+
+
+class NetplayState(GameState):
+    """联机合作状态"""
+
+    def __init__(self, screen: pygame.Surface, session: LockstepSession):
+        super().__init__(screen)
+        from src.ui.hud import HUD
+        self.hud = HUD(screen)
+        self.session = session
+        self.game = session.game
+
+    @property
+    def player(self) -> "Player":
+        """本机玩家（状态机据此读取最终分数）"""
+        return self.game.players[self.session.local_id]
+
+    def sprite_groups(self) -> Dict[str, Sized]:
+        return {"enemies": self.game.enemies, "bullets": self.game.bullets}
+
+    def update(self) -> None:
+        self.session.advance(read_local_input())
+
+        # 只在状态完全确认后判定结束，避免预测输入导致各端结束时机不同
+        if self.game.all_dead() and self.session.is_confirmed():
+            self.next_state = config.STATE_GAME_OVER
+
+    def draw(self, screen: pygame.Surface) -> None:
+        screen.fill(config.BLACK)
+        self.game.draw(screen)
+
+        self.hud.draw_health(self.player.health, config.PLAYER_MAX_HEALTH)
+        self.hud.draw_score(self.game.score)
+
+        if config.DEBUG_MODE:
+            self.hud.draw_text_centered(
+                f"P{self.session.local_id + 1} 帧 {self.game.frame} "
+                f"回滚 {self.session.rollbacks} 等待 {self.session.stalls}",
+                config.SCREEN_HEIGHT // 2 - 20,
+                config.GRAY,
+                config.FONT_SIZE_SMALL,
+            )
+
 
 class GameOverState(GameState):
     """游戏结束状态"""
 
-    def __init__(self, screen: pygame.Surface):
+    static = True
+
+    def __init__(self, screen: pygame.Surface, highscores: Optional[HighScoreStore] = None):
         super().__init__(screen)
         from src.ui.hud import HUD
         self.hud = HUD(screen)
+        self.highscores = highscores
         self.final_score = 0
+        self.rank = 0
+        self.best_score = 0
 
     def handle_event(self, event: pygame.event.Event) -> None:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_RETURN:
                 self.next_state = config.STATE_MENU
 
+    def frame_key(self) -> Any:
+        return (self.final_score, self.rank, self.best_score)
+
     def set_score(self, score: int) -> None:
-        """设置最终分数"""
+        """设置最终分数并记录到高分榜"""
         self.final_score = score
+        if self.highscores is not None:
+            self.rank = self.highscores.submit(score)
+            self.best_score = self.highscores.best()
 
     def draw(self, screen: pygame.Surface) -> None:
         screen.fill(config.BLACK)
         # 绘制游戏结束画面
         self.hud.draw_text_centered("游戏结束", -80, config.RED, 48)
         self.hud.draw_text_centered(f"最终分数: {self.final_score}", 0, config.WHITE, 32)
+        if self.highscores is not None:
+            if self.rank == 1:
+                self.hud.draw_text_centered("新纪录!", 40, config.YELLOW, 24)
+            else:
+                self.hud.draw_text_centered(f"最高分: {self.best_score}", 40, config.GRAY, 24)
         self.hud.draw_text_centered("按 ENTER 返回菜单", 80, config.GRAY, 20)
 
 
 class GameStateMachine:
     """游戏状态机"""
 
-    def __init__(self, screen: pygame.Surface):
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        telemetry: Optional[Telemetry] = None,
+        record_scores: bool = True,
+        highscores: Optional[HighScoreStore] = None,
+    ):
         """
         初始化状态机
 
         Args:
             screen: 游戏屏幕对象
+            telemetry: 遥测客户端（由调用方负责关闭），为 None 时不上报
+            record_scores: 是否把分数记入高分榜（离线导出等回放场景不记录）
+            highscores: 使用的高分榜（由状态机负责关闭），为 None 时打开 config.SAVE_DIR 中的高分榜
         """
         self.screen = screen
+        self.telemetry = telemetry
+        self.audio = AudioManager()
+        self.highscores: Optional[HighScoreStore] = None
+        if record_scores:
+            self.highscores = highscores if highscores is not None else HighScoreStore()
+        self.rewind = RewindBuffer()
+        # 调试模式下跟踪内存增长和 GC 停顿
+        self.memory: Optional[MemoryTracker] = (
+            MemoryTracker() if config.DEBUG_MODE and config.MEMORY_TRACKING else None
+        )
         self.states: Dict[str, GameState] = {
             config.STATE_MENU: MenuState(screen),
-            config.STATE_RUNNING: RunningState(screen),
-            config.STATE_PAUSED: PausedState(screen),
-            config.STATE_GAME_OVER: GameOverState(screen),
+            config.STATE_RUNNING: RunningState(screen, self.audio, telemetry),
+            config.STATE_PAUSED: PausedState(screen, self.rewind),
+            config.STATE_GAME_OVER: GameOverState(screen, self.highscores),
         }
         self.current_state: GameState = self.states[config.STATE_MENU]
+        # 静止画面缓存：(内容标识, 合成好的画面)
+        self._static_key: Any = None
+        self._static_frame: Optional[pygame.Surface] = None
 
     def handle_event(self, event: pygame.event.Event) -> None:
         """
@@ -232,8 +568,10 @@ class GameStateMachine:
             event: Pygame 事件对象
         """
         self.current_state.handle_event(event)
+        self._check_transition()
 
-        # 检查是否需要切换状态
+    def _check_transition(self) -> None:
+        """检查是否需要切换状态"""
         if self.current_state.next_state:
             score = getattr(self.current_state, 'player', None)
             score_value = score.score if score and hasattr(score, 'score') else None
@@ -241,8 +579,23 @@ class GameStateMachine:
 
     def update(self) -> None:
         """更新当前状态"""
+        self.audio.begin_frame()
         self.current_state.update()
 
+        # 记录回放历史
+        if isinstance(self.current_state, RunningState):
+            self.rewind.record(self.current_state)
+
+        if self.memory is not None:
+            self.memory.update(self.current_state.sprite_groups())
+
+        # 自动驾驶模式下自动开始/重新开始游戏
+        if config.AUTOPILOT and isinstance(self.current_state, (MenuState, GameOverState)):
+            self.current_state.next_state = config.STATE_RUNNING
+
+        # 状态可能在更新中请求切换（例如玩家死亡），不必等到下一个输入事件
+        self._check_transition()
+
     def draw(self, screen: pygame.Surface) -> None:
         """
         绘制当前状态
@@ -250,7 +603,118 @@ class GameStateMachine:
         Args:
             screen: 游戏屏幕对象
         """
+        if self.current_state.static:
+            self._draw_static(screen, self.current_state)
+            return
         self.current_state.draw(screen)
+        if self.memory is not None:
+            self.memory.draw(screen)
+
+    def _frame_key(self, screen: pygame.Surface, state: GameState) -> Any:
+        """
+        计算静止画面的内容标识（状态、状态内容、绘制目标和调试叠加层）
+
+        Args:
+            screen: 绘制目标
+            state: 静止状态
+
+        Returns:
+            Any: 内容标识
+        """
+        overlay = tuple(self.memory.overlay_lines()) if self.memory is not None else None
+        return (state, state.frame_key(), screen, screen.get_size(), overlay)
+
+    def _draw_static(self, screen: pygame.Surface, state: GameState) -> None:
+        """
+        绘制静止状态：内容不变时直接复制缓存的画面，否则重新绘制并缓存
+
+        Args:
+            screen: 绘制目标
+            state: 静止状态
+        """
+        from src.ui.hud import unthrottled
+
+        key = self._frame_key(screen, state)
+        if key == self._static_key and self._static_frame is not None:
+            screen.blit(self._static_frame, (0, 0))
+            return
+        # 只绘制这一次，文字不能沿用节流前的旧结果
+        with unthrottled():
+            state.draw(screen)
+            if self.memory is not None:
+                self.memory.draw(screen)
+        if self._static_frame is None or self._static_frame.get_size() != screen.get_size():
+            self._static_frame = screen.copy()
+        else:
+            self._static_frame.blit(screen, (0, 0))
+        self._static_key = key
+
+    def needs_redraw(self, screen: pygame.Surface) -> bool:
+        """
+        当前画面是否需要重新绘制（静止状态且内容与上次绘制相同时不需要）
+
+        Args:
+            screen: 绘制目标
+
+        Returns:
+            bool: 是否需要重新绘制并刷新屏幕
+        """
+        state = self.current_state
+        if not state.static or self._static_frame is None:
+            return True
+        return self._frame_key(screen, state) != self._static_key
+
+    def is_idle(self, screen: pygame.Surface) -> bool:
+        """
+        是否可以阻塞等待输入（静止画面已经绘制，且不是自动驾驶）
+
+        Args:
+            screen: 绘制目标
+
+        Returns:
+            bool: 是否空闲
+        """
+        return config.IDLE_THROTTLE and not config.AUTOPILOT and not self.needs_redraw(screen)
+
+    def capture_render(self) -> RenderFrame:
+        """
+        抓取当前画面的绘制数据（在模拟线程中、update() 之后调用）
+
+        Returns:
+            RenderFrame: 绘制数据
+        """
+        state = self.current_state
+        overlay = tuple(self.memory.overlay_lines()) if self.memory is not None else None
+        return RenderFrame(state, state.capture_render(), overlay)
+
+    def draw_frame(self, screen: pygame.Surface, frame: RenderFrame) -> None:
+        """
+        绘制抓取的一帧；frame.data 为 None 时直接绘制状态，调用方需保证模拟线程空闲
+
+        Args:
+            screen: 游戏屏幕对象
+            frame: capture_render() 的结果
+        """
+        if frame.state.static:
+            self._draw_static(screen, frame.state)
+            return
+        if frame.data is None:
+            frame.state.draw(screen)
+        else:
+            frame.state.draw_captured(screen, frame.data)
+        if self.memory is not None:
+            self.memory.draw(screen, lines=frame.overlay)
+
+    def set_screen(self, screen: pygame.Surface) -> None:
+        """
+        更换所有状态的绘制目标
+
+        Args:
+            screen: 新的绘制目标
+        """
+        self.screen = screen
+        for state in self.states.values():
+            state.set_screen(screen)
 
     def change_state(self, state_name: str, score: int = None) -> None:
         """
@@ -261,14 +725,45 @@ class GameStateMachine:
             score: 可选的分数参数
         """
         if state_name in self.states:
-            # 如果切换到游戏运行状态，重新初始化以确保状态重置
-            if state_name == config.STATE_RUNNING:
-                self.states[state_name] = RunningState(self.screen)
+            # 如果切换到游戏运行状态，重新初始化以确保状态重置（从暂停恢复时保留进度）
+            if state_name == config.STATE_RUNNING and not isinstance(
+                self.current_state, PausedState
+            ):
+                self.states[state_name] = RunningState(self.screen, self.audio, self.telemetry)
+                self.rewind.clear()
+
+            # 进入暂停时交给暂停状态以便回退
+            if state_name == config.STATE_PAUSED and isinstance(self.current_state, RunningState):
+                self.states[state_name].enter(self.current_state)
 
             # 如果切换到游戏结束状态，传递分数
             if state_name == config.STATE_GAME_OVER and score is not None:
-                if isinstance(self.current_state, RunningState):
+                if isinstance(self.current_state, (RunningState, NetplayState)):
                     self.states[state_name].set_score(score)
 
+            self.current_state.next_state = None
             self.current_state = self.states[state_name]
             self.current_state.next_state = None
+            # 屏幕上已经是别的画面，进入静止状态时即使内容标识与上次相同也要重绘
+            self._static_key = None
+
+    def start_netplay(self, session: LockstepSession) -> None:
+        """
+        直接进入联机合作模式
+
+        Args:
+            session: 已建立的帧同步会话
+        """
+        self.states[config.STATE_NETPLAY] = NetplayState(self.screen, session)
+        self.current_state = self.states[config.STATE_NETPLAY]
+
+    def shutdown(self) -> None:
+        """退出前收尾：停止音效、写完高分记录并关闭联机连接"""
+        self.audio.stop_all()
+        if self.highscores is not None:
+            self.highscores.close()
+        if self.memory is not None:
+            self.memory.close()
+        netplay = self.states.get(config.STATE_NETPLAY)
+        if isinstance(netplay, NetplayState):
+            netplay.session.close()
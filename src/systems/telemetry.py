@@ -0,0 +1,374 @@
+"""
+遥测系统 - 在内存中缓冲指标，由后台线程批量写入本地滚动日志或 statsd 风格的 UDP 端点
+"""
+
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import config
+
+
+class Sample(NamedTuple):
+    """一条指标样本"""
+
+    kind: str  # "g" 数值, "ms" 耗时, "c" 计数, "e" 事件
+    name: str
+    value: float
+    timestamp: float
+    fields: Optional[Dict[str, Any]] = None  # 事件附带的字段
+
+
+class TelemetrySink:
+    """遥测输出端基类（只在后台线程中调用）"""
+
+    def write(self, batch: List[Sample]) -> None:
+        """
+        写出一批样本
+
+        Args:
+            batch: 样本列表
+
+        Raises:
+            OSError: 写出失败
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """释放资源"""
+        pass
+
+
+class FileSink(TelemetrySink):
+    """
+    滚动 NDJSON 文件输出端
+
+    每行一条 JSON 记录；文件超过 max_bytes 后依次改名为 .1、.2 ……，
+    最多保留 backup_count 个旧文件。
+    """
+
+    def __init__(
+        self,
+        path: str = config.TELEMETRY_PATH,
+        source: str = "",
+        max_bytes: int = config.TELEMETRY_MAX_BYTES,
+        backup_count: int = config.TELEMETRY_BACKUP_COUNT,
+    ) -> None:
+        """
+        初始化文件输出端
+
+        Args:
+            path: 日志文件路径
+            source: 机台标识，写入每条记录
+            max_bytes: 单个文件的大小上限
+            backup_count: 保留的旧文件数量
+        """
+        self.path = path
+        self.source = source
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+    def write(self, batch: List[Sample]) -> None:
+        lines = []
+        for sample in batch:
+            record = {
+                "ts": round(sample.timestamp, 3),
+                "src": self.source,
+                "kind": sample.kind,
+                "name": sample.name,
+                "value": sample.value,
+            }
+            if sample.fields:
+                record.update(sample.fields)
+            lines.append(json.dumps(record, ensure_ascii=False))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            size = f.tell()
+        if size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        """把当前文件改名为 .1，已有的旧文件依次后移"""
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+class StatsdSink(TelemetrySink):
+    """
+    statsd 风格的 UDP 输出端
+
+    每个样本格式化为一行 "<prefix>.<name>:<value>|<type>"，多行拼接成不超过
+    max_packet 字节的数据包发送。事件转换为计数 "<prefix>.event.<name>:1|c"。
+    """
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = (config.TELEMETRY_STATSD_HOST, config.TELEMETRY_STATSD_PORT),
+        prefix: str = config.TELEMETRY_PREFIX,
+        max_packet: int = 1432,
+    ) -> None:
+        """
+        初始化 UDP 输出端
+
+        Args:
+            address: statsd 地址 (host, port)
+            prefix: 指标名前缀（通常包含机台标识）
+            max_packet: 单个数据包的最大字节数
+        """
+        self.address = address
+        self.prefix = prefix
+        self.max_packet = max_packet
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def _format(self, sample: Sample) -> str:
+        """
+        把样本格式化为 statsd 行
+
+        Args:
+            sample: 样本
+
+        Returns:
+            str: statsd 行
+        """
+        if sample.kind == "e":
+            return f"{self.prefix}.event.{sample.name}:1|c"
+        return f"{self.prefix}.{sample.name}:{sample.value:g}|{sample.kind}"
+
+    def write(self, batch: List[Sample]) -> None:
+        packet = b""
+        for sample in batch:
+            line = self._format(sample).encode("utf-8")
+            if packet and len(packet) + 1 + len(line) > self.max_packet:
+                self._socket.sendto(packet, self.address)
+                packet = b""
+            packet = packet + b"\n" + line if packet else line
+        if packet:
+            self._socket.sendto(packet, self.address)
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+class Telemetry:
+    """
+    遥测客户端
+
+    游戏循环调用 gauge()/timing()/increment()/event() 时只把样本放进有界队列，
+    队列满时直接丢弃并计入 dropped，绝不阻塞。后台线程攒够 batch_size 条或
+    每隔 flush_interval 秒把一批样本交给输出端；输出端出错时整批丢弃并计入 errors。
+    丢弃计数有变化时会作为 "telemetry.dropped" 指标一并上报。
+    """
+
+    def __init__(
+        self,
+        sink: TelemetrySink,
+        queue_size: int = config.TELEMETRY_QUEUE_SIZE,
+        batch_size: int = config.TELEMETRY_BATCH_SIZE,
+        flush_interval: float = config.TELEMETRY_FLUSH_INTERVAL,
+    ) -> None:
+        """
+        初始化遥测客户端并启动后台线程
+
+        Args:
+            sink: 输出端
+            queue_size: 队列容量（样本数）
+            batch_size: 每批最多样本数
+            flush_interval: 最长刷新间隔（秒）
+        """
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.dropped: int = 0  # 队列满而丢弃的样本数（流水线模式下多个线程都会记录）
+        self.sent: int = 0  # 成功写出的样本数（只由后台线程修改）
+        self.errors: int = 0  # 写出失败的批次数（只由后台线程修改）
+        self._reported_dropped: int = 0
+        self._dropped_lock = threading.Lock()
+
+        self._queue: "queue.Queue[Optional[Sample]]" = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = threading.Thread(
+            target=self._writer_loop, name="telemetry-writer", daemon=True
+        )
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # 记录（游戏线程）
+    # ------------------------------------------------------------------
+
+    def _put(self, sample: Sample) -> None:
+        """
+        把样本放进队列，队列已满或已关闭时丢弃
+
+        Args:
+            sample: 样本
+        """
+        if self._writer is not None:
+            try:
+                self._queue.put_nowait(sample)
+                return
+            except queue.Full:
+                pass
+        with self._dropped_lock:
+            self.dropped += 1
+
+    def gauge(self, name: str, value: float) -> None:
+        """
+        记录当前数值（实体数量、分数等）
+
+        Args:
+            name: 指标名
+            value: 数值
+        """
+        self._put(Sample("g", name, value, time.time()))
+
+    def timing(self, name: str, ms: float) -> None:
+        """
+        记录一次耗时
+
+        Args:
+            name: 指标名
+            ms: 耗时（毫秒）
+        """
+        self._put(Sample("ms", name, round(ms, 3), time.time()))
+
+    def increment(self, name: str, count: int = 1) -> None:
+        """
+        累加计数
+
+        Args:
+            name: 指标名
+            count: 增量
+        """
+        self._put(Sample("c", name, count, time.time()))
+
+    def event(self, name: str, **fields: Any) -> None:
+        """
+        记录一次会话事件（开始游戏、游戏结束等）
+
+        Args:
+            name: 事件名
+            fields: 附带字段
+        """
+        self._put(Sample("e", name, 1, time.time(), fields or None))
+
+    # ------------------------------------------------------------------
+    # 写出（后台线程）
+    # ------------------------------------------------------------------
+
+    def _writer_loop(self) -> None:
+        """后台线程：攒批并写出，直到收到停止信号"""
+        while not self._stop.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+
+        # 写完停止前已经排队的样本
+        batch = []
+        while True:
+            try:
+                sample = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if sample is not None:
+                batch.append(sample)
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        self._write(batch)
+
+    def _collect(self) -> List[Sample]:
+        """
+        从队列中取一批样本，攒够 batch_size 条、超过 flush_interval 秒或收到停止信号时返回
+
+        Returns:
+            List[Sample]: 样本列表
+        """
+        batch: List[Sample] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                sample = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if sample is None:
+                break
+            batch.append(sample)
+        return batch
+
+    def _write(self, batch: List[Sample]) -> None:
+        """
+        把一批样本交给输出端，附带丢弃计数
+
+        Args:
+            batch: 样本列表
+        """
+        dropped = self.dropped
+        if dropped != self._reported_dropped:
+            batch.append(Sample("g", "telemetry.dropped", dropped, time.time()))
+            self._reported_dropped = dropped
+        if not batch:
+            return
+        try:
+            self.sink.write(batch)
+            self.sent += len(batch)
+        except OSError as e:
+            self.errors += 1
+            if config.DEBUG_MODE:
+                print(f"[Telemetry] 写出失败: {e}")
+
+    def close(self) -> None:
+        """写完已排队的样本，停止后台线程并关闭输出端"""
+        if self._writer is None:
+            return
+        self._stop.set()
+        try:
+            self._queue.put_nowait(None)  # 唤醒正在等待的后台线程
+        except queue.Full:
+            pass
+        self._writer.join()
+        self._writer = None
+        self.sink.close()
+
+
+def create_telemetry() -> Optional[Telemetry]:
+    """
+    按配置创建遥测客户端
+
+    Returns:
+        Optional[Telemetry]: 遥测客户端，config.TELEMETRY_SINK 为空时返回 None
+
+    Raises:
+        ValueError: 未知的输出端类型
+    """
+    if not config.TELEMETRY_SINK:
+        return None
+    # statsd 用点号分隔层级，机台标识中的点号替换掉
+    source = (config.TELEMETRY_SOURCE or socket.gethostname()).replace(".", "_")
+    if config.TELEMETRY_SINK == "file":
+        sink: TelemetrySink = FileSink(config.TELEMETRY_PATH, source)
+    elif config.TELEMETRY_SINK == "udp":
+        sink = StatsdSink(
+            (config.TELEMETRY_STATSD_HOST, config.TELEMETRY_STATSD_PORT),
+            f"{config.TELEMETRY_PREFIX}.{source}",
+        )
+    else:
+        raise ValueError(f"未知的遥测输出端: {config.TELEMETRY_SINK}")
+    return Telemetry(sink)
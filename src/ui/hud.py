@@ -3,8 +3,31 @@ HUD 系统 - 显示游戏信息
 """
 
 import pygame
-from typing import Tuple
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
 import config
+from src.ui.render_scale import surface_scale
+
+
+# 为 False 时文字一变化就重新渲染，不受 config.HUD_REFRESH_INTERVAL 限制
+_throttle_enabled: bool = True
+
+
+@contextmanager
+def unthrottled() -> Iterator[None]:
+    """
+    在此范围内绘制的文字不做刷新节流（静止画面只在内容变化时重绘一次，不能沿用旧的渲染结果）
+
+    Returns:
+        Iterator[None]: 上下文管理器
+    """
+    global _throttle_enabled
+    previous = _throttle_enabled
+    _throttle_enabled = False
+    try:
+        yield
+    finally:
+        _throttle_enabled = previous
 
 
 class HUD:
@@ -17,7 +40,23 @@ class HUD:
         Args:
             screen: 游戏屏幕对象
         """
+        self._fonts: Dict[int, pygame.font.Font] = {}
+        # 每个文字槽位缓存 [文字, 颜色, 抗锯齿, 渲染结果, 距上次渲染的帧数]
+        self._text_cache: Dict[Any, List[Any]] = {}
+        self.set_screen(screen)
+
+    def set_screen(self, screen: pygame.Surface) -> None:
+        """
+        更换绘制目标（例如后台缓冲区尺寸改变），字体和文字缓存随之重建
+
+        Args:
+            screen: 新的绘制目标
+        """
         self.screen = screen
+        # 绘制目标可能是缩放后的后台缓冲区，坐标和字号按比例换算
+        self.scale = surface_scale(screen)
+        self._fonts.clear()
+        self._text_cache.clear()
         # 尝试加载支持中文的字体，如果失败则使用默认字体
         self.font_small = self._load_chinese_font(config.FONT_SIZE_SMALL)
         self.font_medium = self._load_chinese_font(config.FONT_SIZE_MEDIUM)
@@ -25,7 +64,7 @@ class HUD:
 
     def _load_chinese_font(self, size: int) -> pygame.font.Font:
         """
-        加载支持中文的字体
+        加载支持中文的字体（按字号缓存）
 
         Args:
             size: 字体大小
@@ -33,11 +72,60 @@ class HUD:
         Returns:
             pygame.font.Font: 字体对象
         """
+        font = self._fonts.get(size)
+        if font is not None:
+            return font
+
         # Windows 中文字体列表 - 按优先级排序
         font_names = "microsoftyahei,simhei,simsun,arialuni"
 
         # 直接使用 SysFont，它会自动选择第一个可用的中文字体
-        return pygame.font.SysFont(font_names, size)
+        font = pygame.font.SysFont(font_names, max(1, self._px(size)))
+        self._fonts[size] = font
+        return font
+
+    def _render_text(
+        self, slot: Any, font: pygame.font.Font, text: str, color: Tuple[int, int, int]
+    ) -> pygame.Surface:
+        """
+        渲染文字，结果按槽位缓存
+
+        文字不变时直接复用；文字变化但距上次渲染不足 config.HUD_REFRESH_INTERVAL 帧时
+        暂时沿用旧的渲染结果，以降低每帧的文字渲染开销。
+
+        Args:
+            slot: 槽位（同一位置的文字共用一个槽位）
+            font: 字体
+            text: 文字
+            color: 颜色
+
+        Returns:
+            pygame.Surface: 渲染结果
+        """
+        antialias = config.HUD_ANTIALIAS
+        entry = self._text_cache.get(slot)
+        if entry is not None:
+            entry[4] += 1
+            if entry[0] == text and entry[1] == color and entry[2] == antialias:
+                return entry[3]
+            if _throttle_enabled and entry[4] < config.HUD_REFRESH_INTERVAL:
+                return entry[3]
+
+        surface = font.render(text, antialias, color)
+        self._text_cache[slot] = [text, color, antialias, surface, 0]
+        return surface
+
+    def _px(self, value: float) -> int:
+        """
+        把逻辑像素换算为绘制目标上的像素
+
+        Args:
+            value: 逻辑像素
+
+        Returns:
+            int: 实际像素
+        """
+        return round(value * self.scale)
 
     def draw_health(self, health: int, max_health: int) -> None:
         """
@@ -47,10 +135,10 @@ class HUD:
             health: 当前生命值
             max_health: 最大生命值
         """
-        bar_width = 200
-        bar_height = 20
-        x = 10
-        y = 10
+        bar_width = self._px(200)
+        bar_height = self._px(20)
+        x = self._px(10)
+        y = self._px(10)
 
         # 计算生命值百分比
         health_percent = health / max_health
@@ -66,11 +154,15 @@ class HUD:
         )
 
         # 绘制边框
-        pygame.draw.rect(self.screen, config.WHITE, (x, y, bar_width, bar_height), 2)
+        pygame.draw.rect(
+            self.screen, config.WHITE, (x, y, bar_width, bar_height), max(1, self._px(2))
+        )
 
         # 绘制文字
-        text = self.font_small.render(f"HP: {health}/{max_health}", True, config.WHITE)
-        self.screen.blit(text, (x + 5, y + 2))
+        text = self._render_text(
+            "health", self.font_small, f"HP: {health}/{max_health}", config.WHITE
+        )
+        self.screen.blit(text, (x + self._px(5), y + self._px(2)))
 
     def draw_score(self, score: int) -> None:
         """
@@ -79,9 +171,9 @@ class HUD:
         Args:
             score: 当前分数
         """
-        text = self.font_medium.render(f"Score: {score}", True, config.WHITE)
+        text = self._render_text("score", self.font_medium, f"Score: {score}", config.WHITE)
         rect = text.get_rect()
-        rect.topright = (config.SCREEN_WIDTH - 10, 10)
+        rect.topright = (self.screen.get_width() - self._px(10), self._px(10))
         self.screen.blit(text, rect)
 
     def draw_fps(self, fps: float) -> None:
@@ -92,11 +184,28 @@ class HUD:
             fps: 当前帧率
         """
         if config.SHOW_FPS and config.DEBUG_MODE:
-            text = self.font_small.render(f"FPS: {fps:.1f}", True, config.YELLOW)
+            text = self._render_text("fps", self.font_small, f"FPS: {fps:.1f}", config.YELLOW)
             rect = text.get_rect()
-            rect.topright = (config.SCREEN_WIDTH - 10, 40)
+            rect.topright = (self.screen.get_width() - self._px(10), self._px(40))
             self.screen.blit(text, rect)
 
+    def draw_debug_line(self, line: int, text: str) -> None:
+        """
+        在右上角 FPS 下方绘制一行调试信息（仅调试模式）
+
+        Args:
+            line: 行号（从 0 开始，位于 FPS 下方）
+            text: 文字
+        """
+        if config.DEBUG_MODE:
+            surface = self._render_text(("debug", line), self.font_small, text, config.YELLOW)
+            rect = surface.get_rect()
+            rect.topright = (
+                self.screen.get_width() - self._px(10),
+                self._px(62 + 22 * line),
+            )
+            self.screen.blit(surface, rect)
+
     def draw_text_centered(
         self,
         text: str,
@@ -117,7 +226,10 @@ class HUD:
             font = self.font_large
         else:
             font = self._load_chinese_font(font_size)
-        surface = font.render(text, True, color)
+        surface = self._render_text(("centered", y_offset, font_size), font, text, color)
         rect = surface.get_rect()
-        rect.center = (config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 + y_offset)
+        rect.center = (
+            self.screen.get_width() // 2,
+            self.screen.get_height() // 2 + self._px(y_offset),
+        )
         self.screen.blit(surface, rect)
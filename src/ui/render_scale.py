@@ -0,0 +1,139 @@
+"""
+渲染缩放 - 按逻辑分辨率模拟，在缩放后的后台缓冲区中绘制，再一次性拉伸到窗口
+"""
+
+import weakref
+from typing import Iterable, Sequence, Tuple
+
+import pygame
+import config
+
+
+# 原始图像 -> (缩放比例, 缩放后的图像)；图像被回收时条目自动消失
+_scaled_images: "weakref.WeakKeyDictionary[pygame.Surface, Tuple[float, pygame.Surface]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def surface_scale(surface: pygame.Surface) -> float:
+    """
+    根据表面宽度求它相对逻辑分辨率的缩放比例
+
+    Args:
+        surface: 绘制目标
+
+    Returns:
+        float: 缩放比例，逻辑分辨率的表面为 1.0
+    """
+    return surface.get_width() / config.SCREEN_WIDTH
+
+
+def scaled_image(image: pygame.Surface, scale: float) -> pygame.Surface:
+    """
+    获取按比例缩放后的图像（缓存，每张图像每种比例只缩放一次）
+
+    Args:
+        image: 原始图像
+        scale: 缩放比例
+
+    Returns:
+        pygame.Surface: 缩放后的图像
+    """
+    cached = _scaled_images.get(image)
+    if cached is not None and cached[0] == scale:
+        return cached[1]
+    width, height = image.get_size()
+    result = pygame.transform.scale(
+        image, (max(1, round(width * scale)), max(1, round(height * scale)))
+    )
+    _scaled_images[image] = (scale, result)
+    return result
+
+
+def blit_sprites(surface: pygame.Surface, sprites: Iterable[pygame.sprite.Sprite]) -> None:
+    """
+    批量绘制精灵，目标表面不是逻辑分辨率时自动换算坐标和图像
+
+    Args:
+        surface: 绘制目标
+        sprites: 精灵（需有 image 和 rect，逻辑坐标）
+    """
+    scale = surface_scale(surface)
+    if scale == 1.0:
+        surface.blits([(sprite.image, sprite.rect) for sprite in sprites], False)
+        return
+    surface.blits(
+        [
+            (
+                scaled_image(sprite.image, scale),
+                (round(sprite.rect.x * scale), round(sprite.rect.y * scale)),
+            )
+            for sprite in sprites
+        ],
+        False,
+    )
+
+
+def blit_images(
+    surface: pygame.Surface, items: Sequence[Tuple[pygame.Surface, Tuple[int, int]]]
+) -> None:
+    """
+    批量绘制 (图像, 逻辑坐标) 列表，目标表面不是逻辑分辨率时自动换算
+
+    Args:
+        surface: 绘制目标
+        items: (图像, 左上角逻辑坐标)
+    """
+    scale = surface_scale(surface)
+    if scale == 1.0:
+        surface.blits(items, False)
+        return
+    surface.blits(
+        [
+            (scaled_image(image, scale), (round(x * scale), round(y * scale)))
+            for image, (x, y) in items
+        ],
+        False,
+    )
+
+
+class RenderScaler:
+    """
+    渲染缩放器
+
+    游戏逻辑始终使用 config.SCREEN_WIDTH x SCREEN_HEIGHT 的逻辑坐标。
+    所有绘制都写入 surface（逻辑分辨率乘以 scale 的后台缓冲区），
+    每帧调用 present() 用 pygame.transform.scale 一次性拉伸到窗口：
+    - scale < 1：减少需要填充的像素，适合填充率不足的硬件
+    - 窗口大于逻辑分辨率（例如全屏）：按逻辑分辨率绘制后放大到整个窗口
+    后台缓冲区与窗口尺寸相同时直接在窗口上绘制，没有额外开销。
+    """
+
+    def __init__(self, window: pygame.Surface, scale: float = config.RENDER_SCALE) -> None:
+        """
+        初始化渲染缩放器
+
+        Args:
+            window: 显示窗口表面
+            scale: 后台缓冲区相对逻辑分辨率的比例
+        """
+        self.window = window
+        self.scale = scale
+        size = (
+            max(1, round(config.SCREEN_WIDTH * scale)),
+            max(1, round(config.SCREEN_HEIGHT * scale)),
+        )
+        if size == window.get_size():
+            self.surface = window
+        else:
+            self.surface = pygame.Surface(size).convert()
+
+    @property
+    def is_scaled(self) -> bool:
+        """是否使用独立的后台缓冲区"""
+        return self.surface is not self.window
+
+    def present(self) -> None:
+        """把后台缓冲区拉伸到窗口（之后再调用 pygame.display.flip）"""
+        if self.is_scaled:
+            pygame.transform.scale(self.surface, self.window.get_size(), self.window)
@@ -53,13 +53,787 @@ except Exception as e:
 
 # 测试状态机
 try:
-    state_machine = GameStateMachine(screen)
+    state_machine = GameStateMachine(screen, record_scores=False)
     print("[OK] State machine initialized")
     print(f"  Current state: {type(state_machine.current_state).__name__}")
+    state_machine.shutdown()
 except Exception as e:
     print(f"[ERROR] State machine initialization failed: {e}")
     sys.exit(1)
 
+# 测试音频系统
+try:
+    from src.systems.audio import AudioManager
+
+    audio = AudioManager()
+    assert set(audio.sounds) == set(config.SFX_DEFINITIONS), "sound bank incomplete"
+    audio.begin_frame()
+    assert audio.play("shoot") is not None, "first play should get a channel"
+    assert audio.play("shoot") is None, "same sound should be rate-limited per frame"
+    audio.begin_frame()
+    assert audio.play("shoot") is not None, "rate limit should reset next frame"
+    audio.stop_all()
+    print(f"[OK] Audio manager - {len(audio.sounds)} sounds, {len(audio.channels)} channels")
+except Exception as e:
+    print(f"[ERROR] Audio test failed: {e}")
+    sys.exit(1)
+
+# 测试高分存储
+try:
+    import tempfile
+    from src.systems.highscore import HighScoreStore
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = HighScoreStore(data_dir, top_n=3)
+        for value in (300, 100, 500, 200):
+            store.submit(value)
+        store.submit(50, profile="guest")
+        assert [r.score for r in store.top()] == [500, 300, 200], "top-N ordering wrong"
+        store.close()
+
+        # 模拟崩溃：日志末尾残留半行
+        with open(store.log_path, "ab") as f:
+            f.write(b'{"profile": "player", "sco')
+        reloaded = HighScoreStore(data_dir, top_n=3)
+        assert [r.score for r in reloaded.top()] == [500, 300, 200], "reload mismatch"
+        assert reloaded.profiles() == ["guest", "player"], "profiles not restored"
+        reloaded.submit(400)
+        reloaded.close()
+        assert [r.score for r in HighScoreStore(data_dir, top_n=3).top()] == [500, 400, 300]
+
+    # 状态机使用注入的高分榜，不写入 saves/ 中的真实记录
+    with tempfile.TemporaryDirectory() as data_dir:
+        machine = GameStateMachine(screen, highscores=HighScoreStore(data_dir))
+        machine.change_state(config.STATE_RUNNING)
+        machine.current_state.player.score = 70
+        machine.current_state.player.health = 0
+        machine.update()
+        assert machine.states[config.STATE_GAME_OVER].rank == 1, "score should reach the injected store"
+        machine.shutdown()
+        assert [r.score for r in HighScoreStore(data_dir).top()] == [70]
+    print("[OK] High score store - append log, compacted index, torn-write recovery")
+except Exception as e:
+    print(f"[ERROR] High score test failed: {e}")
+    sys.exit(1)
+
+# 测试状态快照
+try:
+    from src.systems import snapshot
+    from src.systems.state_machine import RunningState
+
+    source = RunningState(screen)
+    for _ in range(240):
+        source.bullet_manager.shoot(*source.player.get_position(), source.bullets)
+        source.update()
+    data = snapshot.capture(source).to_bytes()
+
+    target = RunningState(screen)
+    snapshot.restore(target, snapshot.GameSnapshot.from_bytes(data))
+    assert snapshot.capture(target).to_bytes() == data, "snapshot round trip mismatch"
+    assert len(target.enemies) == len(source.enemies), "enemy count mismatch"
+    print(f"[OK] Snapshot - {len(data)} bytes for {len(source.enemies)} enemies, {len(source.bullets)} bullets")
+except Exception as e:
+    print(f"[ERROR] Snapshot test failed: {e}")
+    sys.exit(1)
+
+# 测试回放缓冲区
+try:
+    from src.systems.rewind import RewindBuffer
+
+    machine = GameStateMachine(screen, record_scores=False)
+    machine.change_state(config.STATE_RUNNING)
+    running = machine.current_state
+    for _ in range(200):
+        running.bullet_manager.shoot(*running.player.get_position(), running.bullets)
+        machine.update()
+    expected = snapshot.capture(running).to_bytes()
+    assert machine.rewind.get(running.frame).to_bytes() == expected, "latest frame mismatch"
+
+    machine.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+    paused = machine.current_state
+    for _ in range(50):
+        paused.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_LEFT))
+    assert running.frame == 150, f"expected frame 150, got {running.frame}"
+    machine.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+    assert machine.current_state is running, "resume should keep the running game"
+    assert machine.rewind.last_frame == 150, "history after cursor should be dropped"
+
+    small = RewindBuffer(capacity=1000, keyframe_interval=10, memory_budget=4096)
+    for _ in range(100):
+        running.update()
+        small.record(running)
+    assert small.memory_usage <= 4096 and small.first_frame is not None
+    small.get(small.first_frame)
+    machine.shutdown()
+    print(f"[OK] Rewind buffer - {len(machine.rewind)} frames in {machine.rewind.memory_usage} bytes")
+except Exception as e:
+    print(f"[ERROR] Rewind test failed: {e}")
+    sys.exit(1)
+
+# 测试联机帧同步
+try:
+    import random
+    from src.systems.netplay import CoopSimulation, LockstepSession, LoopbackHub
+
+    hub = LoopbackHub(latency=4, loss=0.1)
+    sessions = [
+        LockstepSession(CoopSimulation(3, seed=7), i, hub.endpoint(i)) for i in range(3)
+    ]
+    input_rng = random.Random(1)
+    for _ in range(300):
+        for session in sessions:
+            session.advance(input_rng.getrandbits(5))
+
+    # 停止输入，等所有端追到同一帧并确认
+    target = max(s.game.frame for s in sessions) + config.NET_MAX_ROLLBACK
+    for _ in range(300):
+        for session in sessions:
+            if session.game.frame < target:
+                session.advance(0)
+            else:
+                session.poll()
+    assert all(s.game.frame == target and s.is_confirmed() for s in sessions), "sessions did not settle"
+    assert len({s.game.checksum() for s in sessions}) == 1, "simulations diverged"
+    rollbacks = sum(s.rollbacks for s in sessions)
+    print(f"[OK] Netplay lockstep - 3 players in sync at frame {target}, {rollbacks} rollbacks")
+except Exception as e:
+    print(f"[ERROR] Netplay test failed: {e}")
+    sys.exit(1)
+
+# 测试精灵数组
+try:
+    from src.entities.sprite_array import SpriteArray
+
+    targets = SpriteArray(*(Enemy(100 + i * 50, 100, 2) for i in range(10)))
+    shots = SpriteArray(Bullet(100, 116), Bullet(150, 116), Bullet(700, 500))
+    hits = pygame.sprite.groupcollide(targets, shots, False, True)
+    assert len(hits) == 2 and len(shots) == 1, "groupcollide should kill colliding bullets"
+    doomed = targets.sprites()[:3]
+    for sprite in doomed:
+        sprite.kill()
+    assert len(targets) == 7 and not doomed[0].alive(), "kill should remove immediately"
+    targets.flush()
+    assert sorted(targets._index.values()) == list(range(7)), "flush should compact storage"
+    targets.update()
+    targets.draw(screen)
+    print(f"[OK] Sprite array - {len(targets)} sprites after swap-remove flush")
+except Exception as e:
+    print(f"[ERROR] Sprite array test failed: {e}")
+    sys.exit(1)
+
+# 测试自动驾驶
+try:
+    from src.systems.autopilot import Autopilot
+
+    bot = Autopilot()
+    pilot = Player(config.PLAYER_START_X, config.PLAYER_START_Y)
+    pilot.controller = bot
+    incoming = SpriteArray(Enemy(pilot.rect.centerx, pilot.rect.top - 60, 5))
+    bot.plan(pilot, incoming)
+    assert bot.move[0] != 0, "bot should dodge an enemy right above it"
+    assert bot.fire, "bot should fire at an enemy right above it"
+    before = pilot.rect.x
+    pilot.update()
+    assert pilot.rect.x != before, "player should follow the controller"
+
+    config.AUTOPILOT = True
+    # 与 main.py 相同的构造方式：自动驾驶不打开高分榜
+    soak = GameStateMachine(screen, record_scores=not config.AUTOPILOT)
+    assert soak.highscores is None, "autopilot games should not reach the leaderboard"
+    assert soak.states[config.STATE_GAME_OVER].highscores is None
+    for _ in range(600):
+        soak.update()
+    soak.shutdown()
+    config.AUTOPILOT = False
+    assert isinstance(soak.current_state, RunningState), "autopilot should start the game itself"
+    print(f"[OK] Autopilot - soak score {soak.current_state.player.score}")
+except Exception as e:
+    config.AUTOPILOT = False
+    print(f"[ERROR] Autopilot test failed: {e}")
+    sys.exit(1)
+
+# 测试渲染缩放
+try:
+    from src.ui.render_scale import RenderScaler, scaled_image
+
+    renderer = RenderScaler(screen, 0.5)
+    assert renderer.surface.get_size() == (config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2)
+    scaled_state = RunningState(renderer.surface)
+    for _ in range(120):
+        scaled_state.update()
+    scaled_state.draw(renderer.surface)
+    renderer.present()
+    assert scaled_image(player.image, 0.5) is scaled_image(player.image, 0.5), "scaled image not cached"
+    assert not RenderScaler(screen, 1.0).is_scaled, "native scale should draw straight to the window"
+    print(f"[OK] Render scale - back buffer {renderer.surface.get_size()} -> window {screen.get_size()}")
+except Exception as e:
+    print(f"[ERROR] Render scale test failed: {e}")
+    sys.exit(1)
+
+# 测试画质调节
+try:
+    from src.systems.quality import QUALITY_TIERS, QualityGovernor
+
+    governor = QualityGovernor(budget_ms=16.0, window=10)
+    changes = [governor.record(30.0) for _ in range(20)]
+    assert governor.level == 2 and changes.count(True) == 2, "should degrade once per full window"
+    assert config.HUD_ANTIALIAS is False, "tier should be applied to config"
+    for _ in range(25):
+        governor.record(12.0)
+    assert governor.level == 2, "in-between frame times should not change tier (hysteresis)"
+    for _ in range(10 + 10 * config.QUALITY_RECOVER_WINDOWS):
+        governor.record(2.0)
+    assert governor.level == 1, "sustained fast frames should recover one tier"
+
+    governor.level = len(QUALITY_TIERS) - 1
+    governor.apply()
+    capped = SpriteArray()
+    spawner = EnemySpawner()
+    for _ in range(config.ENEMY_SPAWN_RATE * (config.ENEMY_MAX_ALIVE + 5)):
+        spawner.update(capped)
+    assert len(capped) == config.ENEMY_MAX_ALIVE, "spawner should respect the enemy cap"
+
+    stale_hud = HUD(screen)
+    first = stale_hud._render_text("score", stale_hud.font_small, "1", config.WHITE)
+    assert stale_hud._render_text("score", stale_hud.font_small, "2", config.WHITE) is first
+
+    governor.level = 0
+    governor.apply()
+    print(f"[OK] Quality governor - {len(QUALITY_TIERS)} tiers with hysteresis")
+except Exception as e:
+    print(f"[ERROR] Quality governor test failed: {e}")
+    sys.exit(1)
+
+# 测试内存跟踪
+try:
+    import gc
+    import json
+    import tempfile
+    from src.systems.memory_tracker import MemoryTracker, count_live_objects
+    from src.systems.state_machine import RunningState
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_path = f"{log_dir}/memory.ndjson"
+        tracker = MemoryTracker(log_path, interval=5)
+        running = RunningState(screen)
+        gc.collect()
+        baseline = count_live_objects()
+        # 敌机共用一张图像，不增加 Surface；另外持有的独立 Surface 应逐个计入
+        hoard = [Enemy(100, 100) for _ in range(20)]
+        canvases = [pygame.Surface((4, 4)) for _ in range(13)]
+        gc.collect()
+        sampled = [tracker.update(running.sprite_groups()) for _ in range(5)]
+        tracker.close()
+
+        assert sampled == [False] * 4 + [True], "should sample once per interval"
+        grown = {name: tracker.objects[name] - baseline[name] for name in baseline}
+        assert grown["enemies"] == 20, f"live Enemy instances should be counted: {grown}"
+        assert grown["surfaces"] == len(canvases), f"only the extra surfaces should be new: {grown}"
+        assert tracker.groups == {"all": 1, "enemies": 0, "bullets": 0}
+        assert tracker.gc_count >= 1, "gc pauses should be timed"
+        assert tracker.top_growth, "allocation growth should be reported"
+        with open(log_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) == 1 and records[0]["objects"] == tracker.objects
+        assert tracker._on_gc not in gc.callbacks, "close() should unregister the gc callback"
+        tracker.draw(screen)
+        del hoard, canvases
+    print(f"[OK] Memory tracker - {len(tracker.overlay_lines())} overlay lines")
+except Exception as e:
+    print(f"[ERROR] Memory tracker test failed: {e}")
+    sys.exit(1)
+
+# 测试遥测
+try:
+    import json
+    import os
+    import socket
+    import tempfile
+    import threading
+    from src.systems.telemetry import FileSink, StatsdSink, Telemetry, TelemetrySink
+
+    # 本地 UDP 监听端代替 statsd
+    listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.settimeout(2.0)
+    telemetry = Telemetry(StatsdSink(listener.getsockname(), "test.cab1"), flush_interval=0.05)
+    telemetry.timing("frame_ms", 16.5)
+    telemetry.gauge("enemies", 7)
+    telemetry.event("game_over", score=300)
+    telemetry.close()
+    lines = listener.recv(65535).decode("utf-8").split("\n")
+    listener.close()
+    assert lines == [
+        "test.cab1.frame_ms:16.5|ms",
+        "test.cab1.enemies:7|g",
+        "test.cab1.event.game_over:1|c",
+    ], lines
+
+    # 输出端卡住时队列满了直接丢弃，记录调用不阻塞
+    class _StuckSink(TelemetrySink):
+        def __init__(self):
+            self.release = threading.Event()
+            self.batches = []
+
+        def write(self, batch):
+            self.release.wait()
+            self.batches.append(list(batch))
+
+    stuck = _StuckSink()
+    telemetry = Telemetry(stuck, queue_size=8, batch_size=4, flush_interval=0.01)
+    for i in range(100):
+        telemetry.increment("shots")
+    assert telemetry.dropped >= 100 - 8 - 4, "overflowing samples should be dropped"
+    stuck.release.set()
+    telemetry.close()
+    written = [sample for batch in stuck.batches for sample in batch]
+    assert sum(1 for sample in written if sample.name == "shots") == 100 - telemetry.dropped
+    reported = [sample.value for sample in written if sample.name == "telemetry.dropped"]
+    assert reported[-1] == telemetry.dropped, "dropped counter should be reported"
+
+    # 滚动文件
+    with tempfile.TemporaryDirectory() as log_dir:
+        sink = FileSink(f"{log_dir}/t.ndjson", "cab1", max_bytes=200, backup_count=2)
+        telemetry = Telemetry(sink, batch_size=2, flush_interval=0.01)
+        for i in range(20):
+            telemetry.gauge("score", i)
+        telemetry.close()
+        files = set(os.listdir(log_dir))
+        assert {"t.ndjson.1", "t.ndjson.2"} <= files <= {"t.ndjson", "t.ndjson.1", "t.ndjson.2"}
+        newest = "t.ndjson" if "t.ndjson" in files else "t.ndjson.1"
+        with open(f"{log_dir}/{newest}", encoding="utf-8") as f:
+            last = json.loads(f.read().splitlines()[-1])
+        assert last["src"] == "cab1" and last["name"] == "score" and last["value"] == 19
+
+    # 状态机把遥测交给游戏状态
+    collected = []
+
+    class _ListSink(TelemetrySink):
+        def write(self, batch):
+            collected.extend(batch)
+
+    telemetry = Telemetry(_ListSink())
+    machine = GameStateMachine(screen, telemetry, record_scores=False)
+    machine.change_state(config.STATE_RUNNING)
+    for _ in range(config.TELEMETRY_SAMPLE_INTERVAL):
+        machine.update()
+    machine.current_state.player.health = 0
+    machine.update()
+    machine.shutdown()
+    telemetry.close()
+    names = [sample.name for sample in collected]
+    assert names[0] == "game_start" and "enemies" in names and names[-1] == "game_over", names
+    print(f"[OK] Telemetry - statsd, rotating file, {len(collected)} samples from one game")
+except Exception as e:
+    print(f"[ERROR] Telemetry test failed: {e}")
+    sys.exit(1)
+
+# 测试 ECS
+try:
+    import random
+    import numpy as np
+    from src.ecs.world import World
+    from src.ecs.adapters import EntityGroup, EntityView
+    from src.ecs import systems
+
+    world = World()
+    mover = world.create("bullet", position=(10, 10), size=(4, 4), velocity=(1, -2))
+    timed = world.create("spark", position=(0, 0), lifetime=(2,))
+    leaving = world.create("bullet", position=(5, -3), size=(4, 4), velocity=(0, -5))
+    systems.movement_system(world)
+    systems.lifetime_system(world)
+    systems.cull_system(world)
+    assert tuple(world.get(mover, "position")) == (11, 8)
+    assert world.alive(timed) and not world.alive(leaving), "only the off-screen bullet should die"
+    systems.lifetime_system(world)
+    assert not world.alive(timed), "lifetime should expire"
+    world.flush()
+    assert len(world) == 1 and world.entities(["bullet"]) == [mover]
+    assert tuple(world.get(mover, "position")) == (11, 8), "swap-remove should keep rows intact"
+
+    # 批量求交与逐对 colliderect 结果一致
+    rng = random.Random(3)
+    rects_a = [
+        pygame.Rect(rng.randint(0, 300), rng.randint(0, 300), rng.randint(0, 30), rng.randint(1, 30))
+        for _ in range(80)
+    ]
+    rects_b = [
+        pygame.Rect(rng.randint(0, 300), rng.randint(0, 300), rng.randint(1, 40), rng.randint(1, 40))
+        for _ in range(120)
+    ]
+    boxes_a = np.array([(r.left, r.top, r.right, r.bottom) for r in rects_a])
+    boxes_b = np.array([(r.left, r.top, r.right, r.bottom) for r in rects_b])
+    ia, ib = systems.overlap_pairs(boxes_a, boxes_b)
+    expected = {(i, j) for i, a in enumerate(rects_a) for j, b in enumerate(rects_b) if a.colliderect(b)}
+    assert set(zip(ia.tolist(), ib.tolist())) == expected, "sweep should match colliderect"
+
+    # 适配器：精灵组接口和 CollisionSystem 继续可用
+    group = EntityGroup(World(), "bullet", heading=(0, -1))
+    group.add(Bullet(100, 100), Bullet(100, 100), Bullet(300, 300))
+    assert len(group) == 3 and len(group.world.images) == 1, "bullets should share one image"
+    target = Enemy(100, 90, 0)
+    target.health = 15
+    hit = CollisionSystem().check_bullet_enemy_collision(group, SpriteArray(target))
+    assert hit == [target, target] and not target.alive(), "two bullets should hit the enemy"
+    group.flush()
+    assert len(group) == 1 and isinstance(group.sprites()[0], EntityView)
+    assert pygame.sprite.spritecollide(Enemy(300, 290, 0), group, True), "pygame helpers should work"
+    group.flush()
+    assert len(group) == 0
+
+    # 运行状态中的子弹走 ECS，快照照常往返
+    running = RunningState(screen)
+    running.bullet_manager.shoot(400, 300, running.bullets)
+    running.update()
+    saved = snapshot.capture(running)
+    running.bullets.empty()
+    snapshot.restore(running, saved)
+    assert len(running.bullets) == 1 and running.bullets.sprites()[0].rect.bottom == 300 - config.BULLET_SPEED
+    print(f"[OK] ECS - {len(expected)} overlaps via sweep, bullets migrated")
+except Exception as e:
+    print(f"[ERROR] ECS test failed: {e}")
+    sys.exit(1)
+
+# 测试流水线模式
+try:
+    import random
+    from src.systems.pipeline import SimulationPipeline
+
+    def play(pipelined):
+        random.seed(11)
+        machine = GameStateMachine(screen, record_scores=False)
+        canvas = pygame.Surface(screen.get_size())
+        pipeline = SimulationPipeline(machine) if pipelined else None
+        if pipeline is not None:
+            pipeline.start([])
+        for index in range(300):
+            if pipeline is None:
+                machine.update()
+                machine.draw(canvas)
+                continue
+            # 预先模拟的一帧之后，每次绘制的同时模拟下一帧（菜单等状态先绘制再模拟）
+            frame = pipeline.wait()
+            if frame.data is None:
+                machine.draw_frame(canvas, frame)
+            if index < 299:
+                pipeline.start([])
+            if frame.data is not None:
+                machine.draw_frame(canvas, frame)
+        if pipeline is not None:
+            pipeline.close()
+        machine.shutdown()
+        return snapshot.capture(machine.current_state).to_bytes(), pygame.image.tobytes(canvas, "RGB")
+
+    config.AUTOPILOT = True
+    serial = play(False)
+    pipelined = play(True)
+    config.AUTOPILOT = False
+    assert serial[0] == pipelined[0], "pipelined simulation should match serial"
+    assert serial[1] == pipelined[1], "pipelined frame should match serial"
+
+    # 模拟线程中的异常在 wait() 中重新抛出
+    broken = GameStateMachine(screen, record_scores=False)
+    broken.update = lambda: 1 / 0
+    pipeline = SimulationPipeline(broken)
+    pipeline.start([])
+    try:
+        pipeline.wait()
+        raise AssertionError("worker error should propagate")
+    except ZeroDivisionError:
+        pass
+    pipeline.close()
+    broken.shutdown()
+    print("[OK] Pipeline - 300 frames identical to serial loop")
+except Exception as e:
+    config.AUTOPILOT = False
+    print(f"[ERROR] Pipeline test failed: {e}")
+    sys.exit(1)
+
+# 测试精灵旋转缓存
+try:
+    from src.entities.sprite_cache import RotationCache, heading_angle, sprite_cache
+
+    assert Enemy(0, 0, 1).image is Enemy(50, 50, 1).image, "enemies should share one image"
+    assert heading_angle(0, -1) == 0 and heading_angle(-1, 0) == 90
+    assert heading_angle(0, 1, Enemy.FACING) == 0 and heading_angle(1, 0, Enemy.FACING) == 90
+
+    cache = RotationCache(steps=16)
+    assert len(cache) == 0, "variants should be filled lazily"
+    tilted = cache.get(Enemy, 44)
+    assert cache.get(Enemy, 46) is tilted and cache.misses == 1, "nearby angles share one variant"
+    assert cache.get(Enemy, 360).image is cache.base(Enemy), "full turn is the base image"
+    width, height = tilted.image.get_size()
+    assert tilted.offset == ((40 - width) // 2, (40 - height) // 2), "offset keeps the center"
+
+    # 内存上限：按最近使用淘汰
+    small = RotationCache(steps=16, max_bytes=3 * tilted.image.get_width() * tilted.image.get_height() * 4)
+    for angle in range(0, 360, 45):
+        small.get(Enemy, angle)
+    assert small.bytes <= small.max_bytes and len(small) < 7, "cache should stay under its bound"
+
+    bullet = Bullet(200, 300)
+    center = bullet.rect.center
+    bullet.face(1, -1)
+    assert bullet.image is sprite_cache.get(Bullet, 315).image and bullet.rect.center == center
+
+    # ECS 按 (来源, 方向, 比例) 登记旋转图像：淘汰后重新生成的图像替换旧图像，不会越积越多
+    from src.ecs.world import World
+    from src.ecs.adapters import EntityGroup
+
+    registry = World()
+    shots = EntityGroup(registry, "bullet", heading=(0, -1))
+    for _ in range(3):
+        shot = Bullet(200, 300)
+        shot.face(1, -1)
+        shots.add(shot)
+        sprite_cache.clear()
+    assert len(registry.images) == 1, f"one image per key, got {len(registry.images)}"
+    assert registry.images[0] is shot.image, "registry should hold the latest variant only"
+    print(f"[OK] Sprite cache - {cache.steps} steps, {len(small)} variants under {small.max_bytes} bytes")
+except Exception as e:
+    print(f"[ERROR] Sprite cache test failed: {e}")
+    sys.exit(1)
+
+# 测试静止画面
+try:
+    machine = GameStateMachine(screen, record_scores=False)
+    canvas = pygame.Surface(screen.get_size())
+    assert machine.needs_redraw(canvas), "menu should be drawn once"
+    machine.draw(canvas)
+    first = pygame.image.tobytes(canvas, "RGB")
+    assert not machine.needs_redraw(canvas) and machine.is_idle(canvas), "unchanged menu is idle"
+    canvas.fill(config.RED)
+    machine.draw(canvas)
+    assert pygame.image.tobytes(canvas, "RGB") == first, "cached frame should be restored"
+
+    # 暂停：逐帧回退改变内容，遮罩只创建一次
+    machine.change_state(config.STATE_RUNNING)
+    for _ in range(5):
+        machine.update()
+    machine.change_state(config.STATE_PAUSED)
+    paused = machine.current_state
+    assert machine.needs_redraw(canvas)
+    machine.draw(canvas)
+    overlay = paused._overlay
+    paused.step(-2)
+    assert machine.needs_redraw(canvas), "rewinding should redraw"
+    machine.draw(canvas)
+    assert paused._overlay is overlay, "overlay should be reused"
+    assert not machine.needs_redraw(canvas)
+
+    # 游戏结束：分数变化时重绘
+    machine.change_state(config.STATE_GAME_OVER)
+    machine.draw(canvas)
+    machine.current_state.final_score = 42
+    assert machine.needs_redraw(canvas), "new score should redraw"
+
+    # 暂停、继续、读档回到更早的帧、再玩到同一帧暂停：内容标识相同，但必须重新绘制
+    machine.change_state(config.STATE_RUNNING)
+    running = machine.current_state
+    for _ in range(5):
+        machine.update()
+    saved = snapshot.capture(running)
+    for _ in range(5):
+        machine.update()
+    machine.change_state(config.STATE_PAUSED)
+    machine.draw(canvas)
+    machine.change_state(config.STATE_RUNNING)
+    assert machine.current_state is running, "resume should keep the game"
+    snapshot.restore(running, saved)
+    for _ in range(5):
+        machine.update()
+    machine.draw(canvas)
+    machine.change_state(config.STATE_PAUSED)
+    assert machine.needs_redraw(canvas), "pausing again at the same frame should redraw"
+    assert not machine.is_idle(canvas), "must not block before the overlay is shown"
+    machine.shutdown()
+    print("[OK] Static screens - cached frames, redraw only on change")
+except Exception as e:
+    print(f"[ERROR] Static screen test failed: {e}")
+    sys.exit(1)
+
+# 测试镜头与空间索引
+try:
+    import random
+    from src.systems.camera import Camera
+    from src.entities.spatial_array import SpatialSpriteArray
+
+    camera = Camera(800, 600, (2000, 3000))
+    camera.follow(pygame.Rect(1900, 100, 10, 10))
+    assert camera.rect.topleft == (1200, 0) and camera.scrolling, "camera should clamp to the world"
+    assert camera.to_world((10, 20)) == (1210, 20) and camera.to_screen(pygame.Rect(1210, 20, 1, 1)).topleft == (10, 20)
+    assert camera.bounds(100) == (1100, 0, 900, 700), "bounds should be clipped to the world"
+
+    # 敌人飞出世界底部才销毁，测试期间使用较大的世界
+    config.WORLD_WIDTH, config.WORLD_HEIGHT = 3000, 4000
+    rng = random.Random(9)
+    grid = SpatialSpriteArray(cell_size=128)
+    spread = [Enemy(rng.randint(0, 3000), rng.randint(0, 3000), 2) for _ in range(400)]
+    grid.add(*spread)
+    area = pygame.Rect(700, 900, 800, 600)
+    assert grid.query(area) == [e for e in grid.sprites() if area.colliderect(e.rect)], "query should match brute force"
+    victim = grid.query(area)[0]
+    victim.kill()
+    assert victim not in grid.query(area), "killed sprites leave the index"
+    grid.flush()
+
+    # 远处的敌人休眠，唤醒时补齐移动；附近的敌人每帧更新
+    far = Enemy(2900, 100, 3)
+    close = Enemy(1000, 1000, 3)
+    grid.add(far, close)
+    start_far, start_close = far.rect.y, close.rect.y
+    calls = 0
+    original = Enemy.update
+
+    def counted(self, steps=1):
+        global calls
+        calls += 1
+        original(self, steps)
+
+    Enemy.update = counted
+    try:
+        for frame in range(1, 61):
+            grid.update_around(area, frame, closing_speed=10, max_sleep=30)
+    finally:
+        Enemy.update = original
+    assert close.rect.y == start_close + 3 * 60, "near sprites update every frame"
+    assert far.rect.y == start_far + 3 * grid._updated[far], "far sprites catch up exactly"
+    assert calls < len(grid) * 60 // 5, f"far sprites should sleep ({calls} updates)"
+
+    # 大地图中的一局：镜头跟随玩家，坐标仍然可以快照往返
+    config.WORLD_WIDTH = 2400
+    config.AUTOPILOT = True
+    try:
+        running = RunningState(screen)
+        running.enemies.add(*[Enemy(rng.randint(0, 2400), rng.randint(0, 4000), 2) for _ in range(300)])
+        for _ in range(120):
+            running.update()
+        running.draw(screen)
+        assert running.camera.rect.bottom == 4000 and running.camera.rect.top > 0, "camera should scroll"
+        saved = snapshot.capture(running)
+        snapshot.restore(running, saved)
+        assert snapshot.capture(running).to_bytes() == saved.to_bytes()
+    finally:
+        config.WORLD_WIDTH, config.WORLD_HEIGHT = config.SCREEN_WIDTH, config.SCREEN_HEIGHT
+        config.AUTOPILOT = False
+
+    # 读档回到更早的帧后，敌人在下一次 update() 就继续移动（不能停到原来的帧号）
+    running = RunningState(screen)
+    running.enemies.add(*[Enemy(100 + i * 60, 50 + i * 20, 3) for i in range(8)])
+    for _ in range(5):
+        running.update()
+    saved = snapshot.capture(running)
+    for _ in range(200):
+        running.update()
+    snapshot.restore(running, saved)
+    before = {id(e): e.rect.y for e in running.enemies}
+    running.update()
+    moved = [e for e in running.enemies if id(e) in before and e.rect.y == before[id(e)] + e.speed]
+    assert len(moved) == len(before) > 0, f"restored enemies should move at once ({len(moved)}/{len(before)})"
+    # 没有调用 reset() 时帧号倒退也不能让精灵停住
+    lone = Enemy(0, 0, 2)
+    far = SpatialSpriteArray(lone)
+    far.update_around(pygame.Rect(0, 0, 10, 10), 50, closing_speed=4)
+    start = lone.rect.y
+    far.update_around(pygame.Rect(0, 0, 10, 10), 3, closing_speed=4)
+    assert lone.rect.y == start + 2, "frame going backwards should not freeze"
+    print(f"[OK] Camera - spatial index, {calls} enemy updates over 60 frames")
+except Exception as e:
+    config.WORLD_WIDTH, config.WORLD_HEIGHT = config.SCREEN_WIDTH, config.SCREEN_HEIGHT
+    print(f"[ERROR] Camera test failed: {e}")
+    sys.exit(1)
+
+# 测试离线导出
+try:
+    import hashlib
+    import os
+    import tempfile
+    from src.systems.replay_export import (
+        FrameEncoder, InputScript, PipeEncoder, PngEncoder, ScriptError,
+        create_encoder, encoder_command, export_replay,
+    )
+
+    script = InputScript.parse("1 enter  # 开始\n40 right fire\n1\n3 LEFT up\n")
+    assert len(script) == 45
+    assert [(e.type, e.key) for e in script.events(1)] == [
+        (pygame.KEYUP, pygame.K_RETURN), (pygame.KEYDOWN, pygame.K_SPACE), (pygame.KEYDOWN, pygame.K_RIGHT)
+    ], "releases first, then presses"
+    assert script.events(2) == [], "held keys produce no new events"
+    assert {e.type for e in script.events(41)} == {pygame.KEYUP}
+    assert script.held(42) == {pygame.K_LEFT, pygame.K_UP} and script.held(99) == frozenset()
+    try:
+        InputScript.parse("1 enter\n5 jump\n")
+        raise AssertionError("unknown keys should be rejected")
+    except ScriptError as error:
+        assert "2" in str(error), "error should name the line"
+
+    class HashEncoder(FrameEncoder):
+        def __init__(self):
+            self.digest = hashlib.md5()
+            self.frames = []
+
+        def submit(self, index, data):
+            self.digest.update(data)
+            self.frames.append(index)
+
+    # 同一脚本、同一种子每次导出的画面完全相同；换种子后敌人不同
+    script = InputScript.parse("1 enter\n90 right\n1 space\n60 up\n1 space\n120 left\n")
+    runs = []
+    for seed in (7, 7, 8):
+        encoder = HashEncoder()
+        assert export_replay(encoder, script, seed=seed) == len(script)
+        assert encoder.frames == list(range(len(script)))
+        runs.append(encoder.digest.hexdigest())
+    assert runs[0] == runs[1], "export should be deterministic"
+    assert runs[0] != runs[2], "seed should change the enemies"
+
+    # PNG 进程池编码结果与原始画面逐像素一致；管道编码器把所有帧写给编码程序
+    size = (64, 48)
+    canvas = pygame.Surface(size)
+    frames = []
+    for index in range(5):
+        canvas.fill((index * 50, 255 - index * 40, 30))
+        pygame.draw.circle(canvas, config.WHITE, (10 + index * 8, 24), 6)
+        frames.append(pygame.image.tobytes(canvas, "RGB"))
+    with tempfile.TemporaryDirectory() as out_dir:
+        encoder = PngEncoder(out_dir, size, workers=2, max_pending=2)
+        for index, data in enumerate(frames):
+            encoder.submit(index, data)
+        encoder.close()
+        for index, data in enumerate(frames):
+            image = pygame.image.load(os.path.join(out_dir, f"frame_{index:06d}.png"))
+            assert pygame.image.tobytes(image, "RGB") == data, f"frame {index} should round-trip"
+
+        count_path = os.path.join(out_dir, "bytes.txt")
+        counter = [
+            sys.executable, "-c",
+            "import sys; open(sys.argv[1], 'w').write(str(len(sys.stdin.buffer.read())))",
+            count_path,
+        ]
+        encoder = PipeEncoder(counter, max_pending=1)
+        for index, data in enumerate(frames):
+            encoder.submit(index, data)
+        encoder.close()
+        with open(count_path) as f:
+            assert int(f.read()) == sum(len(data) for data in frames)
+
+        # 找不到编码程序时改为导出 PNG 序列
+        encoder_name = config.EXPORT_ENCODER
+        config.EXPORT_ENCODER = "no-such-encoder-binary"
+        try:
+            fallback = create_encoder(os.path.join(out_dir, "clip.mp4"), size)
+            fallback.close()
+        finally:
+            config.EXPORT_ENCODER = encoder_name
+        assert isinstance(fallback, PngEncoder) and fallback.target == os.path.join(out_dir, "clip")
+    command = encoder_command("ffmpeg", "clip.mp4", (800, 600), 60)
+    assert command[-1] == "clip.mp4" and "800x600" in command and "yuv420p" in command
+
+    print("[OK] Replay export - deterministic frames, PNG and pipe encoders")
+except Exception as e:
+    print(f"[ERROR] Replay export test failed: {e}")
+    sys.exit(1)
+
 print("\nGame tests passed! All systems working correctly.")
 print("Run 'python main.py' to start the game")
 print("Run 'python main.py --debug' to start in debug mode")